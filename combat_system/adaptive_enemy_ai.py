@@ -1,8 +1,47 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple
+from collections import defaultdict, deque
 import random
 from combat_system_core_v1_01 import Domain, MoveType, CombatMove, Combatant, Status
 
+# Reverse lookup so hot paths don't iterate the MoveType enum
+_MOVETYPE_BY_VALUE = {move_type.value: move_type for move_type in MoveType}
+
+# Ordinal encoding of move types for the dense pattern count table
+_MOVETYPES = tuple(MoveType)
+_MOVETYPE_INDEX = {move_type: index for index, move_type in enumerate(_MOVETYPES)}
+_NUM_MOVETYPES = len(_MOVETYPES)
+
+# Rock-paper-scissors counters: Force > Trick > Focus > Force
+_COUNTER_TABLE = {
+    MoveType.FORCE: MoveType.FOCUS,
+    MoveType.TRICK: MoveType.FORCE,
+    MoveType.FOCUS: MoveType.TRICK,
+}
+
+# Player statuses that make an enemy more likely to press the attack
+_EXPLOITABLE_STATUS_MASK = Status.WOUNDED.bit | Status.CONFUSED.bit | Status.STUNNED.bit
+
+# Prebuilt move variants: name -> the move fields that variant overrides
+_MOVE_VARIANTS = {
+    "desperate": {"is_desperate": True, "narrative_hook": "Fights with desperate fury"},
+    "counter": {"is_calculated": True, "narrative_hook": "Analyzes and counters your strategy"},
+    "wounds": {"narrative_hook": "Targets your wounds"},
+    "confusion": {"narrative_hook": "Exploits your confusion"},
+    "calculated": {"is_calculated": True},
+    "risky": {"is_desperate": True},
+}
+
+def _make_variant(move: CombatMove, overrides: Dict[str, Any]) -> CombatMove:
+    """Copy of move with a variant's fields overridden; the original is left untouched"""
+    variant_move = move.clone()
+    for field, value in overrides.items():
+        setattr(variant_move, field, value)
+    return variant_move
+
 class EnemyPersonality:
+    __slots__ = ('aggression', 'adaptability', '_risk_taking', 'calculation',
+                 '_specialization', '_preferred_moves', '_desperation_threshold_adj')
+    
     def __init__(self, 
                  aggression: float = 0.5,      # 0.0 to 1.0, how aggressive the enemy is
                  adaptability: float = 0.5,     # How quickly they learn from combat
@@ -17,13 +56,52 @@ class EnemyPersonality:
         self.specialization = specialization or []
         self.preferred_moves = preferred_moves or []
         
+    @property
+    def specialization(self) -> FrozenSet[Domain]:
+        """Domains they favor"""
+        return self._specialization
+    
+    @specialization.setter
+    def specialization(self, domains: List[Domain]) -> None:
+        # Stored as a frozenset: cheap overlap tests, and changes are reassignments
+        self._specialization = frozenset(domains or ())
+    
+    @property
+    def preferred_moves(self) -> Tuple[MoveType, ...]:
+        """Move types they prefer"""
+        return self._preferred_moves
+    
+    @preferred_moves.setter
+    def preferred_moves(self, move_types: List[MoveType]) -> None:
+        # Stored as a tuple so every change is a reassignment that AIs can detect
+        self._preferred_moves = tuple(move_types or ())
+    
+    @property
+    def risk_taking(self) -> float:
+        """Willingness to use desperate moves"""
+        return self._risk_taking
+    
+    @risk_taking.setter
+    def risk_taking(self, value: float) -> None:
+        self._risk_taking = value
+        # Cached reduction of the desperation threshold, see AdaptiveEnemyAI._is_desperate
+        self._desperation_threshold_adj = value * 0.15
+        
 class CombatMemento:
     """Tracks what happened in previous rounds for AI decision making"""
+    __slots__ = ('player_moves_used', 'successful_player_moves', 'successful_enemy_moves',
+                 '_counts', '_pair_offset')
+    
+    # Rounds of player move history kept; patterns are counted as they happen
+    HISTORY_LENGTH = 64
+    
     def __init__(self):
-        self.player_moves_used = []
-        self.successful_player_moves = []
-        self.successful_enemy_moves = []
-        self.player_patterns = {}  # Track patterns in player behavior
+        self.player_moves_used = deque(maxlen=self.HISTORY_LENGTH)
+        self.successful_player_moves = set()  # Move types that have beaten us
+        self.successful_enemy_moves = set()  # Move types we've won with
+        # Flat [first][second][follow-up] table of pattern counts
+        self._counts = [0] * (_NUM_MOVETYPES ** 3)
+        self._pair_offset = None  # Table row for the player's last two moves
         
     def record_round(self, player_move: CombatMove, enemy_move: CombatMove, player_success: bool) -> None:
         """Record the results of a combat round"""
@@ -32,53 +110,39 @@ class CombatMemento:
         
         # Track successful moves
         if player_success:
-            self.successful_player_moves.append(player_move.move_type)
+            self.successful_player_moves.add(player_move.move_type)
         else:
-            self.successful_enemy_moves.append(enemy_move.move_type)
+            self.successful_enemy_moves.add(enemy_move.move_type)
             
         # Update pattern recognition
         self._update_player_patterns()
     
     def _update_player_patterns(self) -> None:
-        """Analyze player's moves for patterns"""
-        # Only analyze if we have enough history
-        if len(self.player_moves_used) < 3:
-            return
-            
-        # Look for sequences of 2 moves
-        for i in range(len(self.player_moves_used) - 2):
-            pattern = (self.player_moves_used[i], self.player_moves_used[i+1])
-            follow_up = self.player_moves_used[i+2]
+        """Count the pattern formed by the player's latest move"""
+        follow_up = _MOVETYPE_INDEX[self.player_moves_used[-1]]
+        
+        # Earlier triples were counted in previous rounds, so only the
+        # sequence ending with the newest move needs to be added
+        if self._pair_offset is not None:
+            self._counts[self._pair_offset + follow_up] += 1
             
-            pattern_key = f"{pattern[0].name}-{pattern[1].name}"
-            if pattern_key not in self.player_patterns:
-                self.player_patterns[pattern_key] = {}
-                
-            if follow_up.name not in self.player_patterns[pattern_key]:
-                self.player_patterns[pattern_key][follow_up.name] = 0
-                
-            self.player_patterns[pattern_key][follow_up.name] += 1
+        if len(self.player_moves_used) >= 2:
+            previous = _MOVETYPE_INDEX[self.player_moves_used[-2]]
+            self._pair_offset = (previous * _NUM_MOVETYPES + follow_up) * _NUM_MOVETYPES
     
     def predict_next_move(self) -> Optional[MoveType]:
         """Try to predict player's next move based on patterns"""
-        if len(self.player_moves_used) < 2:
+        # Need the last two moves to look up a pattern
+        offset = self._pair_offset
+        if offset is None:
             return None
             
-        # Get the last two moves
-        last_moves = (self.player_moves_used[-2], self.player_moves_used[-1])
-        pattern_key = f"{last_moves[0].name}-{last_moves[1].name}"
-        
-        if pattern_key in self.player_patterns:
-            # Find the most common follow-up
-            predictions = self.player_patterns[pattern_key]
-            if predictions:
-                # Get the move type with highest count
-                most_common = max(predictions.items(), key=lambda x: x[1])
-                for move_type in MoveType:
-                    if move_type.name == most_common[0]:
-                        return move_type
-                        
-        return None
+        # Get the follow-up move type with highest count
+        predictions = self._counts[offset:offset + _NUM_MOVETYPES]
+        best = max(predictions)
+        if best == 0:
+            return None
+        return _MOVETYPES[predictions.index(best)]
         
 class AdaptiveEnemyAI:
     def __init__(self, 
@@ -96,15 +160,68 @@ class AdaptiveEnemyAI:
         # Key elements that influence decision making
         self.desperation_threshold = 0.3  # Health % where enemy gets desperate
         
+        # Move indexes so selectors don't rescan every move each turn
+        self._by_type: Dict[MoveType, List[CombatMove]] = defaultdict(list)
+        self._by_domain: Dict[Domain, List[CombatMove]] = defaultdict(list)
+        self._variants: Dict[str, Dict[CombatMove, CombatMove]] = {}
+        self._move_domain_sets: Dict[CombatMove, frozenset] = {}
+        self._index_moves()
+        
+        # Counter type per player move type; valid for the preferred_moves it was built from
+        self._counter_cache: Dict[MoveType, MoveType] = {}
+        self._counter_cache_moves = self.personality.preferred_moves
+        
+        # Per-turn state, computed once in choose_move
+        self._turn_usable = set()
+        self._turn_health_ratio = 1.0
+        
+        # Per-AI RNG with bound methods to skip module attribute lookups
+        self._rng = random.Random()
+        self._rand = self._rng.random
+        self._choice = self._rng.choice
+        
+    def _index_moves(self) -> None:
+        """Rebuild move indexes; call again after changing available_moves"""
+        self._by_type.clear()
+        self._by_domain.clear()
+        self._move_domain_sets = {}
+        for move in self.available_moves:
+            self._by_type[move.move_type].append(move)
+            for domain in move.domains:
+                self._by_domain[domain].append(move)
+            self._move_domain_sets[move] = frozenset(move.domains)
+                
+        # Selectors return these copies so shared moves are never mutated
+        self._variants = {
+            variant: {move: _make_variant(move, overrides) for move in self.available_moves}
+            for variant, overrides in _MOVE_VARIANTS.items()
+        }
+    
+    def _variant(self, variant: str, move: CombatMove) -> CombatMove:
+        """Prebuilt variant of move, built on demand for moves added since indexing"""
+        variant_moves = self._variants[variant]
+        variant_move = variant_moves.get(move)
+        if variant_move is None:
+            variant_move = variant_moves[move] = _make_variant(move, _MOVE_VARIANTS[variant])
+        return variant_move
+                
+    def _usable(self, moves: List[CombatMove]) -> List[CombatMove]:
+        """Filter indexed moves down to those usable this turn"""
+        return [move for move in moves if move in self._turn_usable]
+        
     def choose_move(self, 
                     player: Combatant, 
                     player_last_move: Optional[CombatMove] = None) -> CombatMove:
         """Choose the enemy's next move based on AI logic"""
         self.rounds_played += 1
         
+        enemy = self.enemy
+        
         # Filter to moves the enemy can use
+        can_use_move = enemy.can_use_move
         usable_moves = [move for move in self.available_moves 
-                      if self.enemy.can_use_move(move)]
+                      if can_use_move(move)]
+        self._turn_usable = set(usable_moves)
         
         if not usable_moves:
             # If no usable moves, create a basic one with no cost
@@ -118,21 +235,25 @@ class AdaptiveEnemyAI:
                 spirit_cost=0
             )
         
-        # Different selection strategies based on state and personality
-        if self._is_desperate():
+        # Health only changes between turns, so read it once here
+        self._turn_health_ratio = enemy.current_health / enemy.max_health
+        
+        # Different selection strategies based on state and personality,
+        # checked in priority order and stopping at the first that applies
+        if self._is_desperate(self._turn_health_ratio):
             return self._choose_desperate_move(usable_moves)
-        elif self._should_counter(player_last_move):
+        if player_last_move is not None and self._should_counter(player_last_move):
             return self._choose_counter_move(usable_moves, player_last_move)
-        elif self._should_exploit_weakness(player):
+        
+        has_exploitable_status = bool(player.status_mask & _EXPLOITABLE_STATUS_MASK)
+        if self._should_exploit_weakness(has_exploitable_status):
             return self._choose_weakness_targeting_move(usable_moves, player)
-        else:
-            return self._choose_standard_move(usable_moves, player)
+        return self._choose_standard_move(usable_moves, player)
     
-    def _is_desperate(self) -> bool:
+    def _is_desperate(self, health_ratio: float) -> bool:
         """Determine if the enemy is in a desperate state"""
-        health_ratio = self.enemy.current_health / self.enemy.max_health
         # More likely to get desperate if risk-taking is high
-        adjusted_threshold = self.desperation_threshold - (self.personality.risk_taking * 0.15)
+        adjusted_threshold = self.desperation_threshold - self.personality._desperation_threshold_adj
         return health_ratio <= adjusted_threshold
     
     def _should_counter(self, player_last_move: Optional[CombatMove]) -> bool:
@@ -147,38 +268,29 @@ class AdaptiveEnemyAI:
         if player_last_move.move_type in self.memento.successful_player_moves:
             counter_chance += 0.2
             
-        return random.random() < counter_chance
+        return self._rand() < counter_chance
     
-    def _should_exploit_weakness(self, player: Combatant) -> bool:
+    def _should_exploit_weakness(self, has_exploitable_status: bool) -> bool:
         """Determine if the enemy should try to exploit player weaknesses"""
-        # Check if player has any statuses that can be exploited
-        has_exploitable_status = False
-        for status in player.statuses:
-            if status in [Status.WOUNDED, Status.CONFUSED, Status.STUNNED]:
-                has_exploitable_status = True
-                break
-                
         # Higher aggression means more likely to exploit weaknesses
         exploit_chance = 0.3 + (self.personality.aggression * 0.4)
         if has_exploitable_status:
             exploit_chance += 0.2
             
-        return random.random() < exploit_chance
+        return self._rand() < exploit_chance
     
     def _choose_desperate_move(self, usable_moves: List[CombatMove]) -> CombatMove:
         """Choose a move when in a desperate state"""
         # Prefer high damage moves, especially Force type
-        force_moves = [move for move in usable_moves if move.move_type == MoveType.FORCE]
+        force_moves = self._usable(self._by_type[MoveType.FORCE])
         
         if force_moves:
-            chosen_move = random.choice(force_moves)
+            chosen_move = self._choice(force_moves)
         else:
-            chosen_move = random.choice(usable_moves)
+            chosen_move = self._choice(usable_moves)
             
         # Make it desperate for higher risk/reward
-        chosen_move.is_desperate = True
-        chosen_move.with_narrative_hook("Fights with desperate fury")
-        return chosen_move
+        return self._variant("desperate", chosen_move)
     
     def _choose_counter_move(self, usable_moves: List[CombatMove], 
                             player_move: CombatMove) -> CombatMove:
@@ -187,14 +299,13 @@ class AdaptiveEnemyAI:
         counter_type = self._get_counter_move_type(player_move.move_type)
         
         # Find moves of the counter type
-        counter_moves = [move for move in usable_moves if move.move_type == counter_type]
+        counter_moves = self._usable(self._by_type[counter_type])
         
         if counter_moves:
-            chosen_move = random.choice(counter_moves)
+            chosen_move = self._choice(counter_moves)
             # If enemy is calculating, use calculated approach
-            if random.random() < self.personality.calculation:
-                chosen_move.as_calculated()
-                chosen_move.with_narrative_hook("Analyzes and counters your strategy")
+            if self._rand() < self.personality.calculation:
+                return self._variant("counter", chosen_move)
             return chosen_move
         else:
             # No direct counter available, choose standard move
@@ -204,25 +315,21 @@ class AdaptiveEnemyAI:
                                       player: Combatant) -> CombatMove:
         """Choose a move that targets player weaknesses"""
         # Check for status-specific targeting
-        if Status.WOUNDED in player.statuses:
+        if player.status_mask & Status.WOUNDED.bit:
             # Target physical weakness
-            body_moves = [move for move in usable_moves 
-                        if Domain.BODY in move.domains 
-                        and move.move_type == MoveType.FORCE]
+            body_moves = [move for move in self._usable(self._by_domain[Domain.BODY])
+                        if move.move_type is MoveType.FORCE]
             if body_moves:
-                chosen_move = random.choice(body_moves)
-                chosen_move.with_narrative_hook("Targets your wounds")
-                return chosen_move
+                chosen_move = self._choice(body_moves)
+                return self._variant("wounds", chosen_move)
                 
-        if Status.CONFUSED in player.statuses:
+        if player.status_mask & Status.CONFUSED.bit:
             # Target mental weakness
-            mind_moves = [move for move in usable_moves 
-                        if Domain.MIND in move.domains 
-                        and move.move_type == MoveType.FOCUS]
+            mind_moves = [move for move in self._usable(self._by_domain[Domain.MIND])
+                        if move.move_type is MoveType.FOCUS]
             if mind_moves:
-                chosen_move = random.choice(mind_moves)
-                chosen_move.with_narrative_hook("Exploits your confusion")
-                return chosen_move
+                chosen_move = self._choice(mind_moves)
+                return self._variant("confusion", chosen_move)
         
         # Default to standard move if no specific weaknesses to target
         return self._choose_standard_move(usable_moves, player)
@@ -230,73 +337,81 @@ class AdaptiveEnemyAI:
     def _choose_standard_move(self, usable_moves: List[CombatMove], 
                             player: Optional[Combatant]) -> CombatMove:
         """Choose a standard move based on personality and situation"""
+        personality = self.personality
+        preferred_types = personality.preferred_moves
+        specialization = personality.specialization
+        choice = self._choice
+        rand = self._rand
+        
         # Apply personality preferences
         preferred_moves = []
         
         # Filter by preferred move types if specified
-        if self.personality.preferred_moves:
+        if preferred_types:
             type_filtered = [move for move in usable_moves 
-                           if move.move_type in self.personality.preferred_moves]
+                           if move.move_type in preferred_types]
             if type_filtered:
                 preferred_moves = type_filtered
                 
         # Filter by specialization domains if specified
-        if not preferred_moves and self.personality.specialization:
+        if not preferred_moves and specialization:
+            domain_sets = self._move_domain_sets
             domain_filtered = [move for move in usable_moves 
-                             if any(domain in move.domains 
-                                  for domain in self.personality.specialization)]
+                             if not specialization.isdisjoint(domain_sets.get(move, move.domains))]
             if domain_filtered:
                 preferred_moves = domain_filtered
                 
         # Use preferred moves if available, otherwise use all usable moves
         move_pool = preferred_moves if preferred_moves else usable_moves
         
+        # Draw all personality gate rolls up front
+        r_ag, r_ca, r_rt = rand(), rand(), rand()
+        
         # Apply personality traits to move selection
-        if random.random() < self.personality.aggression:
+        if r_ag < personality.aggression:
             # Aggressive: prefer Force moves
-            force_moves = [move for move in move_pool if move.move_type == MoveType.FORCE]
+            force_moves = [move for move in move_pool if move.move_type is MoveType.FORCE]
             if force_moves:
-                return random.choice(force_moves)
+                return choice(force_moves)
                 
-        if random.random() < self.personality.calculation:
+        if r_ca < personality.calculation:
             # Calculating: use a calculated approach
-            chosen_move = random.choice(move_pool)
-            return chosen_move.as_calculated()
+            return self._variant("calculated", choice(move_pool))
             
-        if random.random() < self.personality.risk_taking:
+        if r_rt < personality.risk_taking:
             # Risk taker: possibly use a desperate move
-            chosen_move = random.choice(move_pool)
-            return chosen_move.as_desperate()
+            return self._variant("risky", choice(move_pool))
             
         # Default: random selection from move pool
-        return random.choice(move_pool)
+        return choice(move_pool)
     
     def _get_counter_move_type(self, move_type: MoveType) -> MoveType:
         """Get the move type that counters a given move type"""
-        if move_type == MoveType.FORCE:
-            return MoveType.FOCUS
-        elif move_type == MoveType.TRICK:
-            return MoveType.FORCE
-        elif move_type == MoveType.FOCUS:
-            return MoveType.TRICK
-        else:
+        preferred_moves = self.personality.preferred_moves
+        if preferred_moves is not self._counter_cache_moves:
+            self._counter_cache.clear()
+            self._counter_cache_moves = preferred_moves
+            
+        cached = self._counter_cache.get(move_type)
+        if cached is not None:
+            return cached
+            
+        counter = _COUNTER_TABLE.get(move_type)
+        if counter is None:
             # For other move types, default to the most appropriate counter
-            if self.personality.preferred_moves:
-                return self.personality.preferred_moves[0]
+            if preferred_moves:
+                counter = preferred_moves[0]
             else:
-                return MoveType.FOCUS  # Default to Focus as a general counter
+                counter = MoveType.FOCUS  # Default to Focus as a general counter
+                
+        self._counter_cache[move_type] = counter
+        return counter
     
     def update_from_combat_result(self, result: dict) -> None:
         """Update AI behavior based on combat result"""
         # Extract relevant information
-        player_move_type = None
-        enemy_move_type = None
-        
-        for move_type in MoveType:
-            if move_type.value == result.get("actor_move"):
-                player_move_type = move_type
-            if move_type.value == result.get("target_move"):
-                enemy_move_type = move_type
+        player_move_type = _MOVETYPE_BY_VALUE.get(result.get("actor_move"))
+        enemy_move_type = _MOVETYPE_BY_VALUE.get(result.get("target_move"))
                 
         if not player_move_type or not enemy_move_type:
             return
@@ -313,8 +428,10 @@ class AdaptiveEnemyAI:
     
     def _adapt_personality(self, result: dict) -> None:
         """Adjust personality traits based on combat results"""
+        personality = self.personality
+        
         # Only adapt if adaptability is significant
-        if self.personality.adaptability < 0.3:
+        if personality.adaptability < 0.3:
             return
             
         # Get result info
@@ -322,22 +439,21 @@ class AdaptiveEnemyAI:
         effect_magnitude = result.get("effect_magnitude", 0)
         
         # Adjust aggression
-        if success and self.personality.aggression > 0.3:
-            # If successful with current strategy, slightly reinforce it
-            self.personality.aggression *= 1.05
-            self.personality.aggression = min(1.0, self.personality.aggression)
-        elif not success and self.personality.aggression > 0.3:
-            # If unsuccessful, consider changing strategy
-            self.personality.aggression *= 0.95
+        aggression = personality.aggression
+        if aggression > 0.3:
+            if success:
+                # If successful with current strategy, slightly reinforce it
+                personality.aggression = min(1.0, aggression * 1.05)
+            else:
+                # If unsuccessful, consider changing strategy
+                personality.aggression = aggression * 0.95
             
         # Adjust risk taking based on health and success
-        health_ratio = self.enemy.current_health / self.enemy.max_health
-        if health_ratio < 0.5 and not success:
+        enemy = self.enemy
+        risk_taking = personality.risk_taking
+        if not success and enemy.current_health / enemy.max_health < 0.5:
             # Getting desperate, increase risk taking
-            self.personality.risk_taking = min(1.0, self.personality.risk_taking * 1.1)
-        elif success and effect_magnitude > 3:
-            # Successful with big effect, reinforce current risk level
-            pass
-        else:
-            # Gradually normalize risk taking
-            self.personality.risk_taking = 0.5 + (self.personality.risk_taking - 0.5) * 0.95
+            personality.risk_taking = min(1.0, risk_taking * 1.1)
+        elif not (success and effect_magnitude > 3):
+            # Gradually normalize risk taking; a successful big hit keeps it as is
+            personality.risk_taking = 0.5 + (risk_taking - 0.5) * 0.95
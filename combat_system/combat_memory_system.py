@@ -1,73 +1,179 @@
 from typing import List, Dict, Any, Optional
 import json
-from datetime import datetime
+import heapq
+from time import time as _time
+from collections import deque
+from itertools import islice
+
+try:
+    import orjson  # Optional, much faster encoder for large encounter logs
+except ImportError:
+    orjson = None
+
+# Encoder/decoder bound once so the per-call paths skip the module attribute lookups
+if orjson is not None:
+    _orjson_dumps, _orjson_loads = orjson.dumps, orjson.loads
+    _OPT_COMPACT = orjson.OPT_NON_STR_KEYS
+    _OPT_INDENTED = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+_json_dumps, _json_loads = json.dumps, json.loads
+
+def _dumps(data: Any, indent: bool = True) -> bytes:
+    """Serialize data to JSON bytes, indented unless writing a log line"""
+    if orjson is not None:
+        return _orjson_dumps(data, option=_OPT_INDENTED if indent else _OPT_COMPACT)
+    return _json_dumps(data, indent=2 if indent else None).encode("utf-8")
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes"""
+    if orjson is not None:
+        return _orjson_loads(raw)
+    return _json_loads(raw)
+
+# Opponent history fields stored as insertion-ordered sets (dicts with None values)
+_KNOWN_FIELDS = ("known_moves", "known_weaknesses", "known_strengths")
+
+# Encounter outcome -> opponent history counter it increments
+_OUTCOME_FIELD = {"victory": "victories", "defeat": "defeats", "draw": "draws"}
+
+def _copy_insights(insights: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy cached opponent insights, including their lists, so callers can't alter the cache"""
+    return {key: list(value) if isinstance(value, list) else value for key, value in insights.items()}
 
 class CombatMemory:
-    def __init__(self):
-        self.encounters = []  # List of combat encounters
+    __slots__ = ('encounters', 'opponent_history', 'move_usage_stats', '_recent_opponent_sets',
+                 '_top_moves_cache', '_effectiveness', 'encounter_log_path', '_insights_cache',
+                 'max_encounters')
+    
+    # Number of recent encounters exposed to the Langchain integration
+    RECENT_ENCOUNTERS = 3
+    
+    def __init__(self, encounter_log_path: Optional[str] = None, max_encounters: Optional[int] = None):
+        # Most recent combat encounters; capped at max_encounters when given, so long
+        # sessions keep bounded memory (use encounter_log_path for the full record)
+        self.max_encounters = max_encounters
+        self.encounters = deque(maxlen=max_encounters)
+        # Optional JSONL file each encounter is appended to as it's recorded; when
+        # set, save_to_file only writes aggregates and encounters load from the log
+        self.encounter_log_path = encounter_log_path
         self.opponent_history = {}  # History with specific opponents
         self.move_usage_stats = {}  # Stats on move usage and effectiveness
+        # Opponent names for each of the most recent encounters
+        self._recent_opponent_sets = deque(maxlen=self.RECENT_ENCOUNTERS)
+        # Ranked top moves by count, cleared whenever move stats change
+        self._top_moves_cache: Dict[int, List[Dict]] = {}
+        # Flat move name -> effectiveness rating mirror for ranking
+        self._effectiveness: Dict[str, float] = {}
+        # Opponent name -> insights, dropped when that opponent's history changes
+        self._insights_cache: Dict[str, Dict[str, Any]] = {}
         
     def record_encounter(self, encounter_data: Dict[str, Any]) -> None:
         """Record a full combat encounter"""
-        # Add timestamp
-        encounter_data["timestamp"] = datetime.now().isoformat()
+        # Add timestamp (epoch seconds; format with datetime.fromtimestamp for display)
+        encounter_data["timestamp"] = _time()
         
-        # Add to encounters list
+        # Add to encounters (oldest drops off once the cap is reached)
         self.encounters.append(encounter_data)
         
+        # Group notable moments by opponent once, then hand each opponent its slice
+        moments_by_opp = {}
+        for moment in encounter_data.get("notable_moments", []):
+            moments_by_opp.setdefault(moment.get("involves", ""), []).append(moment)
+        
         # Update opponent histories
         for opponent in encounter_data.get("opponents", []):
-            self._update_opponent_history(opponent, encounter_data)
+            self._update_opponent_history(opponent, encounter_data, moments_by_opp=moments_by_opp)
             
         # Update move usage stats
         for move_record in encounter_data.get("moves_used", []):
             self._update_move_stats(move_record)
+            
+        self._track_recent_opponents(encounter_data)
+        
+        if self.encounter_log_path:
+            self._append_to_encounter_log(encounter_data)
+    
+    def recent_encounters(self, count: int) -> List[Dict[str, Any]]:
+        """Return the last count encounters, oldest first"""
+        total = len(self.encounters)
+        return list(islice(self.encounters, max(0, total - count), total))
+    
+    def _append_to_encounter_log(self, encounter_data: Dict[str, Any]) -> None:
+        """Append one encounter to the JSONL encounter log"""
+        try:
+            with open(self.encounter_log_path, 'ab') as f:
+                f.write(_dumps(encounter_data, indent=False) + b"\n")
+        except Exception as e:
+            print(f"Error writing encounter log: {e}")
     
-    def _update_opponent_history(self, opponent: Dict, encounter_data: Dict) -> None:
+    def _load_encounter_log(self) -> List[Dict[str, Any]]:
+        """Read every encounter back from the JSONL encounter log"""
+        try:
+            with open(self.encounter_log_path, 'rb') as f:
+                return [_loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+    
+    def _track_recent_opponents(self, encounter_data: Dict[str, Any]) -> None:
+        """Remember which opponents took part in a recent encounter"""
+        self._recent_opponent_sets.append({
+            opponent["name"] for opponent in encounter_data.get("opponents", [])
+            if opponent.get("name")
+        })
+    
+    def _update_opponent_history(self, opponent: Dict, encounter_data: Dict,
+                                 moments_by_opp: Optional[Dict[str, List[Dict]]] = None) -> None:
         """Update history with a specific opponent"""
         opponent_name = opponent.get("name")
         if not opponent_name:
             return
             
-        if opponent_name not in self.opponent_history:
-            self.opponent_history[opponent_name] = {
+        self._insights_cache.pop(opponent_name, None)
+        # Single lookup on the hit path; the defaults record is only built for new opponents
+        history = self.opponent_history.get(opponent_name)
+        if history is None:
+            history = self.opponent_history[opponent_name] = {
                 "encounters": 0,
                 "victories": 0,
                 "defeats": 0,
+                "draws": 0,
                 "last_encounter": None,
-                "known_moves": set(),
-                "known_weaknesses": set(),
-                "known_strengths": set(),
+                # Dicts used as insertion-ordered sets; JSON-serializable as-is
+                "known_moves": {},
+                "known_weaknesses": {},
+                "known_strengths": {},
                 "narrative_moments": []
             }
             
         # Update stats
-        history = self.opponent_history[opponent_name]
         history["encounters"] += 1
         history["last_encounter"] = encounter_data["timestamp"]
         
         # Record outcome
-        if encounter_data.get("outcome") == "victory":
-            history["victories"] += 1
-        elif encounter_data.get("outcome") == "defeat":
-            history["defeats"] += 1
+        field = _OUTCOME_FIELD.get(encounter_data.get("outcome"))
+        if field:
+            # .get() keeps histories saved before a counter existed loadable
+            history[field] = history.get(field, 0) + 1
             
         # Record moves used by opponent
+        known_moves = history["known_moves"]
         for move in opponent.get("moves_used", []):
-            history["known_moves"].add(move["name"])
+            known_moves[move["name"]] = None
             
         # Record any discovered weaknesses/strengths
+        known_weaknesses = history["known_weaknesses"]
         for weakness in opponent.get("weaknesses_shown", []):
-            history["known_weaknesses"].add(weakness)
+            known_weaknesses[weakness] = None
+        known_strengths = history["known_strengths"]
         for strength in opponent.get("strengths_shown", []):
-            history["known_strengths"].add(strength)
+            known_strengths[strength] = None
             
         # Record narrative moments
-        if "notable_moments" in encounter_data:
-            for moment in encounter_data["notable_moments"]:
-                if moment.get("involves", "") == opponent_name:
-                    history["narrative_moments"].append(moment)
+        if moments_by_opp is None:
+            moments = [moment for moment in encounter_data.get("notable_moments", [])
+                       if moment.get("involves", "") == opponent_name]
+        else:
+            moments = moments_by_opp.get(opponent_name, ())
+        history["narrative_moments"].extend(moments)
     
     def _update_move_stats(self, move_record: Dict) -> None:
         """Update statistics for a specific move"""
@@ -75,35 +181,49 @@ class CombatMemory:
         if not move_name:
             return
             
-        if move_name not in self.move_usage_stats:
-            self.move_usage_stats[move_name] = {
+        self._top_moves_cache.clear()
+        stats = self.move_usage_stats.get(move_name)
+        if stats is None:
+            stats = self.move_usage_stats[move_name] = {
                 "times_used": 0,
                 "successful_uses": 0,
                 "total_damage": 0,
                 "average_damage": 0,
+                "success_rate": 0,
                 "effectiveness_rating": 0
             }
             
-        stats = self.move_usage_stats[move_name]
-        stats["times_used"] += 1
+        times_used = stats["times_used"] + 1
+        stats["times_used"] = times_used
         
+        successful_uses = stats["successful_uses"]
         if move_record.get("success", False):
-            stats["successful_uses"] += 1
+            successful_uses += 1
+            stats["successful_uses"] = successful_uses
             
         # Update damage stats if applicable
+        average_damage = stats["average_damage"]
         if "damage" in move_record:
-            stats["total_damage"] += move_record["damage"]
-            stats["average_damage"] = stats["total_damage"] / stats["times_used"]
+            total_damage = stats["total_damage"] + move_record["damage"]
+            stats["total_damage"] = total_damage
+            average_damage = total_damage / times_used
+            stats["average_damage"] = average_damage
             
         # Calculate overall effectiveness rating (success rate * avg damage)
-        success_rate = stats["successful_uses"] / stats["times_used"]
-        stats["effectiveness_rating"] = success_rate * stats["average_damage"] if stats["average_damage"] else success_rate * 5
+        success_rate = successful_uses / times_used
+        stats["success_rate"] = success_rate
+        stats["effectiveness_rating"] = success_rate * (average_damage if average_damage else 5)
+        self._effectiveness[move_name] = stats["effectiveness_rating"]
     
     def get_opponent_insights(self, opponent_name: str) -> Dict[str, Any]:
         """Get tactical insights about a specific opponent"""
         if opponent_name not in self.opponent_history:
             return {"known": False, "message": "No history with this opponent"}
             
+        cached = self._insights_cache.get(opponent_name)
+        if cached is not None:
+            return _copy_insights(cached)
+            
         history = self.opponent_history[opponent_name]
         
         insights = {
@@ -119,13 +239,13 @@ class CombatMemory:
         # Generate tactical suggestions based on history
         if history["known_weaknesses"]:
             insights["suggested_approaches"].append(
-                f"Target their known weaknesses: {', '.join(history['known_weaknesses'])}"
+                "Target their known weaknesses: " + ", ".join(history["known_weaknesses"])
             )
             
         if history["known_moves"]:
             # Suggest counters to their most common moves
             insights["suggested_approaches"].append(
-                f"Prepare counters for their typical moves: {', '.join(list(history['known_moves'])[:3])}"
+                "Prepare counters for their typical moves: " + ", ".join(islice(history["known_moves"], 3))
             )
             
         # Add narrative callback if there's history
@@ -133,16 +253,16 @@ class CombatMemory:
             recent_moment = history["narrative_moments"][-1]
             insights["narrative_callback"] = recent_moment.get("description", "You've faced this opponent before.")
             
-        return insights
+        self._insights_cache[opponent_name] = insights
+        return _copy_insights(insights)
     
     def save_to_file(self, filename: str) -> bool:
         """Save combat memory to a JSON file"""
         try:
-            # Convert sets to lists for JSON serialization
             serializable_data = self._prepare_for_serialization()
             
-            with open(filename, 'w') as f:
-                json.dump(serializable_data, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(_dumps(serializable_data))
             return True
         except Exception as e:
             print(f"Error saving combat memory: {e}")
@@ -151,64 +271,67 @@ class CombatMemory:
     def load_from_file(self, filename: str) -> bool:
         """Load combat memory from a JSON file"""
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            with open(filename, 'rb') as f:
+                data = _loads(f.read())
                 
             # Restore data structures
-            self.encounters = data.get("encounters", [])
-            
-            # Restore opponent history with sets
-            self.opponent_history = {}
-            for opponent, history in data.get("opponent_history", {}).items():
-                self.opponent_history[opponent] = history
-                # Convert lists back to sets
-                self.opponent_history[opponent]["known_moves"] = set(history.get("known_moves", []))
-                self.opponent_history[opponent]["known_weaknesses"] = set(history.get("known_weaknesses", []))
-                self.opponent_history[opponent]["known_strengths"] = set(history.get("known_strengths", []))
-                
+            if self.encounter_log_path:
+                encounters = self._load_encounter_log()
+            else:
+                encounters = data.get("encounters", [])
+            self.encounters = deque(encounters, maxlen=self.max_encounters)
+            self._recent_opponent_sets.clear()
+            for encounter in self.recent_encounters(self.RECENT_ENCOUNTERS):
+                self._track_recent_opponents(encounter)
+            
+            self.opponent_history = data.get("opponent_history", {})
+            # Saves from before the dict-as-set fields hold these as lists
+            for history in self.opponent_history.values():
+                for field in _KNOWN_FIELDS:
+                    history[field] = dict.fromkeys(history.get(field, []))
+            self._insights_cache.clear()
             self.move_usage_stats = data.get("move_usage_stats", {})
+            # Saves from before success_rate was stored derive it from the counts
+            for stats in self.move_usage_stats.values():
+                if "success_rate" not in stats:
+                    times_used = stats["times_used"]
+                    stats["success_rate"] = stats["successful_uses"] / times_used if times_used > 0 else 0
+            self._top_moves_cache.clear()
+            self._effectiveness = {
+                move_name: stats["effectiveness_rating"]
+                for move_name, stats in self.move_usage_stats.items()
+            }
             return True
         except Exception as e:
             print(f"Error loading combat memory: {e}")
             return False
     
     def _prepare_for_serialization(self) -> Dict:
-        """Prepare data for JSON serialization (convert sets to lists)"""
+        """Prepare data for JSON serialization"""
         serializable_data = {
-            "encounters": self.encounters,
-            "opponent_history": {},
+            "opponent_history": self.opponent_history,
             "move_usage_stats": self.move_usage_stats
         }
         
-        # Convert sets to lists in opponent history
-        for opponent, history in self.opponent_history.items():
-            serializable_data["opponent_history"][opponent] = {
-                **history,
-                "known_moves": list(history["known_moves"]),
-                "known_weaknesses": list(history["known_weaknesses"]),
-                "known_strengths": list(history["known_strengths"])
-            }
+        # Encounters are already on disk when streaming to the encounter log
+        if not self.encounter_log_path:
+            serializable_data["encounters"] = list(self.encounters)
             
         return serializable_data
 
 # Example integration with Langchain memory
 def create_langchain_memory_integration(combat_memory: CombatMemory) -> Dict[str, Any]:
     """Create a dictionary of memory elements for Langchain integration"""
+    recent_count = CombatMemory.RECENT_ENCOUNTERS
     memory_elements = {
-        "recent_encounters": combat_memory.encounters[-3:] if combat_memory.encounters else [],
+        "recent_encounters": combat_memory.recent_encounters(recent_count),
         "opponent_records": {},
         "most_effective_moves": _get_top_moves(combat_memory, 3),
         "narrative_hooks": _extract_narrative_hooks(combat_memory)
     }
     
     # Add opponent records for recently encountered opponents
-    recent_opponents = set()
-    for encounter in memory_elements["recent_encounters"]:
-        for opponent in encounter.get("opponents", []):
-            opponent_name = opponent.get("name")
-            if opponent_name:
-                recent_opponents.add(opponent_name)
-                
+    recent_opponents = set().union(*combat_memory._recent_opponent_sets)
     for opponent_name in recent_opponents:
         if opponent_name in combat_memory.opponent_history:
             memory_elements["opponent_records"][opponent_name] = combat_memory.opponent_history[opponent_name]
@@ -217,39 +340,52 @@ def create_langchain_memory_integration(combat_memory: CombatMemory) -> Dict[str
 
 def _get_top_moves(combat_memory: CombatMemory, count: int) -> List[Dict]:
     """Get the most effective moves based on effectiveness rating"""
-    move_stats = list(combat_memory.move_usage_stats.items())
-    # Sort by effectiveness rating
-    move_stats.sort(key=lambda x: x[1]["effectiveness_rating"], reverse=True)
+    cached = combat_memory._top_moves_cache.get(count)
+    if cached is not None:
+        # Copies, so callers can't alter the cached ranking
+        return [dict(move) for move in cached]
+        
+    # Select the highest effectiveness ratings without sorting every move;
+    # the flat rating dict lets the heap key be a C-level dict lookup
+    ratings = combat_memory._effectiveness
+    move_stats = combat_memory.move_usage_stats
     
     top_moves = []
-    for move_name, stats in move_stats[:count]:
+    for move_name in heapq.nlargest(count, ratings, key=ratings.__getitem__):
+        stats = move_stats[move_name]
         top_moves.append({
             "name": move_name,
-            "success_rate": stats["successful_uses"] / stats["times_used"] if stats["times_used"] > 0 else 0,
+            "success_rate": stats["success_rate"],
             "average_damage": stats["average_damage"],
             "effectiveness": stats["effectiveness_rating"]
         })
         
-    return top_moves
+    combat_memory._top_moves_cache[count] = top_moves
+    return [dict(move) for move in top_moves]
 
 def _extract_narrative_hooks(combat_memory: CombatMemory) -> List[str]:
     """Extract interesting narrative hooks from combat history"""
     hooks = []
+    add_hook = hooks.append
     
     # Look for recurring opponents
     for opponent, history in combat_memory.opponent_history.items():
-        if history["encounters"] > 1:
-            hooks.append(f"You've faced {opponent} {history['encounters']} times before.")
+        encounters = history["encounters"]
+        victories = history["victories"]
+        defeats = history["defeats"]
+        narrative_moments = history["narrative_moments"]
+        
+        if encounters > 1:
+            add_hook(f"You've faced {opponent} {encounters} times before.")
             
         # Add victorious or defeat narratives
-        if history["victories"] > 0 and history["defeats"] == 0:
-            hooks.append(f"You've always emerged victorious against {opponent}.")
-        elif history["defeats"] > 0 and history["victories"] == 0:
-            hooks.append(f"{opponent} has bested you every time you've met.")
+        if victories > 0 and defeats == 0:
+            add_hook(f"You've always emerged victorious against {opponent}.")
+        elif defeats > 0 and victories == 0:
+            add_hook(f"{opponent} has bested you every time you've met.")
             
         # Add memorable moments
-        if history["narrative_moments"]:
-            recent_moment = history["narrative_moments"][-1]
-            hooks.append(recent_moment.get("description", ""))
+        if narrative_moments:
+            add_hook(narrative_moments[-1].get("description", ""))
             
     return hooks
@@ -1,5 +1,6 @@
+import sys
 from enum import Enum
-from typing import List, Dict
+from typing import Dict, Tuple
 from combat_system_core_v1_01 import Domain, CombatMove, Combatant
 
 class CombatStance(Enum):
@@ -10,20 +11,37 @@ class CombatStance(Enum):
     RECKLESS = "Reckless"         # High-risk, high-reward stance, boosts desperate moves
     REACTIVE = "Reactive"         # Counter-focused, better at responding to opponent's moves
 
+# Integer id per stance (declaration order) for list-indexed effect lookups
+for _stance_id, _stance in enumerate(CombatStance):
+    _stance.id = _stance_id
+
+# Interned stance effect descriptions, shared by every StanceEffect that lists them
+_EFFECT_BOOST_FORCE = sys.intern("Boost Force moves by 1")
+_EFFECT_REDUCE_DAMAGE = sys.intern("Reduce incoming damage by 20%")
+_EFFECT_CALCULATED_BONUS = sys.intern("Calculated moves get +2 instead of usual bonus")
+_EFFECT_READ_MOVE_TYPE = sys.intern("Can see opponent's next move type with 70% accuracy")
+_EFFECT_DESPERATE_BONUS = sys.intern("Desperate moves get +3 max bonus potential")
+_EFFECT_EXTRA_DAMAGE_TAKEN = sys.intern("Take 20% more damage")
+_EFFECT_COUNTER_BONUS = sys.intern("Counter-type moves get +2 bonus")
+_EFFECT_FREE_COUNTER = sys.intern("Can perform a free counter-attack when successfully defending")
+
 class StanceEffect:
+    __slots__ = ('attack_modifier', 'defense_modifier', 'stamina_usage',
+                 'focus_usage', 'spirit_usage', 'special_effects')
+    
     def __init__(self, 
                  attack_modifier: int = 0,
                  defense_modifier: int = 0,
                  stamina_usage: float = 1.0,
                  focus_usage: float = 1.0,
                  spirit_usage: float = 1.0,
-                 special_effects: List[str] = None):
+                 special_effects: Tuple[str, ...] = ()):
         self.attack_modifier = attack_modifier    # Modifier to attack rolls
         self.defense_modifier = defense_modifier  # Modifier to defense rolls
         self.stamina_usage = stamina_usage        # Multiplier for stamina costs
         self.focus_usage = focus_usage            # Multiplier for focus costs
         self.spirit_usage = spirit_usage          # Multiplier for spirit costs
-        self.special_effects = special_effects or []
+        self.special_effects = tuple(special_effects or ())
 
 # Define stance effects
 STANCE_EFFECTS = {
@@ -31,36 +49,40 @@ STANCE_EFFECTS = {
         attack_modifier=2,
         defense_modifier=-1,
         stamina_usage=1.2,
-        special_effects=["Boost Force moves by 1"]
+        special_effects=(_EFFECT_BOOST_FORCE,)
     ),
     CombatStance.DEFENSIVE: StanceEffect(
         attack_modifier=-1,
         defense_modifier=2,
         stamina_usage=0.8,
-        special_effects=["Reduce incoming damage by 20%"]
+        special_effects=(_EFFECT_REDUCE_DAMAGE,)
     ),
     CombatStance.BALANCED: StanceEffect(),  # Default values (no modifiers)
     CombatStance.TACTICAL: StanceEffect(
         focus_usage=1.2,
-        special_effects=["Calculated moves get +2 instead of usual bonus", 
-                        "Can see opponent's next move type with 70% accuracy"]
+        special_effects=(_EFFECT_CALCULATED_BONUS, _EFFECT_READ_MOVE_TYPE)
     ),
     CombatStance.RECKLESS: StanceEffect(
         attack_modifier=3,
         defense_modifier=-2,
         stamina_usage=1.5,
-        special_effects=["Desperate moves get +3 max bonus potential", 
-                        "Take 20% more damage"]
+        special_effects=(_EFFECT_DESPERATE_BONUS, _EFFECT_EXTRA_DAMAGE_TAKEN)
     ),
     CombatStance.REACTIVE: StanceEffect(
         attack_modifier=-1,
         defense_modifier=1,
         focus_usage=1.1,
-        special_effects=["Counter-type moves get +2 bonus", 
-                        "Can perform a free counter-attack when successfully defending"]
+        special_effects=(_EFFECT_COUNTER_BONUS, _EFFECT_FREE_COUNTER)
     )
 }
 
+# Effects indexed by CombatStance.id, avoiding enum hashing during resolution
+STANCE_EFFECTS_BY_ID = [STANCE_EFFECTS[stance] for stance in CombatStance]
+
+def get_stance_effect(stance: CombatStance) -> StanceEffect:
+    """Get the effects of a stance"""
+    return STANCE_EFFECTS_BY_ID[stance.id]
+
 def apply_stance_to_combatant(combatant: Combatant, stance: CombatStance) -> None:
     """Apply stance effects to a combatant"""
     # Store the current stance for reference
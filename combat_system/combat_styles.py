@@ -1,4 +1,4 @@
-from typing import List, Dict, Tuple
+from typing import Dict, Tuple
 from enum import Enum
 from combat_system_core_v1_01 import Domain, CombatMove, MoveType, Combatant
 
@@ -17,7 +17,19 @@ class StyleTier(Enum):
     EXPERT = "Expert"
     MASTER = "Master"
     
+# Rank of each tier, for comparing progress
+_TIER_RANK = {tier: rank for rank, tier in enumerate(StyleTier)}
+    
 class StyleProgression:
+    __slots__ = ('style', 'tier', 'experience', 'unlocked_moves', 'mastery_abilities')
+    
+    # Experience needed for each tier, in ascending order
+    _TIER_THRESHOLDS = (
+        (100, StyleTier.ADEPT),
+        (300, StyleTier.EXPERT),
+        (700, StyleTier.MASTER),
+    )
+    
     def __init__(self, style: CombatStyle):
         self.style = style
         self.tier = StyleTier.NOVICE
@@ -32,31 +44,18 @@ class StyleProgression:
         
     def _check_tier_up(self):
         """Check if the style has reached a new tier"""
-        if self.tier == StyleTier.NOVICE and self.experience >= 100:
-            self.tier = StyleTier.ADEPT
-            self._unlock_adept_abilities()
-        elif self.tier == StyleTier.ADEPT and self.experience >= 300:
-            self.tier = StyleTier.EXPERT
-            self._unlock_expert_abilities()
-        elif self.tier == StyleTier.EXPERT and self.experience >= 700:
-            self.tier = StyleTier.MASTER
-            self._unlock_master_abilities()
+        for threshold, tier in self._TIER_THRESHOLDS:
+            if self.experience < threshold:
+                break
+            if _TIER_RANK[tier] > _TIER_RANK[self.tier]:
+                self.tier = tier
+                self._unlock(tier)
     
-    def _unlock_adept_abilities(self):
-        """Unlock abilities for the Adept tier"""
-        new_abilities = STYLE_PROGRESSION_TREE[self.style][StyleTier.ADEPT]
+    def _unlock(self, tier: StyleTier):
+        """Unlock abilities for the given tier"""
+        new_abilities = STYLE_PROGRESSION_TREE.get(self.style, {}).get(tier, ())
         self.mastery_abilities.extend(new_abilities)
         # Here you would add new moves to the combatant based on the style
-        
-    def _unlock_expert_abilities(self):
-        """Unlock abilities for the Expert tier"""
-        new_abilities = STYLE_PROGRESSION_TREE[self.style][StyleTier.EXPERT]
-        self.mastery_abilities.extend(new_abilities)
-        
-    def _unlock_master_abilities(self):
-        """Unlock abilities for the Master tier"""
-        new_abilities = STYLE_PROGRESSION_TREE[self.style][StyleTier.MASTER]
-        self.mastery_abilities.extend(new_abilities)
 
 # Sample progression tree for styles
 STYLE_PROGRESSION_TREE = {
@@ -73,38 +72,37 @@ STYLE_PROGRESSION_TREE = {
     # Add other styles here
 }
 
-# Extend the Combatant class to include styles
 def add_combat_style(combatant: Combatant, style: CombatStyle) -> None:
     """Add a combat style to a combatant"""
-    if not hasattr(combatant, 'combat_styles'):
-        combatant.combat_styles = {}
-    
     # Create a new style progression if not already present
     if style not in combatant.combat_styles:
         combatant.combat_styles[style] = StyleProgression(style)
         
-def get_style_moves(style: CombatStyle) -> List[CombatMove]:
-    """Get moves associated with a specific combat style"""
-    # This would be populated with style-specific moves
-    style_moves = {
-        CombatStyle.BERSERKER: [
-            CombatMove(
-                name="Raging Strike",
-                move_type=MoveType.FORCE,
-                domains=[Domain.BODY],
-                description="A powerful strike fueled by rage",
-                stamina_cost=2
-            ),
-            CombatMove(
-                name="Intimidating Roar",
-                move_type=MoveType.FORCE,
-                domains=[Domain.AUTHORITY, Domain.BODY],
-                description="A terrifying roar that frightens enemies",
-                stamina_cost=1,
-                spirit_cost=1
-            ),
-        ],
-        # Add more styles and their moves
-    }
+# Style-specific moves, built once and shared by all callers
+_STYLE_MOVES: Dict[CombatStyle, Tuple[CombatMove, ...]] = {
+    CombatStyle.BERSERKER: (
+        CombatMove(
+            name="Raging Strike",
+            move_type=MoveType.FORCE,
+            domains=[Domain.BODY],
+            description="A powerful strike fueled by rage",
+            stamina_cost=2
+        ),
+        CombatMove(
+            name="Intimidating Roar",
+            move_type=MoveType.FORCE,
+            domains=[Domain.AUTHORITY, Domain.BODY],
+            description="A terrifying roar that frightens enemies",
+            stamina_cost=1,
+            spirit_cost=1
+        ),
+    ),
+    # Add more styles and their moves
+}
+
+def get_style_moves(style: CombatStyle) -> Tuple[CombatMove, ...]:
+    """Get moves associated with a specific combat style
     
-    return style_moves.get(style, [])
+    The moves are shared; clone() one before marking it for a turn.
+    """
+    return _STYLE_MOVES.get(style, ())
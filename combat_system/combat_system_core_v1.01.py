@@ -1,8 +1,11 @@
 from enum import Enum, auto
-from typing import List, Dict, Optional, Tuple, Set
+from typing import List, Dict, Mapping, Optional, Tuple, Set
 import random
-from dataclasses import dataclass
-from collections import defaultdict
+import copy
+import re
+from dataclasses import dataclass, field
+from collections import OrderedDict, deque
+from types import MappingProxyType
 
 # Core Enumerations
 class Domain(Enum):
@@ -14,6 +17,11 @@ class Domain(Enum):
     AUTHORITY = "Authority"  # Command, intimidation, willpower
     SPIRIT = "Spirit"   # Faith, connection to otherworldly forces
 
+# Enum values stay display strings; integer ids/bits are attached per member for
+# table lookups, and members are compared by identity (they are singletons)
+for _domain_id, _domain in enumerate(Domain):
+    _domain.id = _domain_id
+
 class MoveType(Enum):
     FORCE = "Force"     # Direct attacks, overwhelming power - beats TRICK
     TRICK = "Trick"     # Deception, evasion, misdirection - beats FOCUS
@@ -22,6 +30,23 @@ class MoveType(Enum):
     DEBUFF = "Debuff"   # Weaken opponent abilities or stats
     UTILITY = "Utility" # Environmental interaction, movement, etc.
 
+# Integer id per move type (declaration order) for table-indexed lookups
+for _move_type_id, _move_type in enumerate(MoveType):
+    _move_type.id = _move_type_id
+
+def _build_type_advantage_table() -> Tuple[Tuple[int, ...], ...]:
+    """Type advantage for every (actor, target) pair, indexed by MoveType.id"""
+    # Basic RPS: Force > Trick > Focus > Force
+    beats = {MoveType.FORCE: MoveType.TRICK, MoveType.TRICK: MoveType.FOCUS, MoveType.FOCUS: MoveType.FORCE}
+    return tuple(
+        tuple(1 if beats.get(actor) is target else -1 if beats.get(target) is actor else 0
+              for target in MoveType)
+        for actor in MoveType
+    )
+
+# 1 if actor has advantage, -1 if target has advantage, 0 if neutral
+_TYPE_ADVANTAGE = _build_type_advantage_table()
+
 class CombatantType(Enum):
     PLAYER = "Player"
     NPC = "NPC"
@@ -39,7 +64,17 @@ class Status(Enum):
     BLEEDING = "Bleeding"   # Ongoing damage over time
     EXHAUSTED = "Exhausted" # Reduced stamina regeneration
 
-@dataclass
+# One bit per status (declaration order) so a combatant's statuses pack into an int
+for _status_index, _status in enumerate(Status):
+    _status.bit = 1 << _status_index
+
+_WOUNDED_BIT = Status.WOUNDED.bit
+_CONFUSED_BIT = Status.CONFUSED.bit
+
+# Statuses a successful generic debuff can inflict
+_DEBUFF_STATUSES = (Status.STUNNED, Status.FRIGHTENED)
+
+@dataclass(slots=True)
 class Consequence:
     """Represents a long-term effect resulting from combat"""
     description: str
@@ -47,7 +82,28 @@ class Consequence:
     duration: int  # In encounters/scenes
     intensity: int  # 1-5 scale
     narrative_hook: str
-    affected_stats: Dict[str, int] = None  # Stat modifiers
+    affected_stats: Dict[str, int] = field(default_factory=dict)  # Stat modifiers
+
+# Environment tag -> (domain, roll modifier) applied to moves using that domain
+_ENVIRONMENT_DOMAIN_MODIFIERS = {
+    "Shadowy": (Domain.AWARENESS, 1),
+    "Confined": (Domain.BODY, -1),
+    # Add more environmental interactions
+}
+
+# Move types whose successful hits deal damage
+_DAMAGING_MOVE_TYPES = frozenset({MoveType.FORCE, MoveType.TRICK})
+
+# Shared (immutable) hooks value for results resolved with narrative disabled
+_NO_NARRATIVE_HOOKS = ()
+
+# Faces of the d6 used for move rolls
+_D6_FACES = (1, 2, 3, 4, 5, 6)
+# Base d6 rolls drawn per refill of a CombatSystem's roll stream
+_D6_BUFFER_SIZE = 4096
+# Possible roll swings for desperate moves (-3..+5) and calculated moves (0..2)
+_DESPERATE_SWINGS = tuple(range(-3, 6))
+_CALCULATED_SWINGS = (0, 1, 2)
 
 # Core Classes
 class CombatMove:
@@ -62,6 +118,8 @@ class CombatMove:
         self.name = name
         self.move_type = move_type
         self.domains = domains
+        self._domains_key = tuple(domains)  # Hashable form for rating caches
+        self._domain_values = tuple(domain.value for domain in domains)  # Logged with results
         self.description = description
         self.stamina_cost = stamina_cost
         self.focus_cost = focus_cost
@@ -72,7 +130,7 @@ class CombatMove:
         self.narrative_hook = None
     
     def set_target(self, target: 'Combatant'):
-        self.move.target = target
+        self.target = target
         return self
     
     def as_desperate(self):
@@ -89,6 +147,10 @@ class CombatMove:
         """Add specific narrative element to influence AI description"""
         self.narrative_hook = hook
         return self
+    
+    def clone(self) -> 'CombatMove':
+        """Shallow copy, so variants can be marked without touching the original"""
+        return copy.copy(self)
         
     def __str__(self):
         domains_str = ", ".join([d.value for d in self.domains])
@@ -96,6 +158,13 @@ class CombatMove:
 
 
 class Combatant:
+    __slots__ = ('name', 'combatant_type', '_domain_ratings', '_best_rating_cache',
+                 'max_health', 'current_health', 'max_stamina', 'current_stamina',
+                 'max_focus', 'current_focus', 'max_spirit', 'current_spirit',
+                 'status_mask', 'momentum', 'consequences', 'available_moves',
+                 'combat_memory', 'weak_domains', 'strong_domains',
+                 'combat_styles', 'current_stance', 'enhanced_statuses')
+    
     def __init__(self, 
                  name: str, 
                  combatant_type: CombatantType,
@@ -106,6 +175,8 @@ class Combatant:
                  max_spirit: int = 100):
         self.name = name
         self.combatant_type = combatant_type
+        # (domains tuple, status_mask) -> best effective rating; cleared when ratings are replaced
+        self._best_rating_cache = {}
         self.domain_ratings = domain_ratings
         
         # Core stats
@@ -119,7 +190,8 @@ class Combatant:
         self.current_spirit = max_spirit
         
         # Combat state
-        self.statuses = set()  # Set of Status enums
+        self.status_mask = 0  # Bitwise OR of Status.bit for every active status
+        self.momentum = 0  # 0-3, gained by winning exchanges
         self.consequences = []  # List of Consequence objects
         
         # Known moves
@@ -129,29 +201,67 @@ class Combatant:
         self.combat_memory = []  # List of past interactions
         self.weak_domains = []  # Domains this combatant is weak against
         self.strong_domains = []  # Domains this combatant is strong with
+        
+        # Progression
+        self.combat_styles = {}  # CombatStyle -> StyleProgression
+        
+        # Set by the stance and status systems
+        self.current_stance = None  # CombatStance
+        self.enhanced_statuses = []  # List of EnhancedStatus objects
+    
+    @property
+    def domain_ratings(self) -> Mapping[Domain, int]:
+        """Read-only view of the ratings; change them with set_domain_rating or by assignment"""
+        return MappingProxyType(self._domain_ratings)
+    
+    @domain_ratings.setter
+    def domain_ratings(self, ratings: Dict[Domain, int]) -> None:
+        # Copied so later edits to the caller's dict can't bypass the cache
+        self._domain_ratings = dict(ratings)
+        self._best_rating_cache.clear()
+    
+    def set_domain_rating(self, domain: Domain, rating: int) -> None:
+        """Change one domain rating, dropping cached best ratings"""
+        self._domain_ratings[domain] = rating
+        self._best_rating_cache.clear()
+    
+    @property
+    def statuses(self) -> frozenset:
+        """Active statuses as a set of Status enums (read-only view of status_mask)"""
+        mask = self.status_mask
+        return frozenset(status for status in Status if mask & status.bit)
+    
+    def has_status(self, status: Status) -> bool:
+        """Check whether a status is currently active"""
+        return bool(self.status_mask & status.bit)
     
     def add_move(self, move: CombatMove):
         self.available_moves.append(move)
     
     def apply_damage(self, amount: int, domains: List[Domain] = None):
         """Apply damage to health with optional domain context"""
-        self.current_health = max(0, self.current_health - amount)
+        wounded = self._take_damage(amount)
         
-        # Domain-specific processing could go here
-        wounded = False
-        if self.current_health < self.max_health * 0.5 and Status.WOUNDED not in self.statuses:
-            self.statuses.add(Status.WOUNDED)
-            wounded = True
-            
         return {
             "damage_dealt": amount,
             "current_health": self.current_health,
             "wounded": wounded
         }
     
+    def _take_damage(self, amount: int) -> bool:
+        """Reduce health, returning True if this damage newly wounded the combatant"""
+        health = self.current_health - amount
+        self.current_health = health = health if health > 0 else 0
+        
+        # Domain-specific processing could go here
+        # Crossing half health sets WOUNDED; OR-ing in the bit is a no-op when already set
+        newly_wounded = health < self.max_health * 0.5 and not self.status_mask & _WOUNDED_BIT
+        self.status_mask |= _WOUNDED_BIT * newly_wounded
+        return newly_wounded
+    
     def apply_status(self, status: Status, duration: int = 3):
         """Apply a status effect"""
-        self.statuses.add(status)
+        self.status_mask |= status.bit
         
         # Status-specific logic could go here
         # For example, CONFUSED might reduce Mind domain effectiveness
@@ -163,17 +273,39 @@ class Combatant:
     
     def get_domain_rating(self, domain: Domain) -> int:
         """Get effective domain rating accounting for statuses"""
-        base_rating = self.domain_ratings.get(domain, 0)
+        base_rating = self._domain_ratings.get(domain, 0)
         
         # Apply modifiers from statuses
-        if Status.WOUNDED in self.statuses and domain == Domain.BODY:
+        if domain is Domain.BODY and self.status_mask & _WOUNDED_BIT:
             base_rating -= 1
-        if Status.CONFUSED in self.statuses and domain == Domain.MIND:
+        if domain is Domain.MIND and self.status_mask & _CONFUSED_BIT:
             base_rating -= 1
         # Add more status effects as needed
         
         return max(0, base_rating)  # Can't go below 0
     
+    def best_domain_rating(self, move: CombatMove) -> int:
+        """Highest effective rating among a move's domains, memoized per status combination"""
+        key = (move._domains_key, self.status_mask)
+        best = self._best_rating_cache.get(key)
+        if best is None:
+            # Single pass with the status penalties resolved once (mirrors get_domain_rating)
+            status_mask = self.status_mask
+            body_penalty = 1 if status_mask & _WOUNDED_BIT else 0
+            mind_penalty = 1 if status_mask & _CONFUSED_BIT else 0
+            ratings = self._domain_ratings
+            best = 0
+            for domain in move._domains_key:
+                domain_rating = ratings.get(domain, 0)
+                if domain is Domain.BODY:
+                    domain_rating -= body_penalty
+                elif domain is Domain.MIND:
+                    domain_rating -= mind_penalty
+                if domain_rating > best:
+                    best = domain_rating
+            self._best_rating_cache[key] = best
+        return best
+    
     def can_use_move(self, move: CombatMove) -> bool:
         """Check if combatant has resources to use this move"""
         if move.stamina_cost > self.current_stamina:
@@ -193,14 +325,60 @@ class Combatant:
     def is_defeated(self) -> bool:
         """Check if combatant is defeated"""
         return self.current_health <= 0
+    
+    def state_key(self) -> Tuple[int, int, int, int, int, int]:
+        """Compact snapshot of the combat-relevant mutable state, for search caches"""
+        return (self.current_health, self.current_stamina, self.current_focus,
+                self.current_spirit, self.status_mask, self.momentum)
 
 
 class CombatSystem:
-    def __init__(self):
-        self.combat_log = []  # List of combat events for memory
-        self.momentum = defaultdict(int)  # Track momentum per combatant
-        self.environment_tags = set()  # Current environment properties
+    # Default number of most recent combat events kept in combat_log
+    COMBAT_LOG_SIZE = 1024
+    
+    def __init__(self, narrative_enabled: bool = True, combat_log_size: Optional[int] = COMBAT_LOG_SIZE):
+        # Headless simulations can turn off narrative hook generation entirely
+        self.narrative_enabled = narrative_enabled
+        # Recent combat events for memory; a ring buffer so long simulations stay
+        # bounded (pass combat_log_size=None to keep every event)
+        self.combat_log = deque(maxlen=combat_log_size)
+        self.environment_tags = frozenset()  # Current environment properties
         self.round_counter = 0
+        self._d6_stream = iter(())  # Pre-drawn base d6 rolls, refilled on demand
+    
+    def start_combat(self, combatants: List[Combatant]) -> None:
+        """Prepare combatants for a new fight; momentum doesn't carry over between combats"""
+        for combatant in combatants:
+            combatant.momentum = 0
+    
+    def state_key(self, combatants: List[Combatant]) -> int:
+        """Hash of the combatants' states and the environment, for transposition tables"""
+        return hash((self._environment_tags, tuple(combatant.state_key() for combatant in combatants)))
+    
+    def _d6(self) -> int:
+        """Next base d6 roll, drawing them in bulk rather than one randint per roll"""
+        roll = next(self._d6_stream, None)
+        if roll is None:
+            self._d6_stream = iter(random.choices(_D6_FACES, k=_D6_BUFFER_SIZE))
+            roll = next(self._d6_stream)
+        return roll
+    
+    @property
+    def environment_tags(self) -> frozenset:
+        return self._environment_tags
+    
+    @environment_tags.setter
+    def environment_tags(self, tags) -> None:
+        # Frozen so every change goes through here and refreshes the modifier caches
+        self._environment_tags = frozenset(tags)
+        env_mod = {}
+        for tag in self._environment_tags:
+            modifier = _ENVIRONMENT_DOMAIN_MODIFIERS.get(tag)
+            if modifier:
+                domain, amount = modifier
+                env_mod[domain] = env_mod.get(domain, 0) + amount
+        self._env_mod = env_mod  # Domain -> roll modifier
+        self._env_mod_by_move = {}  # Move domains tuple -> summed roll modifier
     
     def resolve_opposed_moves(self, 
                               actor: Combatant, 
@@ -208,6 +386,31 @@ class CombatSystem:
                               target: Combatant, 
                               target_move: CombatMove) -> dict:
         """Resolve two opposed moves against each other"""
+        return self._resolve_opposed_moves(actor, actor_move, target, target_move,
+                                           self._d6(), self._d6())
+    
+    def resolve_opposed_moves_batch(self,
+                                    matchups: List[Tuple[Combatant, CombatMove, Combatant, CombatMove]]) -> List[dict]:
+        """Resolve many (actor, actor_move, target, target_move) matchups in order
+        
+        Intended for simulation rollouts: every base d6 for the batch is drawn in a
+        single random.choices call rather than two random.randint calls per matchup.
+        """
+        rolls = random.choices(_D6_FACES, k=2 * len(matchups))
+        resolve = self._resolve_opposed_moves
+        return [
+            resolve(actor, actor_move, target, target_move, rolls[2 * i], rolls[2 * i + 1])
+            for i, (actor, actor_move, target, target_move) in enumerate(matchups)
+        ]
+    
+    def _resolve_opposed_moves(self,
+                               actor: Combatant,
+                               actor_move: CombatMove,
+                               target: Combatant,
+                               target_move: CombatMove,
+                               actor_d6: int,
+                               target_d6: int) -> dict:
+        """Resolve two opposed moves using already-rolled base d6 values"""
         # Check if actors can use their moves
         if not actor.can_use_move(actor_move):
             return {"success": False, "reason": f"{actor.name} lacks resources for {actor_move.name}"}
@@ -219,12 +422,14 @@ class CombatSystem:
         actor.pay_move_costs(actor_move)
         target.pay_move_costs(target_move)
         
-        # Type advantage (rock-paper-scissors)
-        type_advantage = self._calculate_type_advantage(actor_move.move_type, target_move.move_type)
+        # Type advantage (rock-paper-scissors), read straight from the table
+        actor_move_type = actor_move.move_type
+        type_advantage = _TYPE_ADVANTAGE[actor_move_type.id][target_move.move_type.id]
         
         # Calculate base rolls (domain + d6)
-        actor_roll = self._calculate_move_roll(actor, actor_move)
-        target_roll = self._calculate_move_roll(target, target_move)
+        calculate_move_roll = self._calculate_move_roll
+        actor_roll = calculate_move_roll(actor, actor_move, actor_d6)
+        target_roll = calculate_move_roll(target, target_move, target_d6)
         
         # Apply type advantage
         if type_advantage > 0:  # Actor has advantage
@@ -233,49 +438,57 @@ class CombatSystem:
             target_roll += 2
         
         # Apply momentum
-        actor_roll += self.momentum[actor.name]
-        target_roll += self.momentum[target.name]
+        actor_momentum = actor.momentum
+        target_momentum = target.momentum
+        actor_roll += actor_momentum
+        target_roll += target_momentum
         
         # Apply desperate/calculated modifiers
         if actor_move.is_desperate:
-            actor_roll += random.randint(-3, 5)  # High variance
+            actor_roll += random.choice(_DESPERATE_SWINGS)  # High variance
         if actor_move.is_calculated:
-            actor_roll = max(actor_roll, actor_roll - 1 + random.randint(0, 2))  # More consistent
+            actor_roll = max(actor_roll, actor_roll - 1 + random.choice(_CALCULATED_SWINGS))  # More consistent
             
         # Apply target modifiers
         if target_move.is_desperate:
-            target_roll += random.randint(-3, 5)
+            target_roll += random.choice(_DESPERATE_SWINGS)
         if target_move.is_calculated:
-            target_roll = max(target_roll, target_roll - 1 + random.randint(0, 2))
+            target_roll = max(target_roll, target_roll - 1 + random.choice(_CALCULATED_SWINGS))
         
         # Determine winner
         actor_success = actor_roll > target_roll
         
         # Update momentum - winner gains, loser loses
         if actor_success:
-            self.momentum[actor.name] = min(3, self.momentum[actor.name] + 1)
-            self.momentum[target.name] = max(0, self.momentum[target.name] - 1)
+            actor_momentum = actor_momentum + 1 if actor_momentum < 3 else 3
+            target_momentum = target_momentum - 1 if target_momentum > 0 else 0
         else:
-            self.momentum[target.name] = min(3, self.momentum[target.name] + 1)
-            self.momentum[actor.name] = max(0, self.momentum[actor.name] - 1)
+            target_momentum = target_momentum + 1 if target_momentum < 3 else 3
+            actor_momentum = actor_momentum - 1 if actor_momentum > 0 else 0
+        actor.momentum = actor_momentum
+        target.momentum = target_momentum
         
         # Calculate effect magnitude based on difference in rolls
-        effect_magnitude = abs(actor_roll - target_roll)
+        effect_magnitude = actor_roll - target_roll if actor_success else target_roll - actor_roll
         
-        # Process damage or effects
+        # Process damage or effects; the result is filled in place as effects
+        # resolve rather than merged from intermediate dicts
+        narrative = self.narrative_enabled
+        narrative_hooks = [] if narrative else _NO_NARRATIVE_HOOKS
         result = {
             "actor": actor.name,
             "target": target.name,
             "actor_move": actor_move.name,
             "target_move": target_move.name,
+            "actor_domains": actor_move._domain_values,
             "actor_roll": actor_roll,
             "target_roll": target_roll,
             "actor_success": actor_success,
             "effect_magnitude": effect_magnitude,
             "type_advantage": type_advantage,
-            "actor_momentum": self.momentum[actor.name],
-            "target_momentum": self.momentum[target.name],
-            "narrative_hooks": []
+            "actor_momentum": actor_momentum,
+            "target_momentum": target_momentum,
+            "narrative_hooks": narrative_hooks
         }
         
         # Apply effects based on move type and success
@@ -287,43 +500,51 @@ class CombatSystem:
             for domain in actor_move.domains:
                 if domain in target.weak_domains:
                     damage += 5
-                    result["narrative_hooks"].append(f"Exploits {domain.value} weakness")
+                    if narrative:
+                        narrative_hooks.append(f"Exploits {domain.value} weakness")
             
             if actor_move.is_desperate:
                 damage *= 1.5  # Desperate moves hit harder
                 
             # Apply damage
-            if actor_move.move_type in [MoveType.FORCE, MoveType.TRICK]:
-                damage_result = target.apply_damage(int(damage), actor_move.domains)
-                result.update(damage_result)
+            if actor_move_type in _DAMAGING_MOVE_TYPES:
+                damage = int(damage)
+                wounded = target._take_damage(damage)
+                result["damage_dealt"] = damage
+                result["current_health"] = target.current_health
+                result["wounded"] = wounded
             
             # Apply status effects based on move type
-            if actor_move.move_type == MoveType.FOCUS:
+            if actor_move_type is MoveType.FOCUS:
                 # Focus moves might apply mental statuses
                 if Domain.MIND in actor_move.domains:
-                    status_result = target.apply_status(Status.CONFUSED)
-                    result.update(status_result)
-                    result["narrative_hooks"].append("Creates mental confusion")
+                    target.status_mask |= _CONFUSED_BIT
+                    result["status_applied"] = Status.CONFUSED.value
+                    result["duration"] = 3
+                    if narrative:
+                        narrative_hooks.append("Creates mental confusion")
                 
-            if MoveType.DEBUFF:
+            if actor_move_type is MoveType.DEBUFF:
                 # Generic debuff effect
-                status_to_apply = random.choice([Status.STUNNED, Status.FRIGHTENED])
-                status_result = target.apply_status(status_to_apply)
-                result.update(status_result)
+                status_to_apply = _DEBUFF_STATUSES[random.getrandbits(1)]
+                target.status_mask |= status_to_apply.bit
+                result["status_applied"] = status_to_apply.value
+                result["duration"] = 3
             
-        else:
+        elif narrative:
             # Target successfully defends/counters
-            if target_move.move_type == MoveType.FOCUS:
-                result["narrative_hooks"].append("Perfectly reads the situation")
+            if target_move.move_type is MoveType.FOCUS:
+                narrative_hooks.append("Perfectly reads the situation")
             
             if type_advantage < 0:
-                result["narrative_hooks"].append("Counter-move was perfectly chosen")
+                narrative_hooks.append("Counter-move was perfectly chosen")
             
         # Add narrative hooks
-        if actor_move.narrative_hook:
-            result["narrative_hooks"].append(actor_move.narrative_hook)
-        if target_move.narrative_hook:
-            result["narrative_hooks"].append(target_move.narrative_hook)
+        if narrative:
+            if actor_move.narrative_hook:
+                narrative_hooks.append(actor_move.narrative_hook)
+            if target_move.narrative_hook:
+                narrative_hooks.append(target_move.narrative_hook)
         
         # Log combat event for memory
         self.combat_log.append(result)
@@ -335,57 +556,38 @@ class CombatSystem:
         """Calculate type advantage using the rock-paper-scissors system
         Returns: 1 if actor has advantage, -1 if target has advantage, 0 if neutral
         """
-        # Basic RPS: Force > Trick > Focus > Force
-        if actor_type == MoveType.FORCE and target_type == MoveType.TRICK:
-            return 1
-        elif actor_type == MoveType.TRICK and target_type == MoveType.FOCUS:
-            return 1
-        elif actor_type == MoveType.FOCUS and target_type == MoveType.FORCE:
-            return 1
-        elif target_type == MoveType.FORCE and actor_type == MoveType.TRICK:
-            return -1
-        elif target_type == MoveType.TRICK and actor_type == MoveType.FOCUS:
-            return -1
-        elif target_type == MoveType.FOCUS and actor_type == MoveType.FORCE:
-            return -1
-        else:
-            return 0
+        return _TYPE_ADVANTAGE[actor_type.id][target_type.id]
     
-    def _calculate_move_roll(self, combatant: Combatant, move: CombatMove) -> int:
+    def _calculate_move_roll(self, combatant: Combatant, move: CombatMove, d6: Optional[int] = None) -> int:
         """Calculate the effectiveness roll for a move"""
         # Base roll is d6
-        roll = random.randint(1, 6)
+        roll = self._d6() if d6 is None else d6
         
         # Add highest relevant domain rating
-        best_domain_rating = 0
-        for domain in move.domains:
-            domain_rating = combatant.get_domain_rating(domain)
-            best_domain_rating = max(best_domain_rating, domain_rating)
+        roll += combatant.best_domain_rating(move)
         
-        roll += best_domain_rating
+        # Apply environmental modifiers, summed once per move per environment
+        domains_key = move._domains_key
+        env_modifier = self._env_mod_by_move.get(domains_key)
+        if env_modifier is None:
+            env_mod = self._env_mod
+            env_modifier = self._env_mod_by_move[domains_key] = sum(
+                env_mod.get(domain, 0) for domain in domains_key)
         
-        # Apply environmental modifiers
-        for domain in move.domains:
-            if domain == Domain.AWARENESS and "Shadowy" in self.environment_tags:
-                roll += 1
-            if domain == Domain.BODY and "Confined" in self.environment_tags:
-                roll -= 1
-            # Add more environmental interactions
-        
-        return roll
+        return roll + env_modifier
     
     def create_consequence(self, result: dict, target: Combatant) -> Optional[Consequence]:
         """Create a lasting consequence based on combat result"""
         if not result["actor_success"] or result["effect_magnitude"] < 3:
             return None  # No significant consequence
             
-        # Determine affected domains based on the move
-        actor_move = next((m for m in self.combat_log if m["actor_move"] == result["actor_move"]), None)
-        if not actor_move:
+        # Determine affected domains based on the move (recorded on the result itself)
+        actor_domains = result.get("actor_domains")
+        if not actor_domains:
             return None
             
         affected_domains = []
-        for domain_str in actor_move["domains"]:
+        for domain_str in actor_domains:
             try:
                 affected_domains.append(Domain[domain_str.upper()])
             except KeyError:
@@ -417,10 +619,97 @@ class CombatSystem:
             )
 
 
+class MoveLibrary(dict):
+    """Move key -> CombatMove dict that keeps a by-type index for intent matching"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._type_index = None
+    
+    def type_index(self) -> Dict[MoveType, List[Tuple[frozenset, CombatMove]]]:
+        """Moves grouped by type with their domain sets, in library order"""
+        if self._type_index is None:
+            self._type_index = _build_type_index(self)
+        return self._type_index
+    
+    # Every mutation drops the index so it is rebuilt on next use
+    def __setitem__(self, key, move):
+        super().__setitem__(key, move)
+        self._type_index = None
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._type_index = None
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._type_index = None
+    
+    def __ior__(self, other):
+        # dict's |= doesn't go through update()
+        super().update(other)
+        self._type_index = None
+        return self
+    
+    def setdefault(self, key, default=None):
+        self._type_index = None
+        return super().setdefault(key, default)
+    
+    def pop(self, *args):
+        self._type_index = None
+        return super().pop(*args)
+    
+    def popitem(self):
+        self._type_index = None
+        return super().popitem()
+    
+    def clear(self):
+        super().clear()
+        self._type_index = None
+
+
+def _build_type_index(move_library: Dict[str, CombatMove]) -> Dict[MoveType, List[Tuple[frozenset, CombatMove]]]:
+    """Group a library's moves by type, pairing each with its domain set"""
+    index = {}
+    for move in move_library.values():
+        index.setdefault(move.move_type, []).append((frozenset(move.domains), move))
+    return index
+
+
+class TranspositionTable:
+    """Bounded LRU map from search positions to evaluations
+    
+    Keys are typically (CombatSystem.state_key(...), depth, actor_move, target_move),
+    so an AI search revisiting an identical position reuses its earlier evaluation.
+    """
+    
+    def __init__(self, max_entries: int = 1 << 20):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+    
+    def get(self, key, default=None):
+        """Look up a stored evaluation, marking it most recently used"""
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            return default
+        return self._entries[key]
+    
+    def store(self, key, value) -> None:
+        """Store an evaluation, evicting the least recently used one when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 # Example Move Library
-def create_move_library() -> Dict[str, CombatMove]:
+def create_move_library() -> MoveLibrary:
     """Create a library of example moves"""
-    moves = {}
+    moves = MoveLibrary()
     
     # Force moves
     moves["hammer_blow"] = CombatMove(
@@ -498,6 +787,35 @@ def create_move_library() -> Dict[str, CombatMove]:
     return moves
 
 
+# Intent keywords per move type (in priority order) and per domain
+_INTENT_MOVE_TYPE_KEYWORDS = (
+    (MoveType.FORCE, ("attack", "strike", "hit", "smash", "bash")),
+    (MoveType.TRICK, ("trick", "feint", "deceive", "distract")),
+    (MoveType.FOCUS, ("analyze", "watch", "predict", "focus")),
+)
+_INTENT_DOMAIN_KEYWORDS = (
+    (Domain.BODY, ("strength", "muscle", "physical", "body")),
+    (Domain.MIND, ("smart", "mind", "think", "intellect")),
+    (Domain.CRAFT, ("craft", "make", "build", "create")),
+    (Domain.AWARENESS, ("see", "hear", "sense", "aware")),
+    (Domain.SOCIAL, ("talk", "charm", "persuade", "social")),
+    (Domain.AUTHORITY, ("command", "intimidate", "authority")),
+    (Domain.SPIRIT, ("faith", "spirit", "divine", "mystical")),
+)
+
+def _build_intent_pattern() -> Tuple[re.Pattern, Dict[str, Enum]]:
+    """One regex with a named group per tag, plus the group name -> tag map"""
+    groups = []
+    tags = {}
+    for i, (tag, words) in enumerate(_INTENT_MOVE_TYPE_KEYWORDS + _INTENT_DOMAIN_KEYWORDS):
+        group = f"tag{i}"
+        groups.append(f"(?P<{group}>{'|'.join(map(re.escape, words))})")
+        tags[group] = tag
+    # Zero-width lookahead so matches may overlap, keeping plain substring semantics
+    return re.compile(f"(?=(?:{'|'.join(groups)}))"), tags
+
+_INTENT_PATTERN, _INTENT_GROUP_TAGS = _build_intent_pattern()
+
 # Helper function for intent parsing
 def parse_player_intent(intent_text: str, move_library: Dict[str, CombatMove]) -> CombatMove:
     """
@@ -508,39 +826,27 @@ def parse_player_intent(intent_text: str, move_library: Dict[str, CombatMove]) -
     # For demonstration, we'll do simple keyword matching
     intent_lower = intent_text.lower()
     
+    # Single scan for every keyword
+    found = {_INTENT_GROUP_TAGS[match.lastgroup] for match in _INTENT_PATTERN.finditer(intent_lower)}
+    
     # Check for move types
-    move_type = None
-    if any(word in intent_lower for word in ["attack", "strike", "hit", "smash", "bash"]):
-        move_type = MoveType.FORCE
-    elif any(word in intent_lower for word in ["trick", "feint", "deceive", "distract"]):
-        move_type = MoveType.TRICK
-    elif any(word in intent_lower for word in ["analyze", "watch", "predict", "focus"]):
-        move_type = MoveType.FOCUS
+    move_type = next((tag for tag, _ in _INTENT_MOVE_TYPE_KEYWORDS if tag in found), None)
     
     # Check for domains
-    domains = []
-    if any(word in intent_lower for word in ["strength", "muscle", "physical", "body"]):
-        domains.append(Domain.BODY)
-    if any(word in intent_lower for word in ["smart", "mind", "think", "intellect"]):
-        domains.append(Domain.MIND)
-    if any(word in intent_lower for word in ["craft", "make", "build", "create"]):
-        domains.append(Domain.CRAFT)
-    if any(word in intent_lower for word in ["see", "hear", "sense", "aware"]):
-        domains.append(Domain.AWARENESS)
-    if any(word in intent_lower for word in ["talk", "charm", "persuade", "social"]):
-        domains.append(Domain.SOCIAL)
-    if any(word in intent_lower for word in ["command", "intimidate", "authority"]):
-        domains.append(Domain.AUTHORITY)
-    if any(word in intent_lower for word in ["faith", "spirit", "divine", "mystical"]):
-        domains.append(Domain.SPIRIT)
+    domains = [tag for tag, _ in _INTENT_DOMAIN_KEYWORDS if tag in found]
     
     # If no domains detected, default to BODY
     if not domains:
         domains = [Domain.BODY]
     
     # Find matching move from library or create custom one
-    for move in move_library.values():
-        if move.move_type == move_type and all(d in move.domains for d in domains):
+    if isinstance(move_library, MoveLibrary):
+        type_index = move_library.type_index()
+    else:
+        type_index = _build_type_index(move_library)
+    required_domains = frozenset(domains)
+    for move_domains, move in type_index.get(move_type, ()):
+        if required_domains <= move_domains:
             return move
     
     # Create a custom move if no match found
@@ -604,6 +910,7 @@ if __name__ == "__main__":
     bandit_move = move_library["analytical_defense"]
     
     # Resolve combat
+    combat_system.start_combat([player, bandit])
     result = combat_system.resolve_opposed_moves(player, player_move, bandit, bandit_move)
     
     # Generate narrative (would be handled by LLM in real system)
@@ -1,6 +1,30 @@
 from typing import List, Dict, Optional, Tuple
 from combat_system_core_v1_01 import MoveType, Domain, CombatMove, Combatant
 
+# Narrative hook added for each bonus effect a combo carries, in display order
+_BONUS_EFFECT_HOOKS = (
+    ("damage_bonus", "The combo deals extra damage!"),
+    ("critical_chance", "The combo targets a critical weakness!"),
+    ("ignore_defense", "The combo bypasses defenses!")
+)
+
+# Bits per move in a rolling history key
+_MOVE_KEY_BITS = 8
+_MOVE_KEY_SLOT = (1 << _MOVE_KEY_BITS) - 1
+
+# Reverse lookup for decoding history keys
+_MOVETYPE_BY_ID = {move_type.id: move_type for move_type in MoveType}
+
+def _sequence_key(move_type_ids) -> int:
+    """Pack move type ids into an int, oldest move in the highest byte
+    
+    Ids are stored offset by one so an empty slot (zero) never matches a move.
+    """
+    key = 0
+    for move_type_id in move_type_ids:
+        key = (key << _MOVE_KEY_BITS) | (move_type_id + 1)
+    return key
+
 class ComboMove:
     def __init__(self, 
                  name: str,
@@ -10,16 +34,41 @@ class ComboMove:
                  bonus_effect: Dict = None):
         self.name = name
         self.description = description
-        self.required_sequence = required_sequence  # Sequence of move types required
+        self.required_sequence = tuple(required_sequence)  # Sequence of move types required
+        # Same sequence as MoveType ids, the form stored in move histories
+        self.sequence_ids = tuple(move_type.id for move_type in required_sequence)
         self.domains = domains
         self.bonus_effect = bonus_effect or {}
+        # Hooks are fixed per combo, so build them once instead of on every hit
+        self.narrative_hooks = (
+            f"Executes the {name} combo!",
+            description,
+            *(hook for effect, hook in _BONUS_EFFECT_HOOKS if effect in self.bonus_effect)
+        )
         
 class ComboSystem:
+    # Recent moves remembered per combatant
+    MOVE_HISTORY_LENGTH = 5
+    
     def __init__(self):
-        # Track recent moves for each combatant
-        self.combatant_move_history = {}
+        # Recent moves of each combatant as a rolling key, see _sequence_key
+        self._history_keys: Dict[str, int] = {}
+        self._history_key_mask = (1 << (_MOVE_KEY_BITS * self.MOVE_HISTORY_LENGTH)) - 1
         # Available combos
         self.available_combos = self._initialize_combos()
+        self._index_combos()
+        
+    def _index_combos(self) -> None:
+        """Index combos by their packed move-type sequence for int key lookups"""
+        # Sequence key -> (position in available_combos, combo); the earliest combo wins ties.
+        # Every packed move is non-zero, so keys of different lengths never collide
+        self._combo_by_key: Dict[int, Tuple[int, ComboMove]] = {}
+        lengths = set()
+        for index, combo in enumerate(self.available_combos):
+            self._combo_by_key.setdefault(_sequence_key(combo.sequence_ids), (index, combo))
+            lengths.add(len(combo.sequence_ids))
+        # One mask per distinct sequence length, so matching costs one probe per length
+        self._combo_key_masks = tuple((1 << (_MOVE_KEY_BITS * length)) - 1 for length in sorted(lengths))
         
     def _initialize_combos(self) -> List[ComboMove]:
         """Initialize available combo moves"""
@@ -48,72 +97,63 @@ class ComboSystem:
     
     def record_move(self, combatant: Combatant, move_type: MoveType) -> None:
         """Record a move for a combatant to track potential combos"""
-        if combatant.name not in self.combatant_move_history:
-            self.combatant_move_history[combatant.name] = []
-            
-        # Add the move to history
-        self.combatant_move_history[combatant.name].append(move_type)
-        
-        # Limit history length to prevent memory bloat
-        if len(self.combatant_move_history[combatant.name]) > 5:
-            self.combatant_move_history[combatant.name].pop(0)
+        # Shift the move into the rolling key; the mask drops moves older than the history
+        key = self._history_keys.get(combatant.name, 0)
+        self._history_keys[combatant.name] = ((key << _MOVE_KEY_BITS) | (move_type.id + 1)) & self._history_key_mask
+    
+    def get_move_history(self, combatant: Combatant) -> List[MoveType]:
+        """Recent moves of a combatant, oldest first, decoded from the rolling key"""
+        key = self._history_keys.get(combatant.name, 0)
+        history = []
+        while key:
+            history.append(_MOVETYPE_BY_ID[(key & _MOVE_KEY_SLOT) - 1])
+            key >>= _MOVE_KEY_BITS
+        history.reverse()
+        return history
     
-    def check_for_combo(self, combatant: Combatant) -> Optional[Tuple[ComboMove, List[str]]]:
+    def check_for_combo(self, combatant: Combatant) -> Optional[Tuple[ComboMove, Tuple[str, ...]]]:
         """Check if the combatant's recent moves form a combo
         
         Returns:
             Tuple of (combo_move, narrative_hooks) if a combo is found, None otherwise
         """
-        if combatant.name not in self.combatant_move_history:
+        history_key = self._history_keys.get(combatant.name)
+        if history_key is None:
             return None
             
-        move_history = self.combatant_move_history[combatant.name]
+        # Look up the most recent moves once per distinct combo length; a history
+        # shorter than the combo leaves zero bytes in the key, which never match
+        match = None
+        for mask in self._combo_key_masks:
+            candidate = self._combo_by_key.get(history_key & mask)
+            if candidate is not None and (match is None or candidate[0] < match[0]):
+                match = candidate
         
-        # Check each combo
-        for combo in self.available_combos:
-            combo_length = len(combo.required_sequence)
-            
-            # Make sure we have enough history
-            if len(move_history) >= combo_length:
-                # Check if the most recent moves match the combo
-                recent_moves = move_history[-combo_length:]
-                
-                if recent_moves == combo.required_sequence:
-                    # Combo found!
-                    narrative_hooks = [
-                        f"Executes the {combo.name} combo!",
-                        combo.description
-                    ]
-                    
-                    # Add special effect narratives
-                    if "damage_bonus" in combo.bonus_effect:
-                        narrative_hooks.append(f"The combo deals extra damage!")
-                    if "critical_chance" in combo.bonus_effect:
-                        narrative_hooks.append(f"The combo targets a critical weakness!")
-                    if "ignore_defense" in combo.bonus_effect:
-                        narrative_hooks.append(f"The combo bypasses defenses!")
-                        
-                    return combo, narrative_hooks
-                    
         # No combo found
-        return None
+        if match is None:
+            return None
+            
+        # Combo found!
+        combo = match[1]
+        return combo, combo.narrative_hooks
         
     def apply_combo_effects(self, combo: ComboMove, result: dict) -> dict:
-        """Apply the effects of a combo to a combat result"""
-        # Make a copy of the result to modify
-        modified_result = result.copy()
+        """Apply the effects of a combo to a combat result in place
+        
+        The result is updated directly rather than copied; callers that need the
+        original should copy it first. Returns the same dict for convenience.
+        """
+        bonus_effect = combo.bonus_effect
         
         # Apply combo effects
-        if "damage_bonus" in combo.bonus_effect:
-            if "damage_dealt" in modified_result:
-                modified_result["damage_dealt"] += combo.bonus_effect["damage_bonus"]
+        if "damage_bonus" in bonus_effect and "damage_dealt" in result:
+            result["damage_dealt"] += bonus_effect["damage_bonus"]
                 
-        if "momentum_bonus" in combo.bonus_effect:
-            if "actor_momentum" in modified_result:
-                modified_result["actor_momentum"] += combo.bonus_effect["momentum_bonus"]
+        if "momentum_bonus" in bonus_effect and "actor_momentum" in result:
+            result["actor_momentum"] += bonus_effect["momentum_bonus"]
                 
         # Add the combo to the result
-        if "combo_used" not in modified_result:
-            modified_result["combo_used"] = combo.name
+        if "combo_used" not in result:
+            result["combo_used"] = combo.name
             
-        return modified_result
+        return result
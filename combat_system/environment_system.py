@@ -1,4 +1,4 @@
-from typing import Set, Dict, List, Tuple
+from typing import Callable, Iterable, Set, Dict, List, Optional, Tuple
 from enum import Enum
 from combat_system_core_v1_01 import Domain, MoveType, CombatMove, Combatant
 
@@ -16,13 +16,50 @@ class EnvironmentElement(Enum):
     UNSTABLE = "Unstable Ground"
 
 class EnvironmentInteraction:
+    __slots__ = ("name", "description", "requirements", "effects")
+    
     def __init__(self, name: str, description: str, requirements: Dict = None, effects: Dict = None):
         self.name = name
         self.description = description
         self.requirements = requirements or {}  # Domain requirements, etc.
         self.effects = effects or {}  # Effects on combat
         
+# Interactions unlocked by each environment tag, built once at import. Interaction
+# keys are unique across tags, so tags can be added and removed independently
+_TAG_INTERACTIONS: Dict[str, Dict[str, EnvironmentInteraction]] = {
+    # Water interactions
+    "Water": {
+        "splash_water": EnvironmentInteraction(
+            name="Splash Water",
+            description="Splash water to distract or obscure vision",
+            requirements={"domain": Domain.AWARENESS},
+            effects={"target_penalty": -1, "narrative": "Water obscures vision"}
+        )
+    },
+    # Fire interactions
+    "Fire": {
+        "use_flames": EnvironmentInteraction(
+            name="Use Flames",
+            description="Use nearby flames as a weapon or distraction",
+            requirements={"domain": Domain.CRAFT},
+            effects={"damage_bonus": 3, "narrative": "Flames burn the target"}
+        )
+    },
+    # High Ground interactions
+    "High Ground": {
+        "tactical_advantage": EnvironmentInteraction(
+            name="Tactical Advantage",
+            description="Use high ground for combat advantage",
+            requirements={"domain": Domain.AWARENESS},
+            effects={"roll_bonus": 2, "narrative": "The high ground provides advantage"}
+        )
+    },
+    # Add more environment-specific interactions here
+}
+
 class EnvironmentSystem:
+    __slots__ = ("environment_tags", "available_interactions")
+    
     def __init__(self):
         self.environment_tags: Set[str] = set()
         self.available_interactions: Dict[str, EnvironmentInteraction] = {}
@@ -30,49 +67,19 @@ class EnvironmentSystem:
     def add_environment_tag(self, tag: str) -> None:
         """Add an environment tag to the current scene"""
         self.environment_tags.add(tag)
-        # Update available interactions based on new tag
-        self._update_available_interactions()
+        # Unlock the new tag's interactions
+        interactions = _TAG_INTERACTIONS.get(tag)
+        if interactions:
+            self.available_interactions.update(interactions)
         
     def remove_environment_tag(self, tag: str) -> None:
         """Remove an environment tag from the current scene"""
         if tag in self.environment_tags:
             self.environment_tags.remove(tag)
-            # Update available interactions after removal
-            self._update_available_interactions()
+            # Drop only the removed tag's interactions
+            for key in _TAG_INTERACTIONS.get(tag, ()):
+                self.available_interactions.pop(key, None)
     
-    def _update_available_interactions(self) -> None:
-        """Update available interactions based on current environment tags"""
-        self.available_interactions = {}
-        
-        # Water interactions
-        if "Water" in self.environment_tags:
-            self.available_interactions["splash_water"] = EnvironmentInteraction(
-                name="Splash Water",
-                description="Splash water to distract or obscure vision",
-                requirements={"domain": Domain.AWARENESS},
-                effects={"target_penalty": -1, "narrative": "Water obscures vision"}
-            )
-        
-        # Fire interactions
-        if "Fire" in self.environment_tags:
-            self.available_interactions["use_flames"] = EnvironmentInteraction(
-                name="Use Flames",
-                description="Use nearby flames as a weapon or distraction",
-                requirements={"domain": Domain.CRAFT},
-                effects={"damage_bonus": 3, "narrative": "Flames burn the target"}
-            )
-        
-        # High Ground interactions
-        if "High Ground" in self.environment_tags:
-            self.available_interactions["tactical_advantage"] = EnvironmentInteraction(
-                name="Tactical Advantage",
-                description="Use high ground for combat advantage",
-                requirements={"domain": Domain.AWARENESS},
-                effects={"roll_bonus": 2, "narrative": "The high ground provides advantage"}
-            )
-            
-        # Add more environment-specific interactions here
-        
     def get_available_interactions(self) -> List[EnvironmentInteraction]:
         """Get list of available environmental interactions"""
         return list(self.available_interactions.values())
@@ -83,41 +90,85 @@ class EnvironmentSystem:
         Returns:
             Tuple containing (roll_modifier, narrative_hooks)
         """
+        # Most scenes have no tag any rule cares about
+        active_tags = _RULE_TAGS.intersection(self.environment_tags)
+        if not active_tags:
+            return 0, []
+        
         roll_modifier = 0
         narrative_hooks = []
         
         # Apply modifiers based on environment tags and domains
         for domain in move.domains:
-            # Awareness in darkness
-            if domain == Domain.AWARENESS and "Darkness" in self.environment_tags:
-                if "Darkness" in actor.strong_domains:
-                    roll_modifier += 2
-                    narrative_hooks.append("Expertly navigates the darkness")
-                else:
-                    roll_modifier -= 1
-                    narrative_hooks.append("Struggles to perceive in darkness")
-            
-            # Body in confined spaces
-            if domain == Domain.BODY and "Confined Space" in self.environment_tags:
-                roll_modifier -= 1
-                narrative_hooks.append("Limited movement in the confined space")
-            
-            # Mind in magical aura
-            if domain == Domain.MIND and "Magical Aura" in self.environment_tags:
-                if Domain.SPIRIT in move.domains:
-                    roll_modifier += 2
-                    narrative_hooks.append("Channels the ambient magical energy")
-                
-            # Authority in open field
-            if domain == Domain.AUTHORITY and "Open Field" in self.environment_tags:
-                roll_modifier += 1
-                narrative_hooks.append("Voice carries powerfully across the field")
-                
-            # Craft in ruins
-            if domain == Domain.CRAFT and "Ruins" in self.environment_tags:
-                roll_modifier += 1
-                narrative_hooks.append("Uses scattered debris as improvised tools")
-                
-            # Add more environment-domain interactions
+            for tag, rule in _DOMAIN_ENVIRONMENT_RULES.get(domain, ()):
+                if tag not in active_tags:
+                    continue
+                outcome = rule(actor, move)
+                if outcome is not None:
+                    roll_modifier += outcome[0]
+                    narrative_hooks.append(outcome[1])
                 
         return roll_modifier, narrative_hooks
+    
+    def apply_environment_modifiers_batch(self, 
+                                          moves_and_actors: Iterable[Tuple[CombatMove, Combatant]]
+                                          ) -> List[Tuple[int, List[str]]]:
+        """Calculate environment-based modifiers for many moves resolved in this scene
+        
+        Rules are filtered against the scene's tags once for the whole batch, so
+        each move only evaluates rules that can apply.
+        
+        Returns:
+            One (roll_modifier, narrative_hooks) tuple per (move, actor) pair, in order
+        """
+        active_tags = _RULE_TAGS.intersection(self.environment_tags)
+        if not active_tags:
+            return [(0, []) for _ in moves_and_actors]
+        
+        # Domain -> rules whose tag is present in this scene
+        active_rules = {}
+        for domain, rules in _DOMAIN_ENVIRONMENT_RULES.items():
+            applicable = tuple(rule for tag, rule in rules if tag in active_tags)
+            if applicable:
+                active_rules[domain] = applicable
+        
+        results = []
+        for move, actor in moves_and_actors:
+            roll_modifier = 0
+            narrative_hooks = []
+            for domain in move.domains:
+                for rule in active_rules.get(domain, ()):
+                    outcome = rule(actor, move)
+                    if outcome is not None:
+                        roll_modifier += outcome[0]
+                        narrative_hooks.append(outcome[1])
+            results.append((roll_modifier, narrative_hooks))
+        return results
+
+def _darkness_awareness(actor: Combatant, move: CombatMove) -> Optional[Tuple[int, str]]:
+    """Awareness in darkness"""
+    if "Darkness" in actor.strong_domains:
+        return 2, "Expertly navigates the darkness"
+    return -1, "Struggles to perceive in darkness"
+
+def _magical_aura_mind(actor: Combatant, move: CombatMove) -> Optional[Tuple[int, str]]:
+    """Mind in magical aura, only when the move also draws on spirit"""
+    if Domain.SPIRIT in move.domains:
+        return 2, "Channels the ambient magical energy"
+    return None
+
+# Domain -> ((environment tag, rule), ...); a rule returns (roll_delta, narrative) or None
+_DOMAIN_ENVIRONMENT_RULES: Dict[Domain, Tuple[Tuple[str, Callable[[Combatant, CombatMove], Optional[Tuple[int, str]]]], ...]] = {
+    Domain.AWARENESS: (("Darkness", _darkness_awareness),),
+    # Body in confined spaces
+    Domain.BODY: (("Confined Space", lambda actor, move: (-1, "Limited movement in the confined space")),),
+    Domain.MIND: (("Magical Aura", _magical_aura_mind),),
+    # Authority in open field
+    Domain.AUTHORITY: (("Open Field", lambda actor, move: (1, "Voice carries powerfully across the field")),),
+    # Craft in ruins
+    Domain.CRAFT: (("Ruins", lambda actor, move: (1, "Uses scattered debris as improvised tools")),),
+    # Add more environment-domain interactions
+}
+
+# Every tag some domain rule depends on
+_RULE_TAGS = frozenset(tag for rules in _DOMAIN_ENVIRONMENT_RULES.values() for tag, _ in rules)
@@ -1,42 +1,104 @@
 from typing import List, Dict, Any
 import json
+import random
+from functools import cached_property, lru_cache
+
+# Bound once for the template paths, which pick several random elements per narrative
+_choice = random.choice
+
+class _TemplateValues(dict):
+    """Placeholder values for str.format_map; placeholders with no value render empty"""
+    def __missing__(self, key: str) -> str:
+        return ""
+
+# Descriptive phrases per move type, shared by every generator instance
+_MOVE_TYPE_DESCRIPTIONS = {
+    "FORCE": ("powerful", "forceful", "mighty", "overwhelming"),
+    "TRICK": ("deceptive", "cunning", "tricky", "clever"),
+    "FOCUS": ("precise", "calculated", "focused", "analytical"),
+    "BUFF": ("supportive", "enhancing", "empowering", "strengthening"),
+    "DEBUFF": ("weakening", "hindering", "disabling", "hampering"),
+    "UTILITY": ("versatile", "resourceful", "adaptive", "practical")
+}
+_DEFAULT_MOVE_TYPE_DESCRIPTIONS = ("skillful",)
+
+# Effects an environment interaction can have on the actor's position
+_ENV_INTERACTION_EFFECTS = (
+    "gains an advantage",
+    "creates an opening",
+    "improves their position",
+    "finds a tactical opportunity"
+)
+
+@lru_cache(maxsize=256)
+def _render_environment_interactions(templates: tuple, actor: str, environment: str) -> tuple:
+    """Every template/effect combination filled in for one actor and environment"""
+    return tuple(
+        template.format_map(_TemplateValues(actor=actor, environment=environment, interaction_effect=effect))
+        for template in templates
+        for effect in _ENV_INTERACTION_EFFECTS
+    )
+
+# Narrative templates for different combat situations, shared by every generator
+_NARRATIVE_TEMPLATES = {
+    "move_success": (
+        "{actor} executes {move} with precision. {target} {reaction}.",
+        "With skillful application of {domain}, {actor}'s {move} lands true. {target} {reaction}.",
+        "{actor} channels their {domain} expertise into a powerful {move}. {target} {reaction}."
+    ),
+    "move_failure": (
+        "{target} anticipates {actor}'s {move} and {counter}.",
+        "{actor}'s {move} fails to connect as {target} {counter}.",
+        "Despite drawing on {domain}, {actor}'s {move} is thwarted when {target} {counter}."
+    ),
+    "status_applied": (
+        "{target} is now {status} from the effects of {move}.",
+        "The {move} leaves {target} {status}.",
+        "{actor}'s {move} results in {target} becoming {status}."
+    ),
+    "critical_success": (
+        "In a display of extraordinary skill, {actor}'s {move} strikes a critical weakness!",
+        "{actor} executes {move} with uncanny precision, finding the perfect opening!",
+        "A moment of perfect execution! {actor}'s {move} lands with devastating effect!"
+    ),
+    "environment_interaction": (
+        "{actor} uses the {environment} to their advantage, {interaction_effect}.",
+        "The {environment} becomes a weapon in {actor}'s hands, {interaction_effect}.",
+        "Drawing on the surroundings, {actor} {interaction_effect} using the {environment}."
+    )
+}
 
 class CombatNarrativeGenerator:
     def __init__(self, openrouter_api_key: str = None):
         self.api_key = openrouter_api_key
-        self.narrative_templates = self._load_narrative_templates()
-        self.descriptive_cache = {}  # Cache for common descriptions
+        
+    @cached_property
+    def narrative_templates(self) -> Dict:
+        """Templates, loaded on first use so LLM-only generators never build them"""
+        return self._load_narrative_templates()
+        
+    # Per-category tuples, bound on first use so each pick is one attribute load
+    @cached_property
+    def _success_templates(self) -> tuple:
+        return tuple(self.narrative_templates["move_success"])
+        
+    @cached_property
+    def _failure_templates(self) -> tuple:
+        return tuple(self.narrative_templates["move_failure"])
+        
+    @cached_property
+    def _critical_templates(self) -> tuple:
+        return tuple(self.narrative_templates["critical_success"])
+        
+    @cached_property
+    def _environment_templates(self) -> tuple:
+        """Hashable copy, used as part of the rendered environment cache key"""
+        return tuple(self.narrative_templates["environment_interaction"])
         
     def _load_narrative_templates(self) -> Dict:
         """Load narrative templates for different combat situations"""
         # In a real implementation, these would be loaded from a file
-        return {
-            "move_success": [
-                "{actor} executes {move} with precision. {target} {reaction}.",
-                "With skillful application of {domain}, {actor}'s {move} lands true. {target} {reaction}.",
-                "{actor} channels their {domain} expertise into a powerful {move}. {target} {reaction}."
-            ],
-            "move_failure": [
-                "{target} anticipates {actor}'s {move} and {counter}.",
-                "{actor}'s {move} fails to connect as {target} {counter}.",
-                "Despite drawing on {domain}, {actor}'s {move} is thwarted when {target} {counter}."
-            ],
-            "status_applied": [
-                "{target} is now {status} from the effects of {move}.",
-                "The {move} leaves {target} {status}.",
-                "{actor}'s {move} results in {target} becoming {status}."
-            ],
-            "critical_success": [
-                "In a display of extraordinary skill, {actor}'s {move} strikes a critical weakness!",
-                "{actor} executes {move} with uncanny precision, finding the perfect opening!",
-                "A moment of perfect execution! {actor}'s {move} lands with devastating effect!"
-            ],
-            "environment_interaction": [
-                "{actor} uses the {environment} to their advantage, {interaction_effect}.",
-                "The {environment} becomes a weapon in {actor}'s hands, {interaction_effect}.",
-                "Drawing on the surroundings, {actor} {interaction_effect} using the {environment}."
-            ]
-        }
+        return dict(_NARRATIVE_TEMPLATES)
     
     async def generate_combat_narrative(self, combat_result: Dict[str, Any],
                                       actor: Dict, target: Dict,
@@ -133,84 +195,45 @@ class CombatNarrativeGenerator:
         if not move_type:
             return "skillful attack"
             
-        descriptions = {
-            "FORCE": ["powerful", "forceful", "mighty", "overwhelming"],
-            "TRICK": ["deceptive", "cunning", "tricky", "clever"],
-            "FOCUS": ["precise", "calculated", "focused", "analytical"],
-            "BUFF": ["supportive", "enhancing", "empowering", "strengthening"],
-            "DEBUFF": ["weakening", "hindering", "disabling", "hampering"],
-            "UTILITY": ["versatile", "resourceful", "adaptive", "practical"]
-        }
-        
         move_type_upper = move_type.upper() if isinstance(move_type, str) else ""
-        options = descriptions.get(move_type_upper, ["skillful"])
-        
-        # Cache common descriptions
-        cache_key = f"{move_type_upper}_desc"
-        if cache_key not in self.descriptive_cache:
-            import random
-            self.descriptive_cache[cache_key] = random.choice(options)
-            
-        return self.descriptive_cache[cache_key]
+        # Draw a fresh phrase each time so repeated moves don't read identically
+        return _choice(_MOVE_TYPE_DESCRIPTIONS.get(move_type_upper, _DEFAULT_MOVE_TYPE_DESCRIPTIONS))
     
     def _generate_from_templates(self, context: Dict) -> Dict[str, str]:
         """Generate narrative using templates"""
-        import random
-        
         narratives = {}
         
         # Select the right template category
         if context["success"]:
             if context["effect_magnitude"] > 5:
-                template_category = "critical_success"
+                templates = self._critical_templates
             else:
-                template_category = "move_success"
+                templates = self._success_templates
         else:
-            template_category = "move_failure"
+            templates = self._failure_templates
             
         # Select and fill a template for the main action
-        templates = self.narrative_templates[template_category]
-        template = random.choice(templates)
-        
-        # Basic replacements
-        filled_template = template.replace("{actor}", context["actor_name"])
-        filled_template = filled_template.replace("{target}", context["target_name"])
-        filled_template = filled_template.replace("{move}", context["move_name"])
+        template = _choice(templates)
         
-        # More complex replacements
-        if "{domain}" in filled_template:
-            if context["actor_domains"]:
-                domain = random.choice(context["actor_domains"])
-                filled_template = filled_template.replace("{domain}", domain)
-            else:
-                filled_template = filled_template.replace("{domain}", "skill")
-                
-        if "{reaction}" in filled_template and "target_reaction" in context:
-            filled_template = filled_template.replace("{reaction}", context["target_reaction"])
-            
-        if "{counter}" in filled_template and "target_counter" in context:
-            filled_template = filled_template.replace("{counter}", context["target_counter"])
+        # Fill every placeholder in a single formatting pass
+        values = _TemplateValues(
+            actor=context["actor_name"],
+            target=context["target_name"],
+            move=context["move_name"],
+            reaction=context.get("target_reaction", ""),
+            counter=context.get("target_counter", "")
+        )
+        if "{domain}" in template:
+            values["domain"] = _choice(context["actor_domains"]) if context["actor_domains"] else "skill"
             
-        narratives["action_description"] = filled_template
+        narratives["action_description"] = template.format_map(values)
         
         # Add environment description if available
         if context["environment"]:
-            env = random.choice(context["environment"])
-            env_template = random.choice(self.narrative_templates["environment_interaction"])
-            
-            # Generate a random interaction effect
-            effects = [
-                "gains an advantage",
-                "creates an opening",
-                "improves their position",
-                "finds a tactical opportunity"
-            ]
-            
-            env_narrative = env_template.replace("{actor}", context["actor_name"])
-            env_narrative = env_narrative.replace("{environment}", env)
-            env_narrative = env_narrative.replace("{interaction_effect}", random.choice(effects))
-            
-            narratives["environment_description"] = env_narrative
+            env = _choice(context["environment"])
+            # One draw over the prerendered template/effect combinations
+            narratives["environment_description"] = _choice(_render_environment_interactions(
+                self._environment_templates, context["actor_name"], env))
         else:
             narratives["environment_description"] = ""
             
@@ -233,4 +256,14 @@ class CombatNarrativeGenerator:
             if "memory" in context and context["memory"].get("previous_encounters", 0) > 1:
                 emotion += f" There's history between these combatants that fuels the intensity."
         else:
-            emotion = f"{context['actor_name']} feels frustrated by the failed attempt
+            emotion = f"{context['actor_name']} feels frustrated by the failed attempt."
+            
+        narratives["emotion_description"] = emotion
+        
+        return narratives
+    
+    async def _generate_from_llm(self, context: Dict) -> Dict[str, str]:
+        """Generate narrative using an LLM via OpenRouter"""
+        # The OpenRouter integration isn't implemented yet; use the templates meanwhile
+        return self._generate_from_templates(context)
+
@@ -1,7 +1,8 @@
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, Optional, Tuple
 from enum import Enum, auto
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import random
+from bisect import bisect_right
 from combat_system_core_v1_01 import Domain, Status, Consequence, Combatant
 
 class StatusTier(Enum):
@@ -18,7 +19,11 @@ class StatusSource(Enum):
     MAGICAL = auto()
     SOCIAL = auto()
 
-@dataclass
+def _domain_modifiers(modifiers: Dict[Domain, int]) -> Tuple[int, ...]:
+    """Pack per-domain modifiers into a tuple indexed by Domain.id (0 for unlisted domains)"""
+    return tuple(modifiers.get(domain, 0) for domain in Domain)
+
+@dataclass(slots=True)
 class EnhancedStatus:
     name: str
     base_status: Status
@@ -28,13 +33,13 @@ class EnhancedStatus:
     description: str
     affected_domains: List[Domain]
     stat_modifiers: Dict[str, int]
-    domain_modifiers: Dict[Domain, int]
+    domain_modifiers: Tuple[int, ...]  # Indexed by Domain.id, see _domain_modifiers
     special_effects: List[str]
     
     def apply_to_combatant(self, combatant: Combatant):
         """Apply this status to a combatant"""
         # Add base status
-        combatant.statuses.add(self.base_status)
+        combatant.status_mask |= self.base_status.bit
         
         # Apply stat modifiers if tracking enhanced statuses
         if not hasattr(combatant, 'enhanced_statuses'):
@@ -59,7 +64,70 @@ class EnhancedStatus:
     
     def get_domain_modifier(self, domain: Domain) -> int:
         """Get modifier for a specific domain from this status"""
-        return self.domain_modifiers.get(domain, 0)
+        return self.domain_modifiers[domain.id]
+
+# Wounded statuses depend only on their tier, so each is built once at import
+_WOUNDED_TEMPLATES: Dict[StatusTier, EnhancedStatus] = {
+    StatusTier.MINOR: EnhancedStatus(
+        name="Lightly Wounded",
+        base_status=Status.WOUNDED,
+        tier=StatusTier.MINOR,
+        source=StatusSource.PHYSICAL,
+        duration=3,
+        description="A minor wound that hampers physical activity",
+        affected_domains=[Domain.BODY],
+        stat_modifiers={"stamina_regen": -1},
+        domain_modifiers=_domain_modifiers({Domain.BODY: -1}),
+        special_effects=[]
+    ),
+    StatusTier.MODERATE: EnhancedStatus(
+        name="Wounded",
+        base_status=Status.WOUNDED,
+        tier=StatusTier.MODERATE,
+        source=StatusSource.PHYSICAL,
+        duration=4,
+        description="A significant wound that limits movement",
+        affected_domains=[Domain.BODY, Domain.AWARENESS],
+        stat_modifiers={"stamina_regen": -1, "max_stamina": -10},
+        domain_modifiers=_domain_modifiers({Domain.BODY: -1, Domain.AWARENESS: -1}),
+        special_effects=["May leave blood trail"]
+    ),
+    StatusTier.SEVERE: EnhancedStatus(
+        name="Severely Wounded",
+        base_status=Status.WOUNDED,
+        tier=StatusTier.SEVERE,
+        source=StatusSource.PHYSICAL,
+        duration=6,
+        description="A severe wound that greatly impairs function",
+        affected_domains=[Domain.BODY, Domain.AWARENESS, Domain.CRAFT],
+        stat_modifiers={"stamina_regen": -2, "max_stamina": -20},
+        domain_modifiers=_domain_modifiers({Domain.BODY: -2, Domain.AWARENESS: -1, Domain.CRAFT: -1}),
+        special_effects=["Bleeding: Take 3 damage each round", "Visible weakness: Enemies target you more"]
+    ),
+    StatusTier.CRITICAL: EnhancedStatus(
+        name="Critically Wounded",
+        base_status=Status.WOUNDED,
+        tier=StatusTier.CRITICAL,
+        source=StatusSource.PHYSICAL,
+        duration=8,
+        description="A life-threatening wound that severely impairs all function",
+        affected_domains=[Domain.BODY, Domain.AWARENESS, Domain.CRAFT, Domain.MIND],
+        stat_modifiers={"stamina_regen": -3, "max_stamina": -30, "max_focus": -20},
+        domain_modifiers=_domain_modifiers({Domain.BODY: -3, Domain.AWARENESS: -2, Domain.CRAFT: -2, Domain.MIND: -1}),
+        special_effects=["Heavy Bleeding: Take 5 damage each round", 
+                        "Shock: 20% chance to lose a turn",
+                        "Requires immediate medical attention"]
+    ),
+}
+
+def _copy_status(template: EnhancedStatus) -> EnhancedStatus:
+    """Copy a status template with its own lists and dicts, so callers can't alter the template"""
+    return replace(
+        template,
+        affected_domains=list(template.affected_domains),
+        stat_modifiers=dict(template.stat_modifiers),
+        special_effects=list(template.special_effects)
+    )
 
 class StatusFactory:
     """Factory for creating standard enhanced statuses"""
@@ -67,63 +135,25 @@ class StatusFactory:
     @staticmethod
     def create_wounded(tier: StatusTier = StatusTier.MODERATE) -> EnhancedStatus:
         """Create a wounded status with appropriate tier"""
-        if tier == StatusTier.MINOR:
-            return EnhancedStatus(
-                name="Lightly Wounded",
-                base_status=Status.WOUNDED,
-                tier=tier,
-                source=StatusSource.PHYSICAL,
-                duration=3,
-                description="A minor wound that hampers physical activity",
-                affected_domains=[Domain.BODY],
-                stat_modifiers={"stamina_regen": -1},
-                domain_modifiers={Domain.BODY: -1},
-                special_effects=[]
-            )
-        elif tier == StatusTier.MODERATE:
-            return EnhancedStatus(
-                name="Wounded",
-                base_status=Status.WOUNDED,
-                tier=tier,
-                source=StatusSource.PHYSICAL,
-                duration=4,
-                description="A significant wound that limits movement",
-                affected_domains=[Domain.BODY, Domain.AWARENESS],
-                stat_modifiers={"stamina_regen": -1, "max_stamina": -10},
-                domain_modifiers={Domain.BODY: -1, Domain.AWARENESS: -1},
-                special_effects=["May leave blood trail"]
-            )
-        elif tier == StatusTier.SEVERE:
-            return EnhancedStatus(
-                name="Severely Wounded",
-                base_status=Status.WOUNDED,
-                tier=tier,
-                source=StatusSource.PHYSICAL,
-                duration=6,
-                description="A severe wound that greatly impairs function",
-                affected_domains=[Domain.BODY, Domain.AWARENESS, Domain.CRAFT],
-                stat_modifiers={"stamina_regen": -2, "max_stamina": -20},
-                domain_modifiers={Domain.BODY: -2, Domain.AWARENESS: -1, Domain.CRAFT: -1},
-                special_effects=["Bleeding: Take 3 damage each round", "Visible weakness: Enemies target you more"]
-            )
-        else:  # CRITICAL
-            return EnhancedStatus(
-                name="Critically Wounded",
-                base_status=Status.WOUNDED,
-                tier=tier,
-                source=StatusSource.PHYSICAL,
-                duration=8,
-                description="A life-threatening wound that severely impairs all function",
-                affected_domains=[Domain.BODY, Domain.AWARENESS, Domain.CRAFT, Domain.MIND],
-                stat_modifiers={"stamina_regen": -3, "max_stamina": -30, "max_focus": -20},
-                domain_modifiers={Domain.BODY: -3, Domain.AWARENESS: -2, Domain.CRAFT: -2, Domain.MIND: -1},
-                special_effects=["Heavy Bleeding: Take 5 damage each round", 
-                                "Shock: 20% chance to lose a turn",
-                                "Requires immediate medical attention"]
-            )
+        return _copy_status(_WOUNDED_TEMPLATES[tier])
     
     # Add more factory methods for other status types
     
+# Extra consequence severity from the tier of the status that caused it
+_TIER_SEVERITY_BONUS = {StatusTier.SEVERE: 2, StatusTier.CRITICAL: 4}
+
+# Severity at which serious, then permanent, consequences begin
+_CONSEQUENCE_THRESHOLDS = (5, 8)
+
+# (description, narrative hook, duration, intensity, affected stats) per severity band,
+# from minor to permanent; descriptions and hooks are formatted with the move name
+_CONSEQUENCE_TEMPLATES = (
+    ("Minor injury from {}", "Still feeling the effects of the {}", 2, 1, {}),
+    ("Serious injury from {}", "The {} left a lasting mark", 5, 3, {"stamina_regen": -1}),
+    ("Permanent injury from {}", "The {} left a permanent scar, both physically and mentally",
+     -1, 4, {"max_health": -10, "stamina_regen": -1}),  # Duration -1 is permanent
+)
+
 class ConsequenceSystem:
     """Enhanced system for handling long-term consequences"""
     
@@ -136,49 +166,24 @@ class ConsequenceSystem:
             
         # Base consequence severity on effect magnitude and status
         severity = result["effect_magnitude"]
-        if status and status.tier == StatusTier.SEVERE:
-            severity += 2
-        elif status and status.tier == StatusTier.CRITICAL:
-            severity += 4
+        if status:
+            severity += _TIER_SEVERITY_BONUS.get(status.tier, 0)
             
         # Determine affected domains
         affected_domains = []
         if status:
             affected_domains = status.affected_domains.copy()
         
-        # Generate appropriate consequence
-        if severity >= 8:
-            # Major permanent consequence
-            desc = f"Permanent injury from {result['actor_move']}"
-            hook = f"The {result['actor_move']} left a permanent scar, both physically and mentally"
-            return Consequence(
-                description=desc,
-                affected_domains=affected_domains,
-                duration=-1,  # Permanent
-                intensity=4,
-                narrative_hook=hook,
-                affected_stats={"max_health": -10, "stamina_regen": -1}
-            )
-        elif severity >= 5:
-            # Major consequence
-            desc = f"Serious injury from {result['actor_move']}"
-            hook = f"The {result['actor_move']} left a lasting mark"
-            return Consequence(
-                description=desc,
-                affected_domains=affected_domains,
-                duration=5,
-                intensity=3,
-                narrative_hook=hook,
-                affected_stats={"stamina_regen": -1}
-            )
-        else:
-            # Minor consequence
-            desc = f"Minor injury from {result['actor_move']}"
-            hook = f"Still feeling the effects of the {result['actor_move']}"
-            return Consequence(
-                description=desc,
-                affected_domains=affected_domains,
-                duration=2,
-                intensity=1,
-                narrative_hook=hook
-            )
+        # Generate appropriate consequence for the severity band
+        desc, hook, duration, intensity, affected_stats = _CONSEQUENCE_TEMPLATES[
+            bisect_right(_CONSEQUENCE_THRESHOLDS, severity)
+        ]
+        move = result['actor_move']
+        return Consequence(
+            description=desc.format(move),
+            affected_domains=affected_domains,
+            duration=duration,
+            intensity=intensity,
+            narrative_hook=hook.format(move),
+            affected_stats=dict(affected_stats)
+        )
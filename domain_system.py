@@ -3,13 +3,28 @@ Domain progression system for the game engine.
 
 This module handles domain checks, growth, and progression.
 """
-from typing import Dict, List, Optional, Tuple, Any
+import atexit
+import random
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple, Any
 from datetime import datetime
 
 from ..shared.models import (
-    Domain, DomainType, GrowthTier, GrowthLogEntry, Character, Tag, TagCategory
+    Domain, DomainType, GrowthTier, GrowthLogEntry, Character, Tag, TagCategory,
+    tier_for_value
 )
 from ..events.event_bus import event_bus, GameEvent, EventType
+from ..storage.character_storage import get_character, save_character
+
+# Bound once so checks don't re-resolve random.randint per roll
+_randint = random.randint
+
+
+# Display name of each growth tier
+_TIER_NAMES: Dict[GrowthTier, str] = {tier: tier.value.capitalize() for tier in GrowthTier}
+
+# Growth log result marks, indexed by success
+_RESULT_MARKS = ("✗", "✓")
 
 
 class DomainSystem:
@@ -23,39 +38,134 @@ class DomainSystem:
     - Growth log maintenance
     """
     
+    # Maximum number of characters kept in the write-back cache
+    CHARACTER_CACHE_SIZE = 64
+    
+    # Events marking a boundary at which pending character saves are written
+    FLUSH_EVENT_TYPES = (EventType.COMBAT_ENDED, EventType.GAME_SAVED, EventType.GAME_ENDED)
+    
     def __init__(self):
         """Initialize the domain system."""
         # Cache of domain growth status for active characters
         self._domain_growth_cache: Dict[str, Dict[DomainType, int]] = {}
         
+        # Write-back cache of loaded characters (least recently used first), so
+        # repeated checks in a round don't reload and re-save the same character
+        self._character_cache: "OrderedDict[str, Character]" = OrderedDict()
+        self._dirty_characters: Set[str] = set()
+        
         # Subscribe to relevant events
         self._register_event_handlers()
+        
+        # Don't lose changes made after the last boundary event
+        atexit.register(self.flush)
     
     def _register_event_handlers(self):
         """Register event handlers for the domain system."""
-        event_bus.subscribe(EventType.DOMAIN_CHECK, self._handle_domain_check)
+        event_bus.subscribe_batch(EventType.DOMAIN_CHECK, self._handle_domain_checks)
         event_bus.subscribe(EventType.SKILL_CHECK, self._handle_skill_check)
+        for event_type in self.FLUSH_EVENT_TYPES:
+            event_bus.subscribe(event_type, self._handle_flush_event)
+    
+    def _handle_flush_event(self, event: GameEvent):
+        """
+        Handler for events that end a unit of play (combat, save, game end).
+        
+        Args:
+            event: The boundary event
+        """
+        self.flush()
+    
+    def _load_character(self, character_id: str) -> Optional[Character]:
+        """
+        Get a character through the write-back cache.
+        
+        Args:
+            character_id: ID of the character
+            
+        Returns:
+            The character, or None if it is not in storage
+        """
+        character = self._character_cache.get(character_id)
+        if character is not None:
+            self._character_cache.move_to_end(character_id)
+            return character
+        
+        character = get_character(character_id)
+        if character:
+            self._character_cache[character_id] = character
+            if len(self._character_cache) > self.CHARACTER_CACHE_SIZE:
+                evicted_id, evicted = self._character_cache.popitem(last=False)
+                if evicted_id in self._dirty_characters:
+                    self._dirty_characters.discard(evicted_id)
+                    save_character(evicted)
+        return character
+    
+    def _mark_dirty(self, character_id: str):
+        """
+        Record that a cached character has unsaved changes.
+        
+        Args:
+            character_id: ID of the modified character
+        """
+        self._dirty_characters.add(character_id)
+    
+    def flush(self):
+        """
+        Save every modified character and empty the cache.
+        
+        The cache is dropped as well so changes made to storage by other systems
+        are picked up on the next load.
+        """
+        # Apply any domain checks still queued on the event bus first
+        event_bus.flush_batched()
+        
+        self._save_dirty()
+        self._character_cache.clear()
+    
+    def _save_dirty(self):
+        """Save every modified character, keeping them cached for later reads."""
+        for character_id in self._dirty_characters:
+            character = self._character_cache.get(character_id)
+            if character is not None:
+                save_character(character)
+        self._dirty_characters.clear()
+    
+    def _handle_domain_checks(self, events: List[GameEvent]):
+        """
+        Handler for a batch of domain check events.
+        
+        Args:
+            events: The domain check events, in the order they were published
+        """
+        for event in events:
+            self._handle_domain_check(event)
+        
+        # Each delivered batch is saved once, however many checks it held
+        self._save_dirty()
     
     def _handle_domain_check(self, event: GameEvent):
         """
-        Handler for domain check events.
+        Handler for a single domain check event.
         
         Args:
             event: The domain check event
         """
-        # Extract relevant information
-        character_id = event.actor
-        domain_type = event.context.get('domain')
-        success = event.context.get('success', False)
-        action = event.context.get('action', 'Unknown action')
+        # Nothing to log without a domain
+        context = event.context
+        domain_type = context.get('domain')
+        if not domain_type or not isinstance(domain_type, str):
+            return
         
         # Log domain usage and check for growth
-        if domain_type and isinstance(domain_type, str):
-            try:
-                domain_enum = DomainType(domain_type)
-                self.log_domain_use(character_id, domain_enum, action, success)
-            except ValueError:
-                print(f"Warning: Invalid domain type: {domain_type}")
+        try:
+            domain_enum = DomainType(domain_type)
+        except ValueError:
+            print(f"Warning: Invalid domain type: {domain_type}")
+            return
+        self.log_domain_use(event.actor, domain_enum, 
+                            context.get('action', 'Unknown action'), 
+                            context.get('success', False))
     
     def _handle_skill_check(self, event: GameEvent):
         """
@@ -64,15 +174,16 @@ class DomainSystem:
         Args:
             event: The skill check event
         """
-        # Extract relevant information
-        character_id = event.actor
-        tag_name = event.context.get('tag')
-        domain_type = event.context.get('domain')
-        success = event.context.get('success', False)
+        # Only successful checks earn experience
+        context = event.context
+        if not context.get('success'):
+            return
         
         # Add experience to the tag if available
-        if tag_name and success:
-            self.add_tag_experience(character_id, tag_name, 10)  # Default XP gain
+        tag_name = context.get('tag')
+        if tag_name:
+            self.add_tag_experience(event.actor, tag_name, 10)  # Default XP gain
+            self._save_dirty()
     
     def roll_check(self, 
                   character: Character, 
@@ -91,10 +202,9 @@ class DomainSystem:
         Returns:
             Dictionary with roll results
         """
-        import random
-        
         # Roll a d20
-        roll = random.randint(1, 20)
+        roll = _randint(1, 20)
+        domain_name = domain_type.value
         
         # Get domain value
         domain_value = 0
@@ -125,26 +235,28 @@ class DomainSystem:
             "total": total,
             "success": success,
             "margin": margin,
-            "domain": domain_type.value
+            "domain": domain_name
         }
         
-        # Publish domain check event
-        event = GameEvent(
-            type=EventType.DOMAIN_CHECK,
-            actor=str(character.id),
-            context={
-                "domain": domain_type.value,
-                "tag": tag_name,
-                "difficulty": difficulty,
-                "roll": roll,
-                "total": total,
-                "success": success,
-                "margin": margin
-            },
-            tags=["check", domain_type.value.lower(), "dice_roll"],
-            game_id=getattr(character, "game_id", None)
-        )
-        event_bus.publish(event)
+        # Publish domain check event, unless no one is listening
+        if event_bus.has_listeners(EventType.DOMAIN_CHECK):
+            event = GameEvent(
+                type=EventType.DOMAIN_CHECK,
+                actor=str(character.id),
+                context={
+                    "domain": domain_name,
+                    "tag": tag_name,
+                    "difficulty": difficulty,
+                    "roll": roll,
+                    "total": total,
+                    "success": success,
+                    "margin": margin
+                },
+                tags=["check", domain_name.lower(), "dice_roll"],
+                game_id=getattr(character, "game_id", None)
+            )
+            # Checks are frequent, so growth is applied when the bus flushes its batch
+            event_bus.publish_batched(event)
         
         return result
     
@@ -165,10 +277,8 @@ class DomainSystem:
         Returns:
             Tuple of (usage_recorded, level_up_occurred)
         """
-        from ..storage.character_storage import get_character
-        
         # Get character from storage
-        character = get_character(character_id)
+        character = self._load_character(character_id)
         if not character:
             print(f"Warning: Character {character_id} not found")
             return False, False
@@ -192,9 +302,8 @@ class DomainSystem:
         if level_up:
             self._publish_domain_increased_event(character, domain_type, domain.value)
         
-        # Save character
-        from ..storage.character_storage import save_character
-        save_character(character)
+        # Save character when the current batch or handler finishes
+        self._mark_dirty(character_id)
         
         return True, level_up
     
@@ -210,32 +319,27 @@ class DomainSystem:
             domain_type: The domain that increased
             new_value: The new domain value
         """
+        # Nothing to build if no one is listening
+        if not event_bus.has_listeners(EventType.DOMAIN_INCREASED):
+            return
+            
         # Get the growth tier for this value
-        new_tier = GrowthTier.NOVICE
-        if new_value <= 2:
-            new_tier = GrowthTier.NOVICE
-        elif new_value <= 4:
-            new_tier = GrowthTier.SKILLED
-        elif new_value <= 7:
-            new_tier = GrowthTier.EXPERT
-        elif new_value <= 9:
-            new_tier = GrowthTier.MASTER
-        else:
-            new_tier = GrowthTier.PARAGON
+        new_tier = tier_for_value(new_value)
+        domain_name = domain_type.value
             
         event = GameEvent(
             type=EventType.DOMAIN_INCREASED,
             actor=str(character.id),
             context={
-                "domain": domain_type.value,
+                "domain": domain_name,
                 "old_value": new_value - 1,
                 "new_value": new_value,
                 "tier": new_tier.value
             },
-            tags=["progression", domain_type.value.lower(), "level_up"],
+            tags=["progression", domain_name.lower(), "level_up"],
             effects=[
-                {"type": "domain_level_up", "domain": domain_type.value, "value": new_value},
-                {"type": "notification", "message": f"Your {domain_type.value} domain has increased to {new_value}!"}
+                {"type": "domain_level_up", "domain": domain_name, "value": new_value},
+                {"type": "notification", "message": f"Your {domain_name} domain has increased to {new_value}!"}
             ],
             game_id=getattr(character, "game_id", None)
         )
@@ -256,10 +360,8 @@ class DomainSystem:
         Returns:
             True if a rank up occurred, False otherwise
         """
-        from ..storage.character_storage import get_character, save_character
-        
         # Get character from storage
-        character = get_character(character_id)
+        character = self._load_character(character_id)
         if not character:
             print(f"Warning: Character {character_id} not found")
             return False
@@ -274,28 +376,30 @@ class DomainSystem:
         # Add XP and check for rank up
         rank_up = tag.gain_xp(xp_amount)
         
-        # If rank up occurred, publish event
-        if rank_up:
+        # If rank up occurred and someone is listening, publish event
+        if rank_up and event_bus.has_listeners(EventType.TAG_INCREASED):
+            new_rank = tag.rank
+            category_name = tag.category.value
             event = GameEvent(
                 type=EventType.TAG_INCREASED,
                 actor=str(character.id),
                 context={
                     "tag": tag_name,
-                    "old_rank": tag.rank - 1,
-                    "new_rank": tag.rank,
-                    "category": tag.category.value
+                    "old_rank": new_rank - 1,
+                    "new_rank": new_rank,
+                    "category": category_name
                 },
-                tags=["progression", "skill", tag.category.value.lower()],
+                tags=["progression", "skill", category_name.lower()],
                 effects=[
-                    {"type": "tag_rank_up", "tag": tag_name, "rank": tag.rank},
-                    {"type": "notification", "message": f"Your {tag_name} skill has increased to rank {tag.rank}!"}
+                    {"type": "tag_rank_up", "tag": tag_name, "rank": new_rank},
+                    {"type": "notification", "message": f"Your {tag_name} skill has increased to rank {new_rank}!"}
                 ],
                 game_id=getattr(character, "game_id", None)
             )
             event_bus.publish(event)
         
-        # Save character
-        save_character(character)
+        # Save character when the current batch or handler finishes
+        self._mark_dirty(character_id)
         
         return rank_up
     
@@ -310,10 +414,11 @@ class DomainSystem:
         Returns:
             Summary string of recent growth log entries
         """
-        from ..storage.character_storage import get_character
+        # Make sure queued domain checks are reflected in the log
+        event_bus.flush_batched()
         
         # Get character from storage
-        character = get_character(character_id)
+        character = self._load_character(character_id)
         if not character:
             return "Character not found"
         
@@ -324,35 +429,25 @@ class DomainSystem:
         domain = character.domains[domain_type]
         
         # Get the last 5 entries
-        entries = domain.growth_log[-5:] if domain.growth_log else []
+        entries = list(domain.growth_log)[-5:]
         
         if not entries:
             return f"No growth log entries for {domain_type.value}"
             
         # Format entries
         lines = [f"Recent {domain_type.value} domain growth:"]
+        # GrowthLogEntry.date is always a datetime (the model parses stored strings)
         for entry in entries:
-            date_str = entry.date.strftime("%Y-%m-%d") if hasattr(entry.date, "strftime") else entry.date
-            result = "✓" if entry.success else "✗"
-            lines.append(f"• {date_str}: {entry.action} [{result}]")
+            lines.append(f"• {entry.date:%Y-%m-%d}: {entry.action} [{_RESULT_MARKS[entry.success]}]")
             
         lines.append(f"Current level: {domain.value} ({self._get_tier_name(domain.value)})")
-        lines.append(f"Progress: {len([e for e in domain.growth_log if e.success])}/{domain.level_ups_required} successful actions")
+        lines.append(f"Progress: {domain.success_count}/{domain.level_ups_required} successful actions")
         
         return "\n".join(lines)
     
     def _get_tier_name(self, value: int) -> str:
         """Get the tier name for a domain value."""
-        if value <= 2:
-            return "Novice"
-        elif value <= 4:
-            return "Skilled"
-        elif value <= 7:
-            return "Expert"
-        elif value <= 9:
-            return "Master"
-        else:
-            return "Paragon"
+        return _TIER_NAMES[tier_for_value(value)]
 
 
 # Global domain system instance
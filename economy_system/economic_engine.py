@@ -1,7 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from time import monotonic
+
 class EconomicSystem:
     """Main controller for the economic simulation"""
-    def __init__(self, database_connection):
+    # Subsystems updated each tick, stage by stage so effects cascade. Subsystems
+    # within a stage don't depend on each other's writes and may run concurrently
+    UPDATE_STAGES = (
+        ("events",),
+        ("production", "trade"),
+        ("markets", "factions"),
+        ("shops",),
+    )
+    
+    # Player action type -> (manager attribute, method name) of its handler, called
+    # as handler(player_id, **action_data). Resolved on dispatch, so a manager that
+    # lacks a handler only fails when that action is used
+    ACTION_HANDLERS = {
+        "purchase": ("shops", "process_purchase"),
+        "sale": ("shops", "process_sale"),
+        "craft": ("crafting", "craft_item"),
+        "trade_route_action": ("trade", "process_route_action"),
+        "production_action": ("production", "process_site_action"),
+    }
+    
+    # Seconds a computed health score or market snapshot is reused for. Entries
+    # are also dropped whenever the economy changes (update ticks, player actions)
+    READ_CACHE_TTL = 60
+    # Entries kept per read cache before it is emptied
+    READ_CACHE_SIZE = 4096
+    
+    def __init__(self, database_connection, max_concurrent_updates=1):
         self.db = database_connection
+        # Update stages and report reads only run concurrently when the connection
+        # can be shared across threads (e.g. a connection pool); the default of 1
+        # keeps everything serial
+        self.max_concurrent_updates = max_concurrent_updates
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_concurrent_updates)
+            if max_concurrent_updates > 1 else None
+        )
+        # key -> (expiry time, value) for read paths polled by the UI
+        self._health_cache = {}
+        self._market_data_cache = {}
         # Initialize component managers
         self.resources = ResourceManager(self.db)
         self.locations = LocationManager(self.db)
@@ -15,54 +56,101 @@ class EconomicSystem:
         
     def update(self, game_time_delta):
         """Update the entire economic system for a time period"""
-        # Update in sequence to create proper cascading effects
-        self.events.update(game_time_delta)
-        self.production.update(game_time_delta)
-        self.trade.update(game_time_delta)
-        self.markets.update(game_time_delta)
-        self.factions.update(game_time_delta)
-        self.shops.update(game_time_delta)
+        # A paused or debounced tick changes nothing, so skip every subsystem's I/O
+        if game_time_delta <= 0:
+            return
+        
+        # Update stage by stage to create proper cascading effects
+        for stage in self.UPDATE_STAGES:
+            managers = [getattr(self, name) for name in stage]
+            if self._executor is None or len(managers) == 1:
+                for manager in managers:
+                    manager.update(game_time_delta)
+            else:
+                # Waits for the whole stage and re-raises the first subsystem error
+                list(self._executor.map(lambda manager: manager.update(game_time_delta), managers))
+                
+        # Cached reads now describe the previous tick
+        self._invalidate_read_caches()
+    
+    def _invalidate_read_caches(self):
+        """Forget cached reports after the economic state changes"""
+        self._health_cache.clear()
+        self._market_data_cache.clear()
+    
+    def _cached_read(self, cache, key, compute):
+        """Return a cached value for key, computing and storing it if missing or expired
+        
+        Callers get their own copy, so mutating a report can't corrupt the cache
+        """
+        now = monotonic()
+        entry = cache.get(key)
+        if entry is not None and entry[0] > now:
+            return deepcopy(entry[1])
+        
+        value = compute()
+        if len(cache) >= self.READ_CACHE_SIZE:
+            cache.clear()
+        cache[key] = (now + self.READ_CACHE_TTL, value)
+        return deepcopy(value)
+    
+    def close(self):
+        """Release the worker threads used for concurrent updates and reads"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
         
     def process_player_action(self, action_type, player_id, **action_data):
         """Handle economic effects of player actions"""
-        if action_type == "purchase":
-            return self.shops.process_purchase(player_id, **action_data)
-        elif action_type == "sale":
-            return self.shops.process_sale(player_id, **action_data)
-        elif action_type == "craft":
-            return self.crafting.craft_item(player_id, **action_data)
-        elif action_type == "trade_route_action":
-            return self.trade.process_route_action(player_id, **action_data)
-        elif action_type == "production_action":
-            return self.production.process_site_action(player_id, **action_data)
+        handler_name = self.ACTION_HANDLERS.get(action_type)
+        if handler_name is None:
+            return None
+        
+        manager_attr, method_name = handler_name
+        handler = getattr(getattr(self, manager_attr), method_name)
+        try:
+            return handler(player_id, **action_data)
+        finally:
+            # After the handler, so reads cached while it ran are dropped too
+            self._invalidate_read_caches()
     
     def get_market_data(self, location_id, resource_ids=None):
         """Get current market information for a location"""
-        return self.markets.get_market_data(location_id, resource_ids)
+        key = (location_id, tuple(resource_ids) if resource_ids is not None else None)
+        return self._cached_read(
+            self._market_data_cache, key,
+            lambda: self.markets.get_market_data(location_id, resource_ids)
+        )
     
     def get_economic_report(self, location_id):
         """Generate an economic report for a location"""
-        # Gather data from various subsystems
-        market_data = self.markets.get_market_data(location_id)
-        production_data = self.production.get_production_data(location_id)
-        trade_data = self.trade.get_location_trade_data(location_id)
-        shop_data = self.shops.get_location_shops(location_id)
-        
-        # Compile into a report dictionary
-        return {
-            "market": market_data,
-            "production": production_data,
-            "trade": trade_data,
-            "shops": shop_data,
-            "local_events": self.events.get_location_events(location_id),
-            "economic_health": self._calculate_economic_health(location_id)
+        # Gather data from various subsystems; the reads are independent
+        readers = {
+            "market": lambda: self.get_market_data(location_id),
+            "production": lambda: self.production.get_production_data(location_id),
+            "trade": lambda: self.trade.get_location_trade_data(location_id),
+            "shops": lambda: self.shops.get_location_shops(location_id),
+            "local_events": lambda: self.events.get_location_events(location_id),
+            "economic_health": lambda: self._calculate_economic_health(location_id)
         }
+        
+        if self._executor is None:
+            return {key: read() for key, read in readers.items()}
+        
+        # Fan out so the report takes as long as the slowest read, not their sum
+        futures = {key: self._executor.submit(read) for key, read in readers.items()}
+        return {key: future.result() for key, future in futures.items()}
     
     def _calculate_economic_health(self, location_id):
         """Calculate overall economic health of a location (1-100)"""
+        return self._cached_read(
+            self._health_cache, location_id,
+            lambda: self._compute_economic_health(location_id)
+        )
+    
+    def _compute_economic_health(self, location_id):
+        """Compute the economic health score from its sub-indicators"""
         # Composite score based on multiple factors
-        location = self.locations.get_location(location_id)
-        
         # Various economic indicators
         supply_sufficiency = self._calculate_supply_sufficiency(location_id)
         price_stability = self._calculate_price_stability(location_id)
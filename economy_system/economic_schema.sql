@@ -49,6 +49,15 @@ CREATE TABLE production_modifiers (
     description TEXT
 );
 
+-- Production Log (for analytics)
+CREATE TABLE production_log (
+    id SERIAL PRIMARY KEY,
+    production_site_id INTEGER REFERENCES production_sites(id),
+    amount NUMERIC(12,2) NOT NULL,
+    time_delta NUMERIC(10,2) NOT NULL, -- length of the tick that produced it
+    recorded_date TIMESTAMP DEFAULT NOW()
+);
+
 -- Market System
 CREATE TABLE market_listings (
     id SERIAL PRIMARY KEY,
@@ -56,9 +65,10 @@ CREATE TABLE market_listings (
     resource_id INTEGER REFERENCES resources(id),
     current_price NUMERIC(10,2) NOT NULL,
     base_price NUMERIC(10,2) NOT NULL, -- reference price
-    available_quantity INTEGER NOT NULL DEFAULT 0,
+    available_quantity INTEGER NOT NULL DEFAULT 0 CHECK (available_quantity >= 0),
     demand_level INTEGER DEFAULT 50, -- 1-100 scale
-    last_updated TIMESTAMP DEFAULT NOW()
+    last_updated TIMESTAMP DEFAULT NOW(),
+    UNIQUE (location_id, resource_id) -- one listing per market, target of production upserts
 );
 
 -- Price History for trends and analysis
@@ -97,6 +107,10 @@ CREATE TABLE shipments (
     owner_id INTEGER NOT NULL
 );
 
+-- Arrival checks only look at in-transit shipments that are due
+CREATE INDEX idx_shipments_arrival ON shipments (expected_arrival_time) 
+    WHERE status = 'in_transit';
+
 -- Shops in locations
 CREATE TABLE shops (
     id SERIAL PRIMARY KEY,
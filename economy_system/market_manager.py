@@ -1,70 +1,158 @@
+from math import exp
+
+try:
+    # Optional: vectorized price computation for ticks with many listings
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many listings building arrays costs more than the plain loop saves
+_VECTORIZE_MIN_LISTINGS = 512
+
+# Combined active price effect per resource and per location. Postgres has no
+# product aggregate, so it is EXP(SUM(LN(x))); LN is undefined for x <= 0, and
+# any such effect zeroes the factor (the price then settles at its floor)
+_PRICE_EFFECTS = """
+        SELECT ee.target_type, ee.target_id,
+               CASE WHEN MIN(ee.effect_value) <= 0 THEN 0
+                    ELSE EXP(SUM(LN(ee.effect_value))) END AS factor
+        FROM event_effects ee
+        JOIN economic_events e ON ee.event_id = e.id
+        WHERE e.active = TRUE
+        AND ee.effect_type = 'price'
+        AND ee.target_type IN ('resource', 'location')
+        GROUP BY ee.target_type, ee.target_id
+"""
+
+# The part of a price set by its location, resource and active events alone,
+# which supply and demand then scale. Evaluated once per row by the query
+# rather than rebuilt factor by factor for each listing in Python
+_MARKET_SCALE = """
+    (0.8 + l.prosperity / 250.0)                        -- location factor, 0.8 to 1.2
+    * (0.5 + r.rarity / 100.0)                          -- rarity factor, 0.5 to 1.5
+    * COALESCE(re.factor, 1) * COALESCE(le.factor, 1)   -- active price events
+"""
+
+# Every listing with the inputs its price needs, in one round trip
+_Q_LISTINGS_WITH_FACTORS = f"""
+    WITH price_effects AS ({_PRICE_EFFECTS})
+    SELECT ml.id, ml.base_price, ml.available_quantity, ml.demand_level, l.size,
+           {_MARKET_SCALE} AS market_scale
+    FROM market_listings ml
+    JOIN locations l ON l.id = ml.location_id
+    JOIN resources r ON r.id = ml.resource_id
+    LEFT JOIN price_effects re
+        ON re.target_type = 'resource' AND re.target_id = ml.resource_id
+    LEFT JOIN price_effects le
+        ON le.target_type = 'location' AND le.target_id = ml.location_id
+"""
+
+# The same inputs for a single resource/location pair
+_Q_PRICE_FACTORS = f"""
+    WITH price_effects AS ({_PRICE_EFFECTS})
+    SELECT l.size, {_MARKET_SCALE} AS market_scale
+    FROM locations l
+    JOIN resources r ON r.id = %s
+    LEFT JOIN price_effects re
+        ON re.target_type = 'resource' AND re.target_id = r.id
+    LEFT JOIN price_effects le
+        ON le.target_type = 'location' AND le.target_id = l.id
+    WHERE l.id = %s
+"""
+
+_Q_UPDATE_PRICES = """
+    UPDATE market_listings AS ml
+    SET current_price = v.price,
+        last_updated = NOW()
+    FROM unnest(%s::integer[], %s::numeric[]) AS v(id, price)
+    WHERE ml.id = v.id
+"""
+
+_Q_INSERT_PRICE_HISTORY = """
+    INSERT INTO price_history (market_listing_id, price, quantity)
+    SELECT * FROM unnest(%s::integer[], %s::numeric[], %s::integer[])
+"""
+
 class MarketManager:
     """Handles market prices and trading"""
     def __init__(self, db):
         self.db = db
-        
+    
     def update(self, time_delta):
-        """Update all markets' prices based on supply and demand"""
-        # Get all market listings
-        query = "SELECT * FROM market_listings"
-        listings = self.db.execute_query(query)
+        """Update all markets' prices based on supply and demand
+        
+        Costs three statements however many listings there are: one query for
+        the listings and their price inputs, one bulk price update and one bulk
+        price history insert.
+        """
+        # Get all market listings with their location, resource and event factors
+        listings = self.db.execute_query(_Q_LISTINGS_WITH_FACTORS)
+        if not listings:
+            return
+        
+        # Calculate new prices
+        prices = self._listing_prices(listings)
+        listing_ids = [listing['id'] for listing in listings]
+        
+        # Update the prices
+        self.db.execute_query(_Q_UPDATE_PRICES, (listing_ids, prices))
+        
+        # Record price history
+        self.db.execute_query(
+            _Q_INSERT_PRICE_HISTORY,
+            (listing_ids, prices, [listing['available_quantity'] for listing in listings])
+        )
+    
+    def _listing_prices(self, listings):
+        """New price of every listing row from _Q_LISTINGS_WITH_FACTORS, in order"""
+        if np is None or len(listings) < _VECTORIZE_MIN_LISTINGS:
+            return [
+                self._price_from_factors(
+                    listing['base_price'],
+                    listing['available_quantity'],
+                    listing['demand_level'],
+                    listing['size'],
+                    listing['market_scale']
+                )
+                for listing in listings
+            ]
         
-        for listing in listings:
-            # Calculate new price
-            new_price = self.calculate_price(
-                listing['location_id'], 
-                listing['resource_id'],
-                listing['available_quantity'],
-                listing['demand_level'],
-                listing['base_price']
+        # Same formula as _price_from_factors, evaluated over whole columns
+        def column(name):
+            return np.fromiter(
+                (float(listing[name]) for listing in listings), dtype=np.float64, count=len(listings)
             )
-            
-            # Update the price
-            self.update_price(listing['id'], new_price)
-            
-            # Record price history
-            self.record_price_history(listing['id'], new_price, listing['available_quantity'])
+        
+        base_price = column('base_price')
+        # One np.exp over the whole supply column replaces a math.exp per listing
+        supply_factor = 2.0 / (1 + np.exp(column('available_quantity') / (column('size') * 10) - 1))
+        demand_factor = 0.5 + column('demand_level') / 50.0
+        raw_price = base_price * column('market_scale') * supply_factor * demand_factor
+        return np.clip(raw_price, base_price * 0.5, base_price * 3.0).tolist()
     
     def calculate_price(self, location_id, resource_id, quantity, demand, base_price):
         """Calculate the current price based on multiple factors"""
-        # Get the location data for regional factors
-        location_query = "SELECT * FROM locations WHERE id = %s"
-        location = self.db.execute_query(location_query, (location_id,))[0]
-        
-        # Get the resource data
-        resource_query = "SELECT * FROM resources WHERE id = %s"
-        resource = self.db.execute_query(resource_query, (resource_id,))[0]
+        # Get the location, resource and active event inputs in one round trip
+        factors = self.db.execute_query(_Q_PRICE_FACTORS, (resource_id, location_id))[0]
         
-        # Get active economic events affecting this resource/location
-        event_query = """
-            SELECT ee.* FROM event_effects ee
-            JOIN economic_events e ON ee.event_id = e.id
-            WHERE e.active = TRUE
-            AND ((ee.target_type = 'resource' AND ee.target_id = %s)
-                OR (ee.target_type = 'location' AND ee.target_id = %s))
-            AND ee.effect_type = 'price'
-        """
-        events = self.db.execute_query(event_query, (resource_id, location_id))
+        return self._price_from_factors(
+            base_price, quantity, demand, factors['size'], factors['market_scale']
+        )
+    
+    def _price_from_factors(self, base_price, quantity, demand, location_size, market_scale):
+        """Price of a listing given its supply, demand and _MARKET_SCALE value"""
+        # NUMERIC columns arrive as Decimal, which doesn't mix with float arithmetic
+        base_price = float(base_price)
         
         # Calculate supply factor (inverse relationship)
-        supply_factor = self._calculate_supply_factor(quantity, location['size'])
+        supply_factor = self._calculate_supply_factor(quantity, location_size)
         
         # Calculate demand factor
         demand_factor = self._calculate_demand_factor(demand)
         
-        # Calculate location factor (based on prosperity)
-        location_factor = 0.8 + (location['prosperity'] / 250)  # 0.8 to 1.2
-        
-        # Calculate rarity factor
-        rarity_factor = 0.5 + (resource['rarity'] / 100)  # 0.5 to 1.5
-        
-        # Apply event effects
-        event_factor = 1.0
-        for event in events:
-            event_factor *= event['effect_value']
-        
-        # Calculate final price with constraints
-        raw_price = base_price * supply_factor * demand_factor * location_factor * rarity_factor * event_factor
+        # Calculate final price with constraints; location, rarity and event
+        # factors are already combined in market_scale
+        raw_price = base_price * float(market_scale) * supply_factor * demand_factor
         
         # Apply price constraints (min 50% of base, max 300% of base)
         min_price = base_price * 0.5
@@ -79,7 +167,7 @@ class MarketManager:
         
         # Inverse relationship: more supply = lower price
         # Uses sigmoid function to create a smooth curve
-        return 2.0 / (1 + math.exp(normalized_supply - 1))
+        return 2.0 / (1 + exp(normalized_supply - 1))
     
     def _calculate_demand_factor(self, demand):
         """Calculate how demand affects price"""
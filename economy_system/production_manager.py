@@ -1,102 +1,243 @@
+try:
+    # Optional: vectorized rate computation for ticks with many sites
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many sites building arrays costs more than the plain loop saves
+_VECTORIZE_MIN_SITES = 512
+
+# Rates are stored as NUMERIC(10,2); smaller differences don't change the stored value
+_RATE_TOLERANCE = 0.005
+
+# Columns of production_sites the rate computation reads
+_SITE_COLUMNS = """
+    id, location_id, resource_id, base_production_rate, current_production_rate, 
+    current_labor, labor_capacity
+"""
+
+# Statement texts are fixed (bulk writes pass arrays instead of growing VALUES
+# lists), so the driver can prepare each one once and reuse it every tick
+# Active sites are read in id order, one page at a time after the last id seen
+_Q_ACTIVE_SITES_PAGE = f"""
+    SELECT {_SITE_COLUMNS} FROM production_sites 
+    WHERE active = TRUE AND id > %s 
+    ORDER BY id 
+    LIMIT %s
+"""
+
+# Product of the current modifiers of the given sites, one row per modified site.
+# Postgres has no product aggregate, so it is EXP(SUM(LN(x))); LN is undefined
+# for x <= 0, and any such modifier stops the site (multiplier 0)
+_Q_ACTIVE_MULTIPLIERS = """
+    SELECT pm.production_site_id,
+           CASE WHEN MIN(pm.modifier_value) <= 0 THEN 0
+                ELSE EXP(SUM(LN(pm.modifier_value))) END AS rate_multiplier
+    FROM production_modifiers pm
+    WHERE pm.production_site_id = ANY(%s::integer[]) 
+    AND pm.start_date <= NOW() 
+    AND (pm.end_date IS NULL OR pm.end_date >= NOW())
+    GROUP BY pm.production_site_id
+"""
+
+_Q_SITE = f"SELECT {_SITE_COLUMNS} FROM production_sites WHERE id = %s"
+
+_Q_SITE_MODIFIERS = """
+    SELECT modifier_value FROM production_modifiers 
+    WHERE production_site_id = %s 
+    AND start_date <= NOW() 
+    AND (end_date IS NULL OR end_date >= NOW())
+"""
+
+_Q_UPDATE_RATE = """
+    UPDATE production_sites 
+    SET current_production_rate = %s 
+    WHERE id = %s
+"""
+
+_Q_UPDATE_RATES = """
+    UPDATE production_sites AS ps
+    SET current_production_rate = v.rate
+    FROM unnest(%s::integer[], %s::numeric[]) AS v(id, rate)
+    WHERE ps.id = v.id
+"""
+
+# All rows travel as three array parameters of one statement, the same single
+# round-trip execute_values would give; batches are capped at SITE_BATCH_SIZE
+# sites, which keeps every upsert far below the size where COPY pays off
+_Q_UPSERT_LISTINGS = """
+    INSERT INTO market_listings 
+    (location_id, resource_id, current_price, base_price, available_quantity)
+    SELECT v.location_id, v.resource_id, r.base_value, r.base_value, v.amount
+    FROM unnest(%s::integer[], %s::integer[], %s::numeric[]) AS v(location_id, resource_id, amount)
+    JOIN resources r ON r.id = v.resource_id
+    ON CONFLICT (location_id, resource_id) DO UPDATE 
+    SET available_quantity = market_listings.available_quantity + EXCLUDED.available_quantity,
+        last_updated = NOW()
+"""
+
+_Q_INSERT_PRODUCTION_LOG = """
+    INSERT INTO production_log (production_site_id, amount, time_delta)
+    SELECT * FROM unnest(%s::integer[], %s::numeric[], %s::numeric[])
+"""
+
 class ProductionManager:
     """Manages resource production throughout the game world"""
+    # Active sites loaded and written per batch, bounding memory on large worlds
+    SITE_BATCH_SIZE = 5000
+    
     def __init__(self, db):
         self.db = db
+        # (site_id, amount, time_delta) rows waiting for flush_production_log
+        self._pending_logs = []
     
     def update(self, time_delta):
-        """Update all production sites for a time period"""
-        # Get all active production sites
-        query = "SELECT * FROM production_sites WHERE active = TRUE"
-        production_sites = self.db.execute_query(query)
+        """Update all production sites for a time period
+        
+        Sites are processed in batches of SITE_BATCH_SIZE. Each batch costs one
+        query for the sites, one for their combined modifiers, then one bulk rate
+        update and one bulk market upsert, instead of several round-trips per site.
+        """
+        # Nothing is produced in an empty time period
+        if time_delta <= 0:
+            return
         
-        for site in production_sites:
-            # Calculate current production rate with modifiers
-            current_rate = self.calculate_production_rate(site['id'])
+        last_site_id = 0
+        while True:
+            # Get the next page of active production sites
+            production_sites = self.db.execute_query(
+                _Q_ACTIVE_SITES_PAGE, (last_site_id, self.SITE_BATCH_SIZE)
+            )
+            if not production_sites:
+                return
             
-            # Calculate produced amount for time period
-            produced_amount = current_rate * time_delta
+            self._update_site_batch(production_sites, time_delta)
+            
+            if len(production_sites) < self.SITE_BATCH_SIZE:
+                return
+            last_site_id = production_sites[-1]['id']
+    
+    def _update_site_batch(self, production_sites, time_delta):
+        """Produce for one batch of active sites and write the results back"""
+        site_ids = [site['id'] for site in production_sites]
+        
+        # Get every site's combined modifier in one query; unmodified sites are absent
+        multipliers = {
+            row['production_site_id']: row['rate_multiplier']
+            for row in self.db.execute_query(_Q_ACTIVE_MULTIPLIERS, (site_ids,))
+        }
+        
+        # Calculate current production rates with modifiers
+        rates = self._production_rates(production_sites, multipliers)
+        
+        changed_site_ids = []
+        changed_rates = []
+        market_additions = {}
+        for site, current_rate in zip(production_sites, rates):
+            # Only rewrite rates that changed since the last tick (steady sites are the norm)
+            if abs(current_rate - float(site['current_production_rate'])) >= _RATE_TOLERANCE:
+                changed_site_ids.append(site['id'])
+                changed_rates.append(current_rate)
             
-            # Add produced resources to local market
-            self.add_to_local_market(site['location_id'], site['resource_id'], produced_amount)
+            # Calculate produced amount for time period; sites sharing a market are summed
+            produced_amount = current_rate * time_delta
+            if produced_amount > 0:
+                market_key = (site['location_id'], site['resource_id'])
+                market_additions[market_key] = market_additions.get(market_key, 0) + produced_amount
             
             # Log production for analytics
             self.log_production(site['id'], produced_amount, time_delta)
+        
+        if changed_site_ids:
+            self._update_production_rates(changed_site_ids, changed_rates)
+        if market_additions:
+            self._add_to_local_markets(market_additions)
+        self.flush_production_log()
+    
+    def _production_rates(self, sites, multipliers):
+        """Current production rate of every site, in the order given"""
+        if np is None or len(sites) < _VECTORIZE_MIN_SITES:
+            return [
+                self._apply_production_modifiers(site, multipliers.get(site['id'], 1.0))
+                for site in sites
+            ]
+        
+        # Same formula as _apply_production_modifiers, evaluated over whole columns
+        count = len(sites)
+        base = np.fromiter((float(site['base_production_rate']) for site in sites), dtype=np.float64, count=count)
+        labor = np.fromiter((site['current_labor'] for site in sites), dtype=np.float64, count=count)
+        capacity = np.fromiter((site['labor_capacity'] for site in sites), dtype=np.float64, count=count)
+        multiplier = np.fromiter(
+            (float(multipliers.get(site['id'], 1.0)) for site in sites), dtype=np.float64, count=count
+        )
+        # A site without labor capacity produces nothing (matches the scalar path)
+        ratio = np.divide(labor, capacity, out=np.zeros(count), where=capacity > 0)
+        return (base * multiplier * np.minimum(1.0, ratio)).tolist()
+    
+    def _apply_production_modifiers(self, site, rate_multiplier):
+        """Production rate of a site given the product of its active modifiers"""
+        # Apply labor efficiency; a site without labor capacity produces nothing
+        capacity = site['labor_capacity']
+        labor_ratio = site['current_labor'] / capacity if capacity > 0 else 0.0
+        labor_efficiency = min(1.0, labor_ratio)  # Cap at 100% efficiency
+        
+        # NUMERIC columns arrive as Decimal, which doesn't mix with float arithmetic
+        return float(site['base_production_rate']) * float(rate_multiplier) * labor_efficiency
+    
+    def _update_production_rates(self, site_ids, rates):
+        """Write rates back to production_sites in one statement"""
+        self.db.execute_query(_Q_UPDATE_RATES, (site_ids, rates))
+    
+    def _add_to_local_markets(self, market_additions):
+        """Add produced amounts keyed by (location_id, resource_id) to their markets in one upsert"""
+        location_ids = [location_id for location_id, _ in market_additions]
+        resource_ids = [resource_id for _, resource_id in market_additions]
+        self.db.execute_query(
+            _Q_UPSERT_LISTINGS, 
+            (location_ids, resource_ids, list(market_additions.values()))
+        )
     
     def calculate_production_rate(self, site_id):
         """Calculate current production rate with all modifiers applied"""
         # Get base production site data
-        query = "SELECT * FROM production_sites WHERE id = %s"
-        site = self.db.execute_query(query, (site_id,))[0]
-        
-        base_rate = site['base_production_rate']
+        site = self.db.execute_query(_Q_SITE, (site_id,))[0]
         
         # Get all active modifiers for this site
-        now = datetime.now()
-        query = """
-            SELECT * FROM production_modifiers 
-            WHERE production_site_id = %s 
-            AND start_date <= %s 
-            AND (end_date IS NULL OR end_date >= %s)
-        """
-        modifiers = self.db.execute_query(query, (site_id, now, now))
+        modifiers = self.db.execute_query(_Q_SITE_MODIFIERS, (site_id,))
         
         # Apply all modifiers
         rate_multiplier = 1.0
         for mod in modifiers:
             rate_multiplier *= mod['modifier_value']
         
-        # Apply labor efficiency
-        labor_ratio = site['current_labor'] / site['labor_capacity']
-        labor_efficiency = min(1.0, labor_ratio)  # Cap at 100% efficiency
-        
         # Calculate final rate
-        current_rate = base_rate * rate_multiplier * labor_efficiency
+        current_rate = self._apply_production_modifiers(site, rate_multiplier)
         
         # Update the current rate in database
-        update_query = """
-            UPDATE production_sites 
-            SET current_production_rate = %s 
-            WHERE id = %s
-        """
-        self.db.execute_query(update_query, (current_rate, site_id))
+        self.db.execute_query(_Q_UPDATE_RATE, (current_rate, site_id))
         
         return current_rate
     
     def add_to_local_market(self, location_id, resource_id, amount):
         """Add produced resources to the local market"""
-        # First check if a market listing exists
-        query = """
-            SELECT * FROM market_listings 
-            WHERE location_id = %s AND resource_id = %s
-        """
-        listing = self.db.execute_query(query, (location_id, resource_id))
-        
-        if listing:
-            # Update existing listing
-            update_query = """
-                UPDATE market_listings 
-                SET available_quantity = available_quantity + %s,
-                    last_updated = NOW()
-                WHERE location_id = %s AND resource_id = %s
-            """
-            self.db.execute_query(update_query, (amount, location_id, resource_id))
-        else:
-            # Create new listing
-            # First get base price from resources table
-            resource_query = "SELECT base_value FROM resources WHERE id = %s"
-            resource = self.db.execute_query(resource_query, (resource_id,))[0]
-            
-            insert_query = """
-                INSERT INTO market_listings 
-                (location_id, resource_id, current_price, base_price, available_quantity)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            self.db.execute_query(
-                insert_query, 
-                (location_id, resource_id, resource['base_value'], resource['base_value'], amount)
-            )
+        # Single upsert: creates the listing at the resource's base value or adds to it
+        self._add_to_local_markets({(location_id, resource_id): amount})
     
     def log_production(self, site_id, amount, time_delta):
-        """Log production for analytics"""
-        # Implementation details for logging production
-        pass
+        """Log production for analytics
+        
+        Entries are buffered and written together by flush_production_log,
+        which update() calls once per batch of sites.
+        """
+        self._pending_logs.append((site_id, amount, time_delta))
+    
+    def flush_production_log(self):
+        """Write all buffered production log entries in one insert"""
+        if not self._pending_logs:
+            return
+        site_ids, amounts, time_deltas = zip(*self._pending_logs)
+        self._pending_logs = []
+        self.db.execute_query(
+            _Q_INSERT_PRODUCTION_LOG, 
+            (list(site_ids), list(amounts), list(time_deltas))
+        )
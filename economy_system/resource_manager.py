@@ -3,6 +3,9 @@ class ResourceManager:
     def __init__(self, db):
         self.db = db
         self.resources_cache = {}  # For performance
+        # Cached resources grouped by category and by type, kept in step with the cache
+        self._by_category = {}
+        self._by_type = {}
         self.load_resources()
         
     def load_resources(self):
@@ -11,6 +14,17 @@ class ResourceManager:
         resources = self.db.execute_query(query)
         for resource in resources:
             self.resources_cache[resource['id']] = resource
+        
+        # Rebuild the indexes so reloaded rows replace the ones they supersede
+        self._by_category = {}
+        self._by_type = {}
+        for resource in self.resources_cache.values():
+            self._add_to_indexes(resource)
+    
+    def _add_to_indexes(self, resource):
+        """Index a newly cached resource by its category and type"""
+        self._by_category.setdefault(resource['category'], []).append(resource)
+        self._by_type.setdefault(resource['type'], []).append(resource)
     
     def get_resource(self, resource_id):
         """Get resource by ID"""
@@ -21,13 +35,14 @@ class ResourceManager:
         resource = self.db.execute_query(query, (resource_id,))
         if resource:
             self.resources_cache[resource_id] = resource[0]
+            self._add_to_indexes(resource[0])
             return resource[0]
         return None
     
     def get_resources_by_category(self, category):
         """Get all resources of a specific category"""
-        return [r for r in self.resources_cache.values() if r['category'] == category]
+        return list(self._by_category.get(category, ()))
     
     def get_resources_by_type(self, resource_type):
         """Get all resources of a specific type"""
-        return [r for r in self.resources_cache.values() if r['type'] == resource_type]
+        return list(self._by_type.get(resource_type, ()))
@@ -1,3 +1,90 @@
+import random
+
+try:
+    # Optional: vectorized loss rolls for ticks with many arrivals
+    import numpy as np
+    # PCG64 generator that draws each batch's rolls in one call
+    _batch_rng = np.random.default_rng()
+except ImportError:
+    np = None
+
+# Below this many arrivals building arrays costs more than the plain loop saves
+_VECTORIZE_MIN_SHIPMENTS = 512
+
+# Shipment rows carry the two route columns arrival processing needs, so no
+# shipment or route is re-read per arrival. checked_at is the database time the
+# rows were read at, recorded as the arrival time of the whole batch
+_SHIPMENT_WITH_ROUTE_COLUMNS = """
+    SELECT s.*, r.destination_id, r.safety_rating, NOW() AS checked_at
+    FROM shipments s
+    JOIN trade_routes r ON r.id = s.trade_route_id
+"""
+
+# In-transit shipments due by now; served by the idx_shipments_arrival partial index
+_Q_ARRIVED_SHIPMENTS = f"""
+    {_SHIPMENT_WITH_ROUTE_COLUMNS}
+    WHERE s.status = 'in_transit' 
+    AND s.expected_arrival_time <= NOW()
+"""
+
+_Q_SHIPMENT_WITH_ROUTE = f"""
+    {_SHIPMENT_WITH_ROUTE_COLUMNS}
+    WHERE s.id = %s
+"""
+
+_Q_SET_SHIPMENT_STATUS = """
+    UPDATE shipments 
+    SET status = %s,
+        actual_arrival_time = %s
+    WHERE id = ANY(%s::integer[])
+"""
+
+# Inserts one shipment per array element and deducts NPC cargo from the source
+# markets in the same statement. NPC shipments are only inserted when their
+# source market covered the deduction, so no shipment leaves without its goods.
+# Departure and arrival use the database clock, like the arrival query.
+# Deductions are summed per market, since UPDATE ... FROM applies only one joined
+# row to each listing; the listing is found through its (location_id, resource_id) key
+_Q_CREATE_SHIPMENTS = """
+    WITH requested AS (
+        SELECT n.*, r.source_id, r.current_travel_time
+        FROM unnest(%s::integer[], %s::integer[], %s::integer[], %s::text[], %s::integer[])
+            AS n(trade_route_id, resource_id, quantity, owner_type, owner_id)
+        JOIN trade_routes r ON r.id = n.trade_route_id
+    ),
+    npc_deductions AS (
+        SELECT source_id, resource_id, SUM(quantity) AS quantity
+        FROM requested
+        WHERE owner_type = 'npc'
+        GROUP BY source_id, resource_id
+    ),
+    deducted AS (
+        UPDATE market_listings m
+        SET available_quantity = m.available_quantity - d.quantity
+        FROM npc_deductions d
+        WHERE m.location_id = d.source_id AND m.resource_id = d.resource_id
+        AND m.available_quantity >= d.quantity
+        RETURNING m.location_id, m.resource_id
+    ),
+    new_shipments AS (
+        INSERT INTO shipments
+        (trade_route_id, resource_id, quantity, 
+         departure_time, expected_arrival_time, 
+         status, owner_type, owner_id)
+        SELECT q.trade_route_id, q.resource_id, q.quantity, 
+               NOW(), NOW() + q.current_travel_time * INTERVAL '1 hour', 
+               'in_transit', q.owner_type, q.owner_id
+        FROM requested q
+        WHERE q.owner_type <> 'npc'
+        OR EXISTS (
+            SELECT 1 FROM deducted d 
+            WHERE d.location_id = q.source_id AND d.resource_id = q.resource_id
+        )
+        RETURNING id
+    )
+    SELECT id FROM new_shipments
+"""
+
 class TradeManager:
     """Manages trade routes and shipments"""
     def __init__(self, db):
@@ -13,51 +100,32 @@ class TradeManager:
     
     def update_active_shipments(self, time_delta):
         """Move shipments along their routes and process arrivals"""
-        # Get all in-transit shipments
-        query = "SELECT * FROM shipments WHERE status = 'in_transit'"
-        shipments = self.db.execute_query(query)
-        
-        current_time = datetime.now()
-        
-        for shipment in shipments:
-            # Check if shipment has arrived
-            if current_time >= shipment['expected_arrival_time']:
-                # Process arrival
-                self.process_shipment_arrival(shipment['id'])
-            else:
-                # Update progress (for UI purposes if needed)
-                pass
+        # Get the in-transit shipments that have arrived, together with their routes
+        # (progress of the rest is for UI purposes only)
+        arrivals = self.db.execute_query(_Q_ARRIVED_SHIPMENTS)
+        if arrivals:
+            self._process_arrivals(arrivals)
     
     def process_shipment_arrival(self, shipment_id):
         """Process a shipment that has arrived at its destination"""
-        # Get shipment details
-        query = "SELECT * FROM shipments WHERE id = %s"
-        shipment = self.db.execute_query(query, (shipment_id,))[0]
+        # Get shipment and trade route details
+        shipment = self.db.execute_query(_Q_SHIPMENT_WITH_ROUTE, (shipment_id,))[0]
+        self._process_arrivals([shipment])
+    
+    def _process_arrivals(self, shipments):
+        """Resolve arrived shipment rows (joined with their routes) and write the outcomes in bulk"""
+        lost_ids = []
+        delivered = []
+        market_additions = {}
+        # Rows from one query share checked_at
+        arrival_time = shipments[0]['checked_at']
         
-        # Get trade route details
-        route_query = "SELECT * FROM trade_routes WHERE id = %s"
-        route = self.db.execute_query(route_query, (shipment['trade_route_id'],))[0]
+        remaining_quantities = self._remaining_quantities(shipments)
         
-        # Check for mishaps based on route safety
-        # Higher safety = less chance of loss
-        loss_chance = max(5, 100 - route['safety_rating']) / 100
-        
-        if random.random() < loss_chance:
-            # Shipment is lost (partial or complete)
-            loss_percentage = random.uniform(0.3, 1.0)
-            lost_quantity = int(shipment['quantity'] * loss_percentage)
-            remaining_quantity = shipment['quantity'] - lost_quantity
-            
-            # Update shipment status
+        for shipment, remaining_quantity in zip(shipments, remaining_quantities):
             if remaining_quantity <= 0:
                 # Complete loss
-                update_query = """
-                    UPDATE shipments 
-                    SET status = 'lost',
-                        actual_arrival_time = NOW()
-                    WHERE id = %s
-                """
-                self.db.execute_query(update_query, (shipment_id,))
+                lost_ids.append(shipment['id'])
                 
                 # Generate event about lost shipment
                 self.events.create_trade_event("shipment_lost", {
@@ -67,34 +135,65 @@ class TradeManager:
                     'owner_type': shipment['owner_type'],
                     'owner_id': shipment['owner_id']
                 })
-                
-                return
-            else:
-                # Partial loss, continue with reduced quantity
-                shipment['quantity'] = remaining_quantity
+                continue
+            
+            # A partial loss continues with the reduced quantity
+            shipment['quantity'] = remaining_quantity
+            
+            # Successful delivery; shipments bound for the same market are summed
+            delivered.append(shipment)
+            market_key = (shipment['destination_id'], shipment['resource_id'])
+            market_additions[market_key] = market_additions.get(market_key, 0) + shipment['quantity']
         
-        # Process successful delivery
+        # Update shipment statuses, one statement per outcome
+        if lost_ids:
+            self.db.execute_query(_Q_SET_SHIPMENT_STATUS, ('lost', arrival_time, lost_ids))
+        if not delivered:
+            return
         
-        # Add goods to destination market
-        self.market_manager.add_to_local_market(
-            route['destination_id'], 
-            shipment['resource_id'],
-            shipment['quantity']
-        )
+        # Add goods to destination markets
+        for (destination_id, resource_id), quantity in market_additions.items():
+            self.market_manager.add_to_local_market(destination_id, resource_id, quantity)
         
-        # Update shipment status to delivered
-        update_query = """
-            UPDATE shipments 
-            SET status = 'delivered',
-                actual_arrival_time = NOW()
-            WHERE id = %s
-        """
-        self.db.execute_query(update_query, (shipment_id,))
+        self.db.execute_query(
+            _Q_SET_SHIPMENT_STATUS, ('delivered', arrival_time, [shipment['id'] for shipment in delivered])
+        )
         
         # If NPC shipment, pay the NPC entity
-        if shipment['owner_type'] == 'npc':
-            # Calculate payment based on goods value and distance
-            self.pay_npc_for_shipment(shipment)
+        for shipment in delivered:
+            if shipment['owner_type'] == 'npc':
+                # Calculate payment based on goods value and distance
+                self.pay_npc_for_shipment(shipment)
+    
+    def _remaining_quantities(self, shipments):
+        """Quantity of every arrived shipment that survives its route, in order"""
+        if np is None or len(shipments) < _VECTORIZE_MIN_SHIPMENTS:
+            return [
+                self._remaining_quantity(shipment['quantity'], shipment['safety_rating'])
+                for shipment in shipments
+            ]
+        
+        # Same rolls as _remaining_quantity, drawn for whole columns at once
+        count = len(shipments)
+        quantity = np.fromiter((shipment['quantity'] for shipment in shipments), dtype=np.int64, count=count)
+        safety = np.fromiter((shipment['safety_rating'] for shipment in shipments), dtype=np.float64, count=count)
+        loss_chance = np.maximum(5, 100 - safety) / 100
+        lost = _batch_rng.random(count) < loss_chance
+        loss_percentage = _batch_rng.uniform(0.3, 1.0, count)
+        lost_quantity = np.where(lost, (quantity * loss_percentage).astype(np.int64), 0)
+        return (quantity - lost_quantity).tolist()
+    
+    def _remaining_quantity(self, quantity, safety_rating):
+        """Quantity of a shipment that survives a route of the given safety"""
+        # Check for mishaps based on route safety
+        # Higher safety = less chance of loss
+        loss_chance = max(5, 100 - safety_rating) / 100
+        
+        if random.random() < loss_chance:
+            # Shipment is lost (partial or complete)
+            loss_percentage = random.uniform(0.3, 1.0)
+            return quantity - int(quantity * loss_percentage)
+        return quantity
     
     def generate_npc_trade(self, time_delta):
         """Generate new NPC trade shipments based on market needs"""
@@ -106,6 +205,7 @@ class TradeManager:
         query = "SELECT * FROM trade_routes WHERE active = TRUE"
         routes = self.db.execute_query(query)
         
+        shipments = []
         for route in routes:
             # Determine if we should create a shipment on this route
             # Based on time since last shipment, route importance, etc.
@@ -119,57 +219,40 @@ class TradeManager:
                 if profitable_resources:
                     # Pick one resource to ship
                     resource = random.choice(profitable_resources)
-                    
-                    # Create the shipment
-                    self.create_shipment(
-                        trade_route_id=route['id'],
-                        resource_id=resource['id'],
-                        quantity=self._determine_shipment_quantity(resource, route),
-                        owner_type='npc',
-                        owner_id=self._select_merchant_npc(route)
-                    )
+                    shipments.append((
+                        route['id'],
+                        resource['id'],
+                        self._determine_shipment_quantity(resource, route),
+                        'npc',
+                        self._select_merchant_npc(route)
+                    ))
+        
+        # Create all of this tick's shipments in one statement
+        if shipments:
+            self._create_shipments(shipments)
     
     def create_shipment(self, trade_route_id, resource_id, quantity, owner_type, owner_id):
-        """Create a new shipment"""
-        # Get trade route details
-        query = "SELECT * FROM trade_routes WHERE id = %s"
-        route = self.db.execute_query(query, (trade_route_id,))[0]
-        
-        # Calculate expected travel time based on current conditions
-        current_travel_time = route['current_travel_time']
+        """Create a new shipment
         
-        # Calculate departure and arrival times
-        departure_time = datetime.now()
-        expected_arrival_time = departure_time + timedelta(hours=current_travel_time)
-        
-        # Insert the shipment
-        insert_query = """
-            INSERT INTO shipments
-            (trade_route_id, resource_id, quantity, 
-             departure_time, expected_arrival_time, 
-             status, owner_type, owner_id)
-            VALUES (%s, %s, %s, %s, %s, 'in_transit', %s, %s)
-            RETURNING id
+        Returns the new shipment id, or None for an NPC shipment whose source
+        market doesn't have the quantity available.
         """
-        shipment_id = self.db.execute_query(
-            insert_query, 
-            (trade_route_id, resource_id, quantity, 
-             departure_time, expected_arrival_time,
-             owner_type, owner_id)
-        )[0]['id']
-        
-        # Remove resources from source location if this is an NPC shipment
-        if owner_type == 'npc':
-            # Deduct from source market
-            source_market_query = """
-                UPDATE market_listings
-                SET available_quantity = available_quantity - %s
-                WHERE location_id = %s AND resource_id = %s
-                AND available_quantity >= %s
-            """
-            self.db.execute_query(
-                source_market_query,
-                (quantity, route['source_id'], resource_id, quantity)
-            )
+        shipment_ids = self._create_shipments(
+            [(trade_route_id, resource_id, quantity, owner_type, owner_id)]
+        )
+        return shipment_ids[0] if shipment_ids else None
+    
+    def _create_shipments(self, shipments):
+        """Insert (trade_route_id, resource_id, quantity, owner_type, owner_id) shipments
         
-        return shipment_id
+        Travel time comes from each route's current conditions. NPC cargo is
+        removed from the source market, and NPC shipments the market can't supply
+        are not created. Returns the new shipment ids; their order is unspecified
+        when more than one is created.
+        """
+        trade_route_ids, resource_ids, quantities, owner_types, owner_ids = zip(*shipments)
+        rows = self.db.execute_query(
+            _Q_CREATE_SHIPMENTS,
+            (list(trade_route_ids), list(resource_ids), list(quantities), list(owner_types), list(owner_ids))
+        )
+        return [row['id'] for row in rows]
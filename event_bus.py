@@ -5,14 +5,43 @@ This module provides the core event infrastructure for the game engine,
 allowing different systems to communicate via a publish-subscribe pattern.
 It is designed to handle long campaigns with detailed event tracking.
 """
+import atexit
+import heapq
+import itertools
 import json
+import logging
 import os
+import queue
+import threading
 import uuid
 from datetime import datetime
-from typing import Dict, List, Any, Callable, Optional, Union, Set
-from collections import defaultdict
+from time import monotonic, time
+from typing import BinaryIO, Dict, FrozenSet, List, Any, Callable, Optional, Union, Tuple
+from collections import defaultdict, deque
+from itertools import islice
+from operator import itemgetter
 from enum import Enum, auto
 
+# Subscriber and log-writer failures; the bus keeps running after reporting them
+_error_log = logging.getLogger(__name__)
+
+try:
+    # Optional: C JSON codec for the event log
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize an object as a compact, newline-terminated UTF-8 JSON line."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# Both codecs accept bytes, so log lines can be parsed without decoding first
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 class EventType(Enum):
     """Event types for the game engine."""
@@ -91,8 +120,8 @@ class EventType(Enum):
     WARNING = auto()
     INFO = auto()
     
-    # Wildcard for all events
-    WILDCARD = "*"
+    # Wildcard for all events ("*" in from_string)
+    WILDCARD = auto()
     
     @classmethod
     def from_string(cls, event_type_str: str) -> 'EventType':
@@ -108,14 +137,21 @@ class EventType(Enum):
         Raises:
             ValueError: If the string is not a valid EventType
         """
-        if event_type_str == "*":
-            return cls.WILDCARD
-            
-        for event_type in cls:
-            if event_type.name == event_type_str:
-                return event_type
-                
-        raise ValueError(f"Invalid event type: {event_type_str}")
+        event_type = _EVENT_TYPES_BY_NAME.get(event_type_str)
+        if event_type is None:
+            raise ValueError(f"Invalid event type: {event_type_str}")
+        return event_type
+
+
+# Name lookup table for EventType.from_string, including "*" for the wildcard
+_EVENT_TYPES_BY_NAME: Dict[str, EventType] = {event_type.name: event_type for event_type in EventType}
+_EVENT_TYPES_BY_NAME["*"] = EventType.WILDCARD
+
+
+# Event ids are a random per-process prefix plus a counter: unique across runs
+# without drawing a uuid4 for every event
+_EVENT_ID_PREFIX = f"{uuid.uuid4().hex[:16]}-"
+_event_ids = itertools.count()
 
 
 class GameEvent:
@@ -130,8 +166,13 @@ class GameEvent:
         metadata: Additional metadata about the event
         tags: List of tags for categorizing the event
         effects: List of effects resulting from the event
-        timestamp: The time when the event occurred
+        timestamp: The time when the event occurred (ISO 8601, UTC)
+        created_at: The time when the event occurred, in seconds since the epoch
     """
+    # One is built per publish, often thousands a second in combat
+    __slots__ = ("id", "type", "actor", "context", "metadata", "tags", "effects", "game_id", 
+                 "created_at", "_timestamp", "_type_repr", "_dict_cache", "_json_cache")
+    
     def __init__(self, 
                  type: Union[EventType, str], 
                  actor: str, 
@@ -152,7 +193,7 @@ class GameEvent:
             effects: List of effects resulting from the event
             game_id: ID of the game this event belongs to (for multi-game support)
         """
-        self.id = str(uuid.uuid4())
+        self.id = f"{_EVENT_ID_PREFIX}{next(_event_ids):x}"
         
         # Handle string event types for flexibility
         if isinstance(type, str):
@@ -164,6 +205,7 @@ class GameEvent:
                 self.type = type
         else:
             self.type = type
+        self._type_repr = self.type.name if isinstance(self.type, EventType) else str(self.type)
             
         self.actor = actor
         self.context = context or {}
@@ -171,20 +213,59 @@ class GameEvent:
         self.tags = tags or []
         self.effects = effects or []
         self.game_id = game_id
-        self.timestamp = datetime.utcnow().isoformat()
+        self.created_at = time()
+        # The ISO string is only formatted for events that get logged or printed
+        self._timestamp: Optional[str] = None
+        
+        # Built on first use and shared by the logger's history and log file
+        self._dict_cache: Optional[Dict[str, Any]] = None
+        self._json_cache: Optional[bytes] = None
+
+    @property
+    def timestamp(self) -> str:
+        """The time when the event occurred, as an ISO 8601 UTC string."""
+        if self._timestamp is None:
+            self._timestamp = datetime.utcfromtimestamp(self.created_at).isoformat()
+        return self._timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value: str) -> None:
+        self._timestamp = value
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the event to a dictionary representation.
         
+        The dictionary is built once and returned on every later call.
+        
         Returns:
             Dictionary representation of the event
         """
-        type_repr = self.type.name if isinstance(self.type, EventType) else str(self.type)
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize the event as one newline-terminated JSON line.
         
+        Returns:
+            UTF-8 encoded JSON line, computed once per event
+        """
+        if self._json_cache is None:
+            self._json_cache = _dumps_line(self.to_dict())
+        return self._json_cache
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        """
+        Build the dictionary representation of the event.
+        
+        Returns:
+            Dictionary representation of the event
+        """
         return {
             "id": self.id,
-            "type": type_repr,
+            "type": self._type_repr,
             "actor": self.actor,
             "context": self.context,
             "metadata": self.metadata,
@@ -201,7 +282,7 @@ class GameEvent:
         Returns:
             A summary dictionary with essential information
         """
-        type_repr = self.type.name if isinstance(self.type, EventType) else str(self.type)
+        type_repr = self._type_repr
         
         # Create a basic summary string based on type and context
         if "location" in self.context:
@@ -228,21 +309,35 @@ class GameEvent:
     
     def __str__(self) -> str:
         """String representation of the event."""
-        type_repr = self.type.name if isinstance(self.type, EventType) else str(self.type)
-        return (f"GameEvent({type_repr}, actor={self.actor}, "
+        return (f"GameEvent({self._type_repr}, actor={self.actor}, "
                 f"context={self.context}, tags={self.tags}, timestamp={self.timestamp})")
 
 
+# Context entries shown in EventLogger.get_summary lines, in display order
+_SUMMARY_CONTEXT_KEYS = ("location", "target", "result", "amount")
+
+
 class EventLogger:
     """
     Logger for game events with persistence capabilities.
     
     Attributes:
-        history: List of events that have been logged
+        history: Ring buffer of the most recent logged events
+            (except those of reserved types)
         max_history: Maximum number of events to keep in memory
         log_to_file: Whether to log events to a file
         log_dir: Directory for log files
     """
+    # High-frequency types kept in their own small lanes by default, so combat
+    # floods cannot evict rarer milestones from the main history
+    HOT_EVENT_TYPES = (EventType.ATTACK_PERFORMED, EventType.DAMAGE_DEALT, EventType.DAMAGE_TAKEN)
+    HOT_EVENT_HISTORY = 256
+    
+    # Maximum lines the writer thread gathers into one batch
+    WRITE_BATCH_EVENTS = 128
+    # How long the writer thread waits for more lines before writing a batch
+    WRITE_BATCH_SECONDS = 0.01
+    
     def __init__(self, 
                  max_history: int = 1000, 
                  log_to_file: bool = True,
@@ -255,14 +350,37 @@ class EventLogger:
             log_to_file: Whether to log events to a file
             log_dir: Directory for log files
         """
-        self.history: List[Dict[str, Any]] = []
+        self.history: deque = deque(maxlen=max_history)
         self.max_history = max_history
         self.log_to_file = log_to_file
         self.log_dir = log_dir
         
+        # Inverted indexes over history: key -> deque of (sequence, event dict)
+        # in log order. _index_records holds, in step with history, the
+        # (index, key) pairs of each event so eviction can unindex it.
+        self._by_type: Dict[str, deque] = {}
+        self._by_actor: Dict[str, deque] = {}
+        self._by_game_id: Dict[Optional[str], deque] = {}
+        self._by_tag: Dict[str, deque] = {}
+        self._index_records: deque = deque()
+        self._sequence = 0
+        
+        # Reserved lanes: type name -> ring buffer holding only that type
+        self._reserved: Dict[str, deque] = {}
+        for event_type in self.HOT_EVENT_TYPES:
+            self.set_reserved(event_type, self.HOT_EVENT_HISTORY)
+        
+        # Serialized lines are queued for a writer thread that owns the log files
+        self._write_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._file_handles: Dict[str, BinaryIO] = {}
+        self._log_paths: Dict[Optional[str], str] = {}
+        
         # Create log directory if it doesn't exist
-        if self.log_to_file and not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir, exist_ok=True)
+        if self.log_to_file:
+            if not os.path.exists(self.log_dir):
+                os.makedirs(self.log_dir, exist_ok=True)
+            atexit.register(self.close)
 
     def log(self, event: GameEvent) -> None:
         """
@@ -271,35 +389,219 @@ class EventLogger:
         Args:
             event: The event to log
         """
-        event_dict = event.to_dict()
-        self.history.append(event_dict)
-        
-        # Trim history if it exceeds max size
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
+        self._store(event.to_dict())
         
         # Write to file if enabled
         if self.log_to_file:
             self._write_to_file(event)
     
+    def _store(self, event_dict: Dict[str, Any]) -> None:
+        """
+        Keep an event in its reserved lane, or else in the main history.
+        
+        Args:
+            event_dict: The event to keep
+        """
+        lane = self._reserved.get(event_dict.get("type"))
+        if lane is not None:
+            lane.append(event_dict)
+            return
+            
+        # The deque drops the oldest event once max_history is reached
+        if self.max_history > 0:
+            if len(self.history) == self.max_history:
+                self._unindex_oldest()
+            self.history.append(event_dict)
+            self._index(event_dict)
+    
+    def set_reserved(self, event_type: Union[EventType, str], size: int) -> None:
+        """
+        Keep events of a type in their own ring buffer instead of the main history.
+        
+        Events already in the main history stay there.
+        
+        Args:
+            event_type: The event type to reserve a lane for
+            size: Number of events of this type to keep; 0 or less removes the
+                lane, so new events of the type go to the main history again
+        """
+        type_name = event_type.name if isinstance(event_type, EventType) else str(event_type)
+        if size <= 0:
+            self._reserved.pop(type_name, None)
+        else:
+            self._reserved[type_name] = deque(self._reserved.get(type_name, ()), maxlen=size)
+    
+    def _index(self, event_dict: Dict[str, Any]) -> None:
+        """
+        Add a logged event to the inverted indexes.
+        
+        Args:
+            event_dict: The event as stored in history
+        """
+        item = (self._sequence, event_dict)
+        self._sequence += 1
+        
+        record = [
+            (self._by_type, event_dict.get("type")),
+            (self._by_actor, event_dict.get("actor")),
+            (self._by_game_id, event_dict.get("game_id")),
+        ]
+        record.extend((self._by_tag, tag) for tag in set(event_dict.get("tags", ())))
+        
+        for index, key in record:
+            bucket = index.get(key)
+            if bucket is None:
+                index[key] = bucket = deque()
+            bucket.append(item)
+        self._index_records.append(record)
+        
+    def _unindex_oldest(self) -> None:
+        """Remove the oldest event in history from the inverted indexes."""
+        # The oldest event overall is also the oldest in each of its buckets
+        for index, key in self._index_records.popleft():
+            bucket = index[key]
+            bucket.popleft()
+            if not bucket:
+                del index[key]
+                
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the inverted indexes from history."""
+        for index in (self._by_type, self._by_actor, self._by_game_id, self._by_tag):
+            index.clear()
+        self._index_records.clear()
+        for event_dict in self.history:
+            self._index(event_dict)
+            
+    def _log_file_path(self, game_id: Optional[str]) -> str:
+        """
+        Get the log file path for a game.
+        
+        Args:
+            game_id: Optional game ID
+            
+        Returns:
+            Path of the game's log file, or the shared log file without a game ID
+        """
+        log_file = self._log_paths.get(game_id)
+        if log_file is None:
+            if game_id:
+                log_file = os.path.join(self.log_dir, f"game_{game_id}.jsonl")
+            else:
+                log_file = os.path.join(self.log_dir, "events.jsonl")
+            self._log_paths[game_id] = log_file
+        return log_file
+    
     def _write_to_file(self, event: GameEvent) -> None:
         """
-        Write an event to a log file.
+        Queue an event for the writer thread.
+        
+        The event is serialized here, from the dict already built for history,
+        so later changes to it are not logged and the writer thread only
+        handles (path, bytes) pairs.
         
         Args:
             event: The event to write
         """
         try:
-            # Determine file path based on game_id if available
-            if event.game_id:
-                log_file = os.path.join(self.log_dir, f"game_{event.game_id}.jsonl")
-            else:
-                log_file = os.path.join(self.log_dir, "events.jsonl")
+            line = event.to_json_bytes()
+        except Exception:
+            # Logging must never stop an event from being published
+            _error_log.exception("Error serializing event %s for the log file", event.id)
+            return
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, 
+                                            name="event-log-writer", daemon=True)
+            self._writer.start()
+        self._write_queue.put((self._log_file_path(event.game_id), line))
+        
+    def _writer_loop(self) -> None:
+        """
+        Drain the write queue in batches until close() is called.
+        
+        Queue items are (log_file, line) pairs; a threading.Event asks for a
+        flush and None stops the thread.
+        """
+        get = self._write_queue.get
+        while True:
+            item = get()
+            batch = []
+            deadline = monotonic() + self.WRITE_BATCH_SECONDS
+            # Keep gathering lines until the batch is full, the window closes
+            # or a control item arrives
+            while isinstance(item, tuple):
+                batch.append(item)
+                item = False
+                timeout = deadline - monotonic()
+                if len(batch) >= self.WRITE_BATCH_EVENTS or timeout <= 0:
+                    break
+                try:
+                    item = get(timeout=timeout)
+                except queue.Empty:
+                    break
+                    
+            if batch:
+                self._write_batch(batch)
                 
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event.to_dict()) + "\n")
-        except Exception as e:
-            print(f"Error writing event to log file: {e}")
+            if isinstance(item, threading.Event):
+                self._sync_files()
+                item.set()
+            elif item is None:
+                self._sync_files()
+                for handle in self._file_handles.values():
+                    handle.close()
+                self._file_handles.clear()
+                return
+    def _write_batch(self, batch: List[tuple]) -> None:
+        """
+        Write a batch of queued lines, one write per log file.
+        
+        Args:
+            batch: (log_file, line) pairs in the order they were queued
+        """
+        lines_by_file = defaultdict(list)
+        for log_file, line in batch:
+            lines_by_file[log_file].append(line)
+            
+        for log_file, lines in lines_by_file.items():
+            try:
+                handle = self._file_handles.get(log_file)
+                if handle is None:
+                    # Unbuffered: each batch already goes out as a single write
+                    fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    handle = os.fdopen(fd, "ab", buffering=0)
+                    self._file_handles[log_file] = handle
+                handle.write(b"".join(lines))
+            except Exception:
+                _error_log.exception("Error writing events to log file %s", log_file)
+                
+    def _sync_files(self) -> None:
+        """Sync the open log files to disk."""
+        for handle in self._file_handles.values():
+            try:
+                os.fsync(handle.fileno())
+            except Exception:
+                _error_log.exception("Error flushing event log file")
+                
+    def flush(self) -> None:
+        """Wait until every queued event is written and synced to disk."""
+        if self._writer is None:
+            return
+        done = threading.Event()
+        self._write_queue.put(done)
+        done.wait()
+        
+    def close(self) -> None:
+        """
+        Write out queued events, stop the writer thread and close the log files.
+        
+        Logging again afterwards starts a new writer thread.
+        """
+        writer = self._writer
+        if writer is None:
+            return
+        self._writer = None
+        self._write_queue.put(None)
+        writer.join()
         
     def get_history(self, 
                     event_types: Optional[List[Union[EventType, str]]] = None, 
@@ -320,13 +622,110 @@ class EventLogger:
         Returns:
             Filtered list of events
         """
-        filtered_history = self.history
+        event_type_names = [
+            et.name if isinstance(et, EventType) else str(et) 
+            for et in event_types or ()
+        ]
         
-        if event_types:
-            event_type_names = [
-                et.name if isinstance(et, EventType) else str(et) 
-                for et in event_types
-            ]
+        # Reserved lanes only hold their own type, so skip those a type filter excludes
+        lanes = [
+            lane for type_name, lane in self._reserved.items()
+            if lane and (not event_types or type_name in event_type_names)
+        ]
+        if not lanes:
+            return self._get_main_history(event_type_names, actor, game_id, tags, limit)
+        
+        # Interleave the matching lane events back into log order
+        runs = [self._get_main_history(event_type_names, actor, game_id, tags, None)]
+        runs.extend(
+            self._apply_filters(list(lane), event_type_names, actor, game_id, tags) 
+            for lane in lanes
+        )
+        filtered_history = list(heapq.merge(*runs, key=itemgetter("timestamp")))
+        
+        if limit and limit > 0:
+            filtered_history = filtered_history[-limit:]
+            
+        return filtered_history
+    
+    def _get_main_history(self, 
+                          event_type_names: List[str], 
+                          actor: Optional[str],
+                          game_id: Optional[str],
+                          tags: Optional[List[str]],
+                          limit: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Get filtered events from the main history, leaving out reserved lanes.
+        
+        Args:
+            event_type_names: Names of the event types to keep (empty keeps all)
+            actor: Optional filter for actor
+            game_id: Optional filter for game ID
+            tags: Optional filter for tags
+            limit: Optional limit on number of events returned
+            
+        Returns:
+            Filtered list of events
+        """
+        if not (event_type_names or actor or game_id or tags):
+            # Unfiltered: walk back from the newest entry instead of copying everything
+            if limit and limit > 0:
+                recent = list(islice(reversed(self.history), limit))
+                recent.reverse()
+                return recent
+            return list(self.history)
+        
+        # Start from the smallest matching index instead of scanning all history
+        candidate_filters = []
+        if event_type_names:
+            candidate_filters.append((self._by_type, event_type_names))
+        if actor:
+            candidate_filters.append((self._by_actor, [actor]))
+        if game_id:
+            candidate_filters.append((self._by_game_id, [game_id]))
+        if tags:
+            candidate_filters.append((self._by_tag, tags))
+        index, keys = min(candidate_filters, 
+                          key=lambda f: sum(len(f[0].get(k, ())) for k in set(f[1])))
+        buckets = [index[k] for k in set(keys) if k in index]
+        if len(buckets) == 1:
+            filtered_history = [e for _, e in buckets[0]]
+        else:
+            # Merge several buckets back into log order, dropping duplicates
+            merged = {}
+            for bucket in buckets:
+                merged.update(bucket)
+            filtered_history = [merged[seq] for seq in sorted(merged)]
+        
+        filtered_history = self._apply_filters(filtered_history, event_type_names, actor, game_id, tags)
+            
+        if limit and limit > 0:
+            filtered_history = filtered_history[-limit:]
+            
+        return filtered_history
+    
+    @staticmethod
+    def _apply_filters(events: List[Dict[str, Any]], 
+                       event_type_names: List[str], 
+                       actor: Optional[str],
+                       game_id: Optional[str],
+                       tags: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """
+        Keep the events that pass every given filter.
+        
+        Args:
+            events: Events to filter, in log order
+            event_type_names: Names of the event types to keep (empty keeps all)
+            actor: Optional filter for actor
+            game_id: Optional filter for game ID
+            tags: Optional filter for tags (event must have at least one of these tags)
+            
+        Returns:
+            The matching events, in log order
+        """
+        filtered_history = events
+        
+        if event_type_names:
             filtered_history = [
                 e for e in filtered_history 
                 if e["type"] in event_type_names
@@ -345,14 +744,12 @@ class EventLogger:
             ]
             
         if tags:
+            tag_set = set(tags)
             filtered_history = [
                 e for e in filtered_history 
-                if any(tag in e.get("tags", []) for tag in tags)
+                if not tag_set.isdisjoint(e.get("tags", ()))
             ]
             
-        if limit and limit > 0:
-            filtered_history = filtered_history[-limit:]
-            
         return filtered_history
     
     def get_summary(self, 
@@ -379,11 +776,11 @@ class EventLogger:
         
         # Create a narrative summary
         summary_lines = []
+        now = datetime.utcnow()
+        parse_timestamp = datetime.fromisoformat
         for event in events:
             # Convert timestamp to relative time (like "2 hours ago")
-            timestamp = datetime.fromisoformat(event["timestamp"])
-            now = datetime.utcnow()
-            delta = now - timestamp
+            delta = now - parse_timestamp(event["timestamp"])
             
             if delta.days > 0:
                 time_str = f"{delta.days} days ago"
@@ -398,17 +795,12 @@ class EventLogger:
             type_str = event["type"]
             actor_str = event["actor"]
             
-            if "context" in event:
-                context_items = []
-                for key, value in event["context"].items():
-                    if key in ["location", "target", "result", "amount"]:
-                        context_items.append(f"{key}={value}")
-                
-                context_str = ", ".join(context_items)
-                if context_str:
-                    summary_line = f"{time_str}: {actor_str} {type_str} ({context_str})"
-                else:
-                    summary_line = f"{time_str}: {actor_str} {type_str}"
+            context = event.get("context")
+            context_str = ", ".join(
+                f"{key}={context[key]}" for key in _SUMMARY_CONTEXT_KEYS if key in context
+            ) if context else ""
+            if context_str:
+                summary_line = f"{time_str}: {actor_str} {type_str} ({context_str})"
             else:
                 summary_line = f"{time_str}: {actor_str} {type_str}"
                 
@@ -426,35 +818,36 @@ class EventLogger:
         Returns:
             Number of events loaded
         """
-        if game_id:
-            log_file = os.path.join(self.log_dir, f"game_{game_id}.jsonl")
-        else:
-            log_file = os.path.join(self.log_dir, "events.jsonl")
+        # Make sure events still in the write buffer are on disk
+        self.flush()
+        log_file = self._log_file_path(game_id)
             
         if not os.path.exists(log_file):
             return 0
             
         loaded_events = []
         try:
-            with open(log_file, "r", encoding="utf-8") as f:
+            with open(log_file, "rb") as f:
                 for line in f:
                     if line.strip():
-                        loaded_events.append(json.loads(line))
+                        loaded_events.append(_loads(line))
         except Exception as e:
             print(f"Error loading events from log file: {e}")
             return 0
             
-        # Replace current history with loaded events (up to max_history)
-        if len(loaded_events) > self.max_history:
-            self.history = loaded_events[-self.max_history:]
-        else:
-            self.history = loaded_events
+        # Replace current history with loaded events (up to max_history per store)
+        self.clear()
+        for event_dict in loaded_events:
+            self._store(event_dict)
             
         return len(loaded_events)
     
     def clear(self) -> None:
         """Clear all event history in memory."""
-        self.history = []
+        self.history.clear()
+        for lane in self._reserved.values():
+            lane.clear()
+        self._rebuild_indexes()
 
 
 class GameEventBus:
@@ -462,9 +855,17 @@ class GameEventBus:
     Event bus for game events using a publish-subscribe pattern.
     
     Attributes:
-        subscribers: Dictionary mapping event types to callbacks
+        subscribers: Dictionary mapping event types to tuples of callbacks
+        batch_subscribers: Dictionary mapping event types to tuples of callbacks
+            that receive a list of events at a time
         logger: Logger for events published to the bus
     """
+    # Number of queued batched events that triggers an automatic flush
+    BATCH_FLUSH_SIZE = 256
+    # Subscriber error reports allowed in a burst, and refilled per second
+    SUBSCRIBER_ERROR_BURST = 100
+    SUBSCRIBER_ERROR_RATE = 10.0
+    
     def __init__(self, 
                 max_history: int = 1000, 
                 log_to_file: bool = True,
@@ -477,11 +878,25 @@ class GameEventBus:
             log_to_file: Whether to log events to a file
             log_dir: Directory for log files
         """
-        self.subscribers = defaultdict(list)
+        # Callback tuples are rebuilt on (un)subscribe so publishing never
+        # inserts keys or copies lists. Rebuilds hold _subscribe_lock; publish
+        # reads without locking, since swapping one dict value is atomic
+        self.subscribers: Dict[Any, Tuple[Callable, ...]] = {}
+        self.batch_subscribers: Dict[Any, Tuple[Callable, ...]] = {}
+        self._subscribe_lock = threading.Lock()
         self.logger = EventLogger(max_history, log_to_file, log_dir)
         
+        # Events queued by publish_batched, delivered in order on the next flush
+        self._pending_events: List[GameEvent] = []
+        
+        # Token bucket limiting how many subscriber errors get logged
+        self._error_tokens = float(self.SUBSCRIBER_ERROR_BURST)
+        self._error_refilled = monotonic()
+        self._suppressed_errors = 0
+        
         # Set of event types to explicitly not log (for high-frequency events)
-        self.excluded_from_logging: Set[EventType] = set()
+        # Replaced rather than mutated, so publishers never see it change size
+        self.excluded_from_logging: FrozenSet[EventType] = frozenset()
 
     def subscribe(self, 
                  event_type: Union[EventType, str], 
@@ -501,7 +916,8 @@ class GameEventBus:
                 # Keep as string for custom event types
                 pass
                 
-        self.subscribers[event_type].append(callback)
+        with self._subscribe_lock:
+            self.subscribers[event_type] = self.subscribers.get(event_type, ()) + (callback,)
         
     def unsubscribe(self, 
                    event_type: Union[EventType, str], 
@@ -524,10 +940,81 @@ class GameEventBus:
                 # Keep as string for custom event types
                 pass
                 
-        if event_type in self.subscribers and callback in self.subscribers[event_type]:
-            self.subscribers[event_type].remove(callback)
-            return True
-        return False
+        with self._subscribe_lock:
+            return self._remove_callback(self.subscribers, event_type, callback)
+    
+    def subscribe_batch(self, 
+                       event_type: Union[EventType, str], 
+                       callback: Callable[[List[GameEvent]], None]) -> None:
+        """
+        Subscribe to an event type with a callback that handles lists of events.
+        
+        Batched events are delivered together when the queue is flushed; events
+        published with publish() are delivered as a single-item list.
+        
+        Args:
+            event_type: The event type to subscribe to (EventType enum or string)
+            callback: The callback to invoke with the events of this type
+        """
+        # Convert string event types to enum if possible
+        if isinstance(event_type, str):
+            try:
+                event_type = EventType.from_string(event_type)
+            except ValueError:
+                # Keep as string for custom event types
+                pass
+                
+        with self._subscribe_lock:
+            self.batch_subscribers[event_type] = self.batch_subscribers.get(event_type, ()) + (callback,)
+        
+    def unsubscribe_batch(self, 
+                         event_type: Union[EventType, str], 
+                         callback: Callable[[List[GameEvent]], None]) -> bool:
+        """
+        Unsubscribe a batch callback from an event type.
+        
+        Args:
+            event_type: The event type to unsubscribe from
+            callback: The callback to remove
+            
+        Returns:
+            True if the callback was removed, False otherwise
+        """
+        # Convert string event types to enum if possible
+        if isinstance(event_type, str):
+            try:
+                event_type = EventType.from_string(event_type)
+            except ValueError:
+                # Keep as string for custom event types
+                pass
+                
+        with self._subscribe_lock:
+            return self._remove_callback(self.batch_subscribers, event_type, callback)
+    
+    @staticmethod
+    def _remove_callback(registry: Dict[Any, Tuple[Callable, ...]], 
+                         event_type: Union[EventType, str], 
+                         callback: Callable) -> bool:
+        """
+        Remove the first matching callback from a subscriber registry.
+        
+        Args:
+            registry: Mapping of event types to callback tuples
+            event_type: The event type to remove the callback from
+            callback: The callback to remove
+            
+        Returns:
+            True if the callback was removed, False otherwise
+        """
+        callbacks = list(registry.get(event_type, ()))
+        if callback not in callbacks:
+            return False
+        callbacks.remove(callback)
+        if callbacks:
+            registry[event_type] = tuple(callbacks)
+        else:
+            del registry[event_type]
+        return True
         
     def exclude_from_logging(self, event_type: EventType) -> None:
         """
@@ -536,7 +1023,7 @@ class GameEventBus:
         Args:
             event_type: The event type to exclude from logging
         """
-        self.excluded_from_logging.add(event_type)
+        self.excluded_from_logging = self.excluded_from_logging | {event_type}
         
     def include_in_logging(self, event_type: EventType) -> None:
         """
@@ -546,37 +1033,152 @@ class GameEventBus:
             event_type: The event type to include in logging
         """
         if event_type in self.excluded_from_logging:
-            self.excluded_from_logging.remove(event_type)
+            self.excluded_from_logging = self.excluded_from_logging - {event_type}
 
+    def has_listeners(self, event_type: Union[EventType, str]) -> bool:
+        """
+        Check whether publishing an event of this type would have any effect.
+        
+        An event type has listeners if it has regular, batch or wildcard
+        subscribers, or if events of that type are logged. Publishers can use
+        this to skip building events nobody will see.
+        
+        Args:
+            event_type: The event type to check
+            
+        Returns:
+            True if an event of this type would be delivered or logged
+        """
+        if event_type not in self.excluded_from_logging:
+            return True
+        return bool(self.subscribers.get(event_type) or 
+                    self.batch_subscribers.get(event_type) or 
+                    self.subscribers.get(EventType.WILDCARD))
+        
     def publish(self, event: GameEvent) -> None:
         """
         Publish an event to all subscribers.
         
+        Any queued batched events are delivered first so subscribers observe
+        events in the order they were published.
+        
         Args:
             event: The event to publish
         """
-        # Log the event if it's not excluded
-        if not (isinstance(event.type, EventType) and event.type in self.excluded_from_logging):
-            self.logger.log(event)
+        if self._pending_events:
+            self.flush_batched()
+            
+        self._dispatch(event)
+        self._notify_batch_subscribers(event.type, [event])
+        
+    def publish_batched(self, event: GameEvent) -> None:
+        """
+        Queue a high-frequency event for delivery on the next flush.
+        
+        The queue is flushed by flush_batched(), by the next publish() call, or
+        automatically once it holds BATCH_FLUSH_SIZE events.
+        
+        Args:
+            event: The event to queue
+        """
+        self._pending_events.append(event)
+        if len(self._pending_events) >= self.BATCH_FLUSH_SIZE:
+            self.flush_batched()
+            
+    def flush_batched(self) -> int:
+        """
+        Deliver all queued batched events.
+        
+        Each event is logged and passed to regular subscribers in order; batch
+        subscribers then receive all queued events of their type in one call.
         
-        # Get actual type for lookup
+        Returns:
+            Number of events delivered
+        """
+        pending = self._pending_events
+        if not pending:
+            return 0
+        # Swap the queue out first so subscribers may publish while we deliver
+        self._pending_events = []
+        
+        events_by_type = defaultdict(list)
+        for event in pending:
+            self._dispatch(event)
+            events_by_type[event.type].append(event)
+            
+        for event_type, events in events_by_type.items():
+            self._notify_batch_subscribers(event_type, events)
+            
+        return len(pending)
+        
+    def _notify_batch_subscribers(self, 
+                                  event_type: Union[EventType, str], 
+                                  events: List[GameEvent]) -> None:
+        """
+        Pass a list of events of one type to its batch subscribers.
+        
+        Args:
+            event_type: The type shared by all the events
+            events: The events to deliver
+        """
+        for callback in self.batch_subscribers.get(event_type, ()):
+            try:
+                callback(events)
+            except Exception:
+                self._report_subscriber_error("Error in batch event subscriber")
+                
+    def _dispatch(self, event: GameEvent) -> None:
+        """
+        Log an event and notify its regular and wildcard subscribers.
+        
+        Args:
+            event: The event to deliver
+        """
         event_type = event.type
         
+        # Log the event if it's not excluded
+        if event_type not in self.excluded_from_logging:
+            self.logger.log(event)
+        
         # Notify type-specific subscribers
-        for callback in self.subscribers[event_type]:
+        for callback in self.subscribers.get(event_type, ()):
             try:
                 callback(event)
-            except Exception as e:
-                print(f"Error in event subscriber: {e}")
+            except Exception:
+                self._report_subscriber_error("Error in event subscriber")
                 
-        # Notify wildcard subscribers if we have any
-        wildcard = EventType.WILDCARD if isinstance(event_type, EventType) else "*"
-        for callback in self.subscribers[wildcard]:
+        # Notify wildcard subscribers if we have any (custom string types included)
+        for callback in self.subscribers.get(EventType.WILDCARD, ()):
             try:
                 callback(event)
-            except Exception as e:
-                print(f"Error in wildcard event subscriber: {e}")
+            except Exception:
+                self._report_subscriber_error("Error in wildcard event subscriber")
                 
+    def _report_subscriber_error(self, message: str) -> None:
+        """
+        Log the exception being handled, unless subscriber errors are flooding.
+        
+        A token bucket allows bursts of SUBSCRIBER_ERROR_BURST reports, refilled
+        at SUBSCRIBER_ERROR_RATE per second; the next report after a quiet spell
+        says how many were suppressed. Must be called from an except block.
+        
+        Args:
+            message: Description of the failing subscriber kind
+        """
+        now = monotonic()
+        self._error_tokens = min(self.SUBSCRIBER_ERROR_BURST, 
+                                 self._error_tokens + (now - self._error_refilled) * self.SUBSCRIBER_ERROR_RATE)
+        self._error_refilled = now
+        if self._error_tokens < 1:
+            self._suppressed_errors += 1
+            return
+        self._error_tokens -= 1
+        
+        if self._suppressed_errors:
+            message = f"{message} ({self._suppressed_errors} earlier subscriber errors suppressed)"
+            self._suppressed_errors = 0
+        _error_log.exception(message)
+        
     def get_history(self, 
                     event_types: Optional[List[Union[EventType, str]]] = None, 
                     actor: Optional[str] = None,
@@ -628,6 +1230,15 @@ class GameEventBus:
             Number of events loaded
         """
         return self.logger.load_from_file(game_id)
+    
+    def flush_log(self) -> None:
+        """Wait until every logged event has been written to the log files."""
+        self.logger.flush()
+        
+    def close(self) -> None:
+        """Deliver queued batched events and stop the logger's writer thread."""
+        self.flush_batched()
+        self.logger.close()
 
 
 # Global event bus instance
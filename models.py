@@ -1,10 +1,17 @@
 from enum import Enum, auto
-from typing import Dict, List, Optional, Union, Set
+from collections import deque
+from typing import Deque, Dict, List, Optional, Union, Set
 from pydantic import BaseModel, Field, validator
+import heapq
+import random
 import uuid
 from datetime import datetime
 
 
+# Dedicated generator for dice rolls, kept apart from the global random state
+_RNG = random.Random()
+
+
 class DomainType(str, Enum):
     """Enumeration of the seven domains of life"""
     BODY = "body"         # Physical health, stamina, manual labor, illness resistance
@@ -16,6 +23,10 @@ class DomainType(str, Enum):
     AWARENESS = "awareness" # Perception, reaction time, timing in social or combat interactions
 
 
+# Members of DomainType, resolved once for per-character checks
+_DOMAIN_TYPES = tuple(DomainType)
+
+
 class TagCategory(str, Enum):
     """Categories of tags for organizing them"""
     COMBAT = "combat"     # Combat-related tags
@@ -58,6 +69,25 @@ class GrowthTier(str, Enum):
     PARAGON = "paragon"     # Range 10+
 
 
+# The growth log keeps this many entries per success required for the next level
+_GROWTH_LOG_WINDOW = 2
+
+# Growth tier for each domain value 0-10; values above 10 use the last (Paragon) entry
+_TIER_TABLE = (
+    GrowthTier.NOVICE, GrowthTier.NOVICE, GrowthTier.NOVICE,
+    GrowthTier.SKILLED, GrowthTier.SKILLED,
+    GrowthTier.EXPERT, GrowthTier.EXPERT, GrowthTier.EXPERT,
+    GrowthTier.MASTER, GrowthTier.MASTER,
+    GrowthTier.PARAGON,
+)
+_MAX_TIER_VALUE = len(_TIER_TABLE) - 1
+
+
+def tier_for_value(value: int) -> GrowthTier:
+    """Get the growth tier of a domain value (values below 0 count as 0)"""
+    return _TIER_TABLE[min(max(value, 0), _MAX_TIER_VALUE)]
+
+
 class GrowthLogEntry(BaseModel):
     """An entry in the domain growth log"""
     date: datetime = Field(default_factory=datetime.now)
@@ -76,21 +106,27 @@ class Domain(BaseModel):
     growth_points: int = Field(default=0, description="Points accumulated toward next value increase")
     growth_required: int = Field(default=100, description="Points required for next value increase")
     usage_count: int = Field(default=0, description="How often this domain is used")
-    growth_log: List[GrowthLogEntry] = Field(default_factory=list, description="Log of growth events")
     level_ups_required: int = Field(default=8, description="Number of log entries required for level up")
+    growth_log: Deque[GrowthLogEntry] = Field(default_factory=deque, description="Log of growth events")
+    success_count: int = Field(default=0, description="Number of successful entries in the growth log")
+    
+    @validator('growth_log', always=True)
+    def bound_growth_log(cls, growth_log, values):
+        """Keep only the most recent entries the next level up can draw on"""
+        level_ups_required = values.get('level_ups_required', 8)
+        return deque(growth_log, maxlen=level_ups_required * _GROWTH_LOG_WINDOW)
+    
+    @validator('success_count', always=True)
+    def count_successes(cls, success_count, values):
+        """Derive the success count from the growth log so stored data stays consistent"""
+        growth_log = values.get('growth_log')
+        if growth_log is None:
+            return success_count
+        return sum(1 for e in growth_log if e.success)
     
     def get_tier(self) -> GrowthTier:
         """Get the current growth tier based on value"""
-        if self.value <= 2:
-            return GrowthTier.NOVICE
-        elif self.value <= 4:
-            return GrowthTier.SKILLED
-        elif self.value <= 7:
-            return GrowthTier.EXPERT
-        elif self.value <= 9:
-            return GrowthTier.MASTER
-        else:
-            return GrowthTier.PARAGON
+        return tier_for_value(self.value)
     
     def add_growth_log_entry(self, action: str, success: bool) -> bool:
         """Add a growth log entry and check for level up
@@ -108,20 +144,33 @@ class Domain(BaseModel):
             action=action,
             success=success
         )
-        self.growth_log.append(entry)
+        growth_log = self.growth_log
+        if len(growth_log) == growth_log.maxlen and growth_log[0].success:
+            # The append below evicts the oldest entry
+            self.success_count -= 1
+        growth_log.append(entry)
+        if success:
+            self.success_count += 1
         
         # Check if we have enough entries for a level up
-        successful_entries = [e for e in self.growth_log if e.success]
-        if len(successful_entries) >= self.level_ups_required:
+        required = self.level_ups_required
+        if self.success_count >= required:
             # Level up
             self.value += 1
             
             # Increase the required number of entries for next level
             self.level_ups_required += 1
             
-            # Remove the entries we used for this level up
-            # Keep the most recent ones that weren't used
-            self.growth_log = self.growth_log[self.level_ups_required - 1:]
+            # Remove the entries we used for this level up: everything up to
+            # the success that completed it. Later entries count toward the next level
+            consumed = 0
+            while consumed < required:
+                if growth_log.popleft().success:
+                    consumed += 1
+            self.success_count -= required
+            
+            # Widen the window along with the requirement
+            self.growth_log = deque(growth_log, maxlen=self.level_ups_required * _GROWTH_LOG_WINDOW)
             
             return True
         return False
@@ -140,6 +189,11 @@ class Domain(BaseModel):
         return level_up
 
 
+def _default_domains() -> Dict[DomainType, Domain]:
+    """All seven domains at their default values"""
+    return {domain_type: Domain(type=domain_type) for domain_type in _DOMAIN_TYPES}
+
+
 class Character(BaseModel):
     """Character model with domains and tags"""
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -148,7 +202,7 @@ class Character(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now)
     
     # Core domains
-    domains: Dict[DomainType, Domain] = Field(default_factory=dict)
+    domains: Dict[DomainType, Domain] = Field(default_factory=_default_domains)
     
     # Character tags/skills
     tags: Dict[str, Tag] = Field(default_factory=dict)
@@ -156,11 +210,13 @@ class Character(BaseModel):
     # Track domain usage history for the "drift" mechanic
     domain_history: Dict[DomainType, List[int]] = Field(default_factory=dict)
     
-    @validator('domains', pre=True, always=True)
+    @validator('domains', pre=True)
     def set_domains(cls, domains):
-        """Ensure all domains exist with default values"""
+        """Ensure all domains of provided data exist, adding missing ones with default values"""
         result = domains or {}
-        for domain_type in DomainType:
+        if len(result) == len(_DOMAIN_TYPES):
+            return result
+        for domain_type in _DOMAIN_TYPES:
             if domain_type not in result:
                 result[domain_type] = Domain(type=domain_type)
         return result
@@ -176,13 +232,11 @@ class Character(BaseModel):
         Returns:
             Result dict with success flag, roll details, and margin
         """
-        import random
-        
         # Get the domain
         domain = self.domains[domain_type]
         
         # Roll d20
-        d20_roll = random.randint(1, 20)
+        d20_roll = _RNG.randint(1, 20)
         
         # Calculate total with domain bonus
         total = d20_roll + domain.value
@@ -221,29 +275,25 @@ class Character(BaseModel):
     
     def get_domain_drift_candidates(self) -> List[DomainType]:
         """Return domains that are candidates for drifting (least used)"""
-        # Sort domains by usage count
-        sorted_domains = sorted(self.domains.values(), key=lambda d: d.usage_count)
-        
-        # Return the types of the least used domains (bottom 2)
-        return [d.type for d in sorted_domains[:2]]
+        # Return the types of the least used domains (bottom 2), without sorting the rest
+        least_used = heapq.nsmallest(2, self.domains.values(), key=lambda d: d.usage_count)
+        return [d.type for d in least_used]
     
     def drift_domain(self, from_domain: DomainType, to_domain: DomainType) -> bool:
         """Shift a point from one domain to another (domain drift mechanic)"""
         if from_domain == to_domain:
             return False
             
-        if self.domains[from_domain].value > 0 and self.domains[to_domain].value < 5:
-            self.domains[from_domain].value -= 1
-            self.domains[to_domain].value += 1
+        # Look each domain up once
+        source = self.domains[from_domain]
+        target = self.domains[to_domain]
+        if source.value > 0 and target.value < 5:
+            source.value -= 1
+            target.value += 1
             
             # Record this for character development history
-            if from_domain not in self.domain_history:
-                self.domain_history[from_domain] = []
-            if to_domain not in self.domain_history:
-                self.domain_history[to_domain] = []
-                
-            self.domain_history[from_domain].append(-1)
-            self.domain_history[to_domain].append(1)
+            self.domain_history.setdefault(from_domain, []).append(-1)
+            self.domain_history.setdefault(to_domain, []).append(1)
             
             return True
         return False